@@ -0,0 +1,116 @@
+import threading
+import traceback
+from collections import deque
+from typing import Tuple
+
+import numpy as np
+
+from eimu.eimu_serial import EIMUSerialClient, READ_IMU_DATA
+
+
+class Subscription:
+    """One consumer of an AcquisitionBus.
+
+    Receives every decimation-th sample the bus publishes, either pushed to
+    callback(t, vals) on the acquisition thread or kept in a bounded queue
+    for the consumer to drain. A full queue drops its oldest sample, so a
+    slow reader only ever lags by maxsize samples.
+    """
+
+    def __init__(self, bus: "AcquisitionBus", decimation: int = 1, maxsize: int = 256, callback=None):
+        self.bus = bus
+        self.decimation = max(1, int(decimation))
+        self.callback = callback
+        self.queue = deque(maxlen=maxsize)
+        self.received = 0
+        self.dropped = 0
+
+    def _offer(self, t: float, vals: np.ndarray):
+        self.received += 1
+        if self.callback is not None:
+            self.callback(t, vals)
+            return
+        if len(self.queue) == self.queue.maxlen:
+            self.dropped += 1
+        self.queue.append((t, vals))
+
+    def drain(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Everything queued so far (oldest first) as (t, values) arrays"""
+        items = []
+        try:
+            while True:
+                items.append(self.queue.popleft())
+        except IndexError:
+            pass
+        if not items:
+            return np.zeros(0), np.zeros((0, self.bus.count), dtype=np.float32)
+        t, vals = zip(*items)
+        return np.array(t), np.stack(vals)
+
+    def latest(self) -> Tuple[bool, float, np.ndarray]:
+        """Newest queued sample, dropping the older ones"""
+        try:
+            t, vals = self.queue.pop()
+        except IndexError:
+            return False, 0.0, np.zeros(self.bus.count, dtype=np.float32)
+        self.queue.clear()
+        return True, t, vals
+
+    def close(self):
+        self.bus.unsubscribe(self)
+
+
+class AcquisitionBus:
+    """One acquisition loop shared by any number of subscribers.
+
+    The bus streams cmd from the client (see EIMUSerialClient.startStreaming)
+    while at least one subscriber is attached, and fans each decoded sample
+    out to the subscribers. Adding a viewer adds no serial traffic; each
+    published sample is copied once, however many subscribers take it.
+    """
+
+    def __init__(self, client: EIMUSerialClient, cmd: int = READ_IMU_DATA, count: int = 9, capacity: int = 4096):
+        self.client = client
+        self.cmd = cmd
+        self.count = count
+        self.capacity = capacity
+        self._subs = ()  # replaced, never mutated, so the acquisition thread can iterate without a lock
+        self._lock = threading.Lock()
+
+    def subscribe(self, decimation: int = 1, maxsize: int = 256, callback=None) -> Subscription:
+        sub = Subscription(self, decimation, maxsize, callback)
+        with self._lock:
+            self._subs = self._subs + (sub,)
+            if not self.client.isStreaming():
+                self.client.startStreaming(self.cmd, self.count, self.capacity, on_sample=self._publish)
+        return sub
+
+    def unsubscribe(self, sub: Subscription):
+        with self._lock:
+            self._subs = tuple(s for s in self._subs if s is not sub)
+            if not self._subs:
+                # don't wait for the reader thread, it finishes its last read on its own
+                self.client.stopStreaming(wait=False)
+
+    def close(self):
+        with self._lock:
+            self._subs = ()
+            self.client.stopStreaming()
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subs)
+
+    def _publish(self, seq: int, t: float, row: np.ndarray):
+        vals = None
+        for sub in self._subs:
+            if seq % sub.decimation:
+                continue
+            if vals is None:
+                vals = row.copy()
+                vals.flags.writeable = False  # shared by every subscriber
+            try:
+                sub._offer(t, vals)
+            except Exception:
+                # a broken subscriber must not stop acquisition for the others
+                traceback.print_exc()
@@ -0,0 +1,54 @@
+import numpy as np
+
+
+class CaptureBuffer:
+    """Samples of a capture in one preallocated (capacity, width) array plus a fill index.
+
+    data is a view of the filled rows, so the plot, the fit and export all
+    read the same memory and nothing is copied or converted on the way. A
+    sample costs width floats, with no per-sample Python objects, so captures
+    can be far longer than a list of lists would allow.
+    """
+
+    def __init__(self, capacity: int, width: int = 3, dtype=np.float64):
+        self.capacity = capacity
+        self.width = width
+        self._data = np.zeros((capacity, width), dtype=dtype)
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def full(self) -> bool:
+        return self.count == self.capacity
+
+    @property
+    def data(self) -> np.ndarray:
+        """Filled rows, oldest first, as a view"""
+        return self._data[:self.count]
+
+    def append(self, sample) -> bool:
+        """Add one sample, False if the buffer is already full"""
+        if self.count == self.capacity:
+            return False
+        self._data[self.count] = sample
+        self.count += 1
+        return True
+
+    def extend(self, samples) -> int:
+        """Add rows of samples until the buffer is full, returns how many were taken"""
+        n = min(len(samples), self.capacity - self.count)
+        self._data[self.count:self.count + n] = samples[:n]
+        self.count += n
+        return n
+
+    def clear(self):
+        self.count = 0
+
+    def save(self, path: str):
+        """Write the filled rows to a .npy file, or as text if path ends in .csv or .txt"""
+        if path.endswith((".csv", ".txt")):
+            np.savetxt(path, self.data, delimiter=",")
+        else:
+            np.save(path, self.data)
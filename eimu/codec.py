@@ -0,0 +1,98 @@
+import struct
+
+READ = "read"      # no payload, reply of reply_count floats
+READ1 = "read1"    # <Bf (pos, 0.0) payload, reply of one float
+WRITE1 = "write1"  # <Bf (pos, value) payload, no reply
+WRITE3 = "write3"  # <fff payload, no reply
+
+_PAYLOADS = {READ: "", READ1: "Bf", WRITE1: "Bf", WRITE3: "fff"}
+_FLOATS = {}
+_CHECKSUM = [bytes([i]) for i in range(256)]  # checksum byte, indexed by value
+
+
+def float_struct(count: int) -> struct.Struct:
+    """Compiled little-endian layout for count floats, built once per count"""
+    s = _FLOATS.get(count)
+    if s is None:
+        s = _FLOATS[count] = struct.Struct("<" + "f" * count)
+    return s
+
+
+class CommandCodec:
+    """Precompiled request and reply layout for one command.
+
+    Read requests never change, so the whole packet is built once and cached as
+    bytes. Writes pack into a compiled struct and only sum their payload for the
+    checksum, the header bytes and their share of the sum are precomputed.
+    """
+
+    __slots__ = ("cmd", "name", "kind", "reply_count", "reply", "request", "packet", "_head", "_header_sum")
+
+    def __init__(self, start_byte: int, cmd: int, name: str, kind: str, reply_count: int = 0):
+        self.cmd = cmd
+        self.name = name
+        self.kind = kind
+        self.reply_count = reply_count
+        self.reply = float_struct(reply_count)
+
+        self.request = struct.Struct("<" + _PAYLOADS[kind])
+        self._head = bytes([start_byte, cmd, self.request.size])
+        self._header_sum = sum(self._head)
+
+        self.packet = None
+        if kind == READ:
+            self.packet = self._head + _CHECKSUM[self._header_sum & 0xFF]
+        elif kind == READ1:
+            self.packet = self.encode1(0, 0.0)
+
+    def encode1(self, pos: int, val: float) -> bytes:
+        """Full packet for a write1 (or a read1 at a non-zero pos)"""
+        body = self.request.pack(pos, val)
+        return self._head + body + _CHECKSUM[(self._header_sum + sum(body)) & 0xFF]
+
+    def encode3(self, a: float, b: float, c: float) -> bytes:
+        """Full packet for a write3"""
+        body = self.request.pack(a, b, c)
+        return self._head + body + _CHECKSUM[(self._header_sum + sum(body)) & 0xFF]
+
+    def decode(self, data) -> tuple:
+        return self.reply.unpack_from(data)
+
+
+class PacketParser:
+    """Splits a request byte stream into (cmd, payload) packets.
+
+    Bytes ahead of a start byte are skipped, and a packet with a bad checksum
+    only costs its start byte, so the parser finds the next good packet the
+    way the firmware does.
+    """
+
+    def __init__(self, start_byte: int):
+        self.start_byte = start_byte
+        self.packets = 0
+        self.bad_packets = 0
+        self._start = bytes([start_byte])
+        self._rx = bytearray()
+
+    def feed(self, data) -> list:
+        """Add request bytes, get back every packet they complete"""
+        rx = self._rx
+        rx += data
+        packets = []
+        while rx:
+            if rx[0] != self.start_byte:
+                # hunt for the next start byte
+                start = rx.find(self._start)
+                del rx[:len(rx) if start < 0 else start]
+                continue
+            if len(rx) < 4 or len(rx) < 4 + rx[2]:
+                break
+            length = rx[2]
+            if sum(rx[:3 + length]) & 0xFF != rx[3 + length]:
+                self.bad_packets += 1
+                del rx[0]
+                continue
+            packets.append((rx[1], bytes(rx[3:3 + length])))
+            del rx[:4 + length]
+            self.packets += 1
+        return packets
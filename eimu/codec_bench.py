@@ -0,0 +1,64 @@
+import argparse
+import struct
+from time import perf_counter
+
+from eimu.eimu_serial import (codec_for, encode_packet, GET_FRAME_ID, READ_IMU_DATA, READ_RPY, SET_FILTER_GAIN,
+                              WRITE_ACC_OFF)
+from eimu.codec import READ, READ1, WRITE1, WRITE3
+
+
+class NullSink:
+    """Stands in for the serial port so only encoding and the write call are timed."""
+
+    def write(self, data):
+        return len(data)
+
+
+def _legacy(sink):
+    """Packet building as it was before the codec table"""
+    return {
+        "read_data3": lambda: sink.write(encode_packet(READ_RPY, b"")),
+        "read_data9": lambda: sink.write(encode_packet(READ_IMU_DATA, b"")),
+        "read_data1": lambda: sink.write(encode_packet(GET_FRAME_ID, struct.pack("<Bf", 0, 0.0))),
+        "write_data1": lambda: sink.write(encode_packet(SET_FILTER_GAIN, struct.pack("<Bf", 0, 0.1))),
+        "write_data3": lambda: sink.write(encode_packet(WRITE_ACC_OFF, struct.pack("<fff", 0.1, 0.2, 0.3))),
+    }
+
+
+def _codec(sink):
+    return {
+        "read_data3": lambda: sink.write(codec_for(READ_RPY, READ, 3).packet),
+        "read_data9": lambda: sink.write(codec_for(READ_IMU_DATA, READ, 9).packet),
+        "read_data1": lambda: sink.write(codec_for(GET_FRAME_ID, READ1, 1).packet),
+        "write_data1": lambda: sink.write(codec_for(SET_FILTER_GAIN, WRITE1).encode1(0, 0.1)),
+        "write_data3": lambda: sink.write(codec_for(WRITE_ACC_OFF, WRITE3).encode3(0.1, 0.2, 0.3)),
+    }
+
+
+def rate(fn, n: int) -> float:
+    """Calls of fn per second, best of three runs of n"""
+    best = None
+    for _ in range(3):
+        start = perf_counter()
+        for _ in range(n):
+            fn()
+        elapsed = perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return n / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Packets per second with and without the precompiled codec table")
+    parser.add_argument("-n", type=int, default=200000, help="packets per run")
+    args = parser.parse_args()
+
+    sink = NullSink()
+    legacy, codec = _legacy(sink), _codec(sink)
+    print(f"{'call':<12}{'legacy pkt/s':>16}{'codec pkt/s':>16}{'speedup':>10}")
+    for name in legacy:
+        old, new = rate(legacy[name], args.n), rate(codec[name], args.n)
+        print(f"{name:<12}{old:>16,.0f}{new:>16,.0f}{new / old:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
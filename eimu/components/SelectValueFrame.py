@@ -2,6 +2,10 @@ import tkinter as tk
 import ttkbootstrap as tb
 from ttkbootstrap.constants import *
 
+from concurrent.futures import Future
+
+from eimu.globalParams import g
+
 
 
 
@@ -66,7 +70,12 @@ class SelectValueFrame(tb.LabelFrame):
       self.valText.configure(text="null")
     else:
       updatedValue = self.middleware_func(entryValue)
-      self.valText.configure(text=str(updatedValue))
+      if isinstance(updatedValue, Future):
+        # middleware queued device I/O, show the value once it lands
+        self.valText.configure(text="...")
+        g.io.then(updatedValue, self.setVal)
+      else:
+        self.setVal(str(updatedValue))
 
 
 
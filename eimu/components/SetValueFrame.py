@@ -2,6 +2,10 @@ import tkinter as tk
 import ttkbootstrap as tb
 from ttkbootstrap.constants import *
 
+from concurrent.futures import Future
+
+from eimu.globalParams import g
+
 
 
 
@@ -46,7 +50,15 @@ class SetValueFrame(tb.LabelFrame):
       self.valText.configure(text="null")
     else:
       updatedValue = self.middleware_func(entryValue)
-      self.valText.configure(text=str(updatedValue))
+      if isinstance(updatedValue, Future):
+        # middleware queued device I/O, show the value once it lands
+        self.valText.configure(text="...")
+        g.io.then(updatedValue, self.showValue)
+      else:
+        self.showValue(updatedValue)
+
+  def showValue(self, value):
+    self.valText.configure(text=str(value))
     
 
 
@@ -0,0 +1,65 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from time import perf_counter
+
+import serial.tools.list_ports
+
+from eimu.eimu_serial import EIMUSerialClient
+
+
+@dataclass
+class PortProbe:
+    """A port that answered the EIMU handshake."""
+    port: str
+    latency: float  # best handshake round trip in seconds
+    client: EIMUSerialClient | None = None
+
+
+def list_ports() -> list:
+    return [port.device for port in serial.tools.list_ports.comports()]
+
+
+def probe_port(port: str, baud: int = 115200, timeout: float = 0.05, samples: int = 3) -> PortProbe | None:
+    """Connect to port and time the GET_FRAME_ID handshake, None if it isn't an EIMU"""
+    client = EIMUSerialClient()
+    try:
+        client.connect(port, baud, timeout)
+    except Exception:
+        return None
+
+    latency = None
+    for _ in range(samples):
+        start = perf_counter()
+        success, _ = client.getWorldFrameId(refresh=True)
+        if success:
+            elapsed = perf_counter() - start
+            latency = elapsed if latency is None else min(latency, elapsed)
+
+    if latency is None:
+        client.disconnect()
+        return None
+    return PortProbe(port, latency, client)
+
+
+def discover_ports(ports: list | None = None, baud: int = 115200, timeout: float = 0.05,
+                   keep_best: bool = False, max_workers: int | None = None) -> list:
+    """Probe every port at once and return the EIMUs found, fastest handshake first.
+
+    All probes run concurrently, so discovery takes about as long as the slowest
+    single probe. With keep_best the first PortProbe keeps its connected client,
+    every other client is closed.
+    """
+    ports = list_ports() if ports is None else list(ports)
+    if not ports:
+        return []
+
+    with ThreadPoolExecutor(max_workers=max_workers or len(ports)) as pool:
+        probes = [probe for probe in pool.map(lambda port: probe_port(port, baud, timeout), ports) if probe]
+
+    probes.sort(key=lambda probe: probe.latency)
+    for i, probe in enumerate(probes):
+        if keep_best and i == 0:
+            continue
+        probe.client.disconnect()
+        probe.client = None
+    return probes
@@ -1,7 +1,15 @@
 import serial
-import struct
+import threading
+import numpy as np
 from typing import Tuple
-from time import sleep
+from time import sleep, perf_counter, perf_counter_ns
+
+from eimu.sample_ring import SampleRingBuffer
+from eimu.frame_decoder import FrameDecoder
+from eimu.transport import open_transport, SHARED_SCHEMES
+from eimu.link_stats import LinkStats
+from eimu.priority_lock import PriorityLock, PRIORITY_CONTROL, PRIORITY_NORMAL, PRIORITY_STREAM
+from eimu.codec import CommandCodec, float_struct, READ, READ1, WRITE1, WRITE3
 
 # class EIMUSerialError(Exception):
 #     """Custom exception for for EIMU Comm failure"""
@@ -52,30 +60,227 @@ READ_LIN_ACC_RAW = 0x2B
 READ_LIN_ACC = 0x2C
 #---------------------------------------------
 
+# only the protocol constants above, not whatever else the imports brought in (PRIORITY_*, ...)
+COMMAND_NAMES = {val: name for name, val in list(globals().items())
+                 if isinstance(val, int)
+                 and (name.startswith(("READ_", "WRITE_", "SET_", "GET_")) or name in ("RESET_PARAMS", "CLEAR_DATA_BUFFER"))}
+
+# write/set command → the read/get command that returns the stored value
+PARAM_WRITES = {
+    WRITE_RPY_VAR: READ_RPY_VAR,
+    WRITE_ACC_OFF: READ_ACC_OFF,
+    WRITE_ACC_VAR: READ_ACC_VAR,
+    WRITE_GYRO_OFF: READ_GYRO_OFF,
+    WRITE_GYRO_VAR: READ_GYRO_VAR,
+    WRITE_MAG_H_OFF: READ_MAG_H_OFF,
+    WRITE_MAG_S_OFF0: READ_MAG_S_OFF0,
+    WRITE_MAG_S_OFF1: READ_MAG_S_OFF1,
+    WRITE_MAG_S_OFF2: READ_MAG_S_OFF2,
+    SET_I2C_ADDR: GET_I2C_ADDR,
+    SET_FILTER_GAIN: GET_FILTER_GAIN,
+    SET_FRAME_ID: GET_FRAME_ID,
+    SET_ACC_LPF_CUT_FREQ: GET_ACC_LPF_CUT_FREQ,
+}
+PARAM_READS = frozenset(PARAM_WRITES.values())
+PARAM_SCALARS = frozenset({GET_I2C_ADDR, GET_FILTER_GAIN, GET_FRAME_ID, GET_ACC_LPF_CUT_FREQ})
+FRAME_IDS = (0.0, 1.0, 2.0)  # NWU, ENU, NED
+
+def encode_packet(cmd: int, payload: bytes = b"") -> bytearray:
+    packet = bytearray([START_BYTE, cmd, len(payload)]) + payload
+    checksum = sum(packet) & 0xFF
+    packet.append(checksum)
+    return packet
+
+# reply size of every vector read, all other READ_* commands return 3 floats
+_READ_COUNTS = {READ_QUAT: 4, READ_QUAT_RPY: 7, READ_ACC_GYRO: 6, READ_IMU_DATA: 9}
+
+def _command_kind(name: str) -> str:
+    if name.startswith("WRITE_"):
+        return WRITE3
+    if name.startswith("SET_"):
+        return WRITE1
+    if name.startswith("READ_"):
+        return READ
+    return READ1  # GET_*, RESET_PARAMS, CLEAR_DATA_BUFFER
+
+CODECS = {}
+for _cmd, _name in COMMAND_NAMES.items():
+    _kind = _command_kind(_name)
+    _count = {READ: _READ_COUNTS.get(_cmd, 3), READ1: 1}.get(_kind, 0)
+    CODECS[_cmd] = CommandCodec(START_BYTE, _cmd, _name, _kind, _count)
+
+def codec_for(cmd: int, kind: str, reply_count: int = 0) -> CommandCodec:
+    """Table codec for cmd, or a one-off one if cmd is unknown or used as another kind"""
+    codec = CODECS.get(cmd)
+    if codec is None or codec.kind != kind or (kind == READ and codec.reply_count != reply_count):
+        codec = CommandCodec(START_BYTE, cmd, COMMAND_NAMES.get(cmd, hex(cmd)), kind, reply_count)
+    return codec
+
+
+class EIMUPipeline:
+    """Batch of commands sent in one write() whose replies are parsed in order from one read."""
+
+    def __init__(self, client: "EIMUSerialClient"):
+        self._client = client
+        self._packets = bytearray()
+        self._cmds = []  # (cmd, packet size) per queued command
+        self._replies = []  # (float count, scalar reply) per queued command, None for writes
+
+    def __len__(self):
+        return len(self._replies)
+
+    def _queue(self, cmd: int, packet: bytes, reply):
+        self._packets += packet
+        self._cmds.append((cmd, len(packet)))
+        self._replies.append(reply)
+        return self
+
+    def write_data1(self, cmd: int, val: float, pos: int = 0):
+        return self._queue(cmd, codec_for(cmd, WRITE1).encode1(pos, val), None)
+
+    def read_data1(self, cmd: int, pos: int = 0):
+        codec = codec_for(cmd, READ1, 1)
+        return self._queue(cmd, codec.packet if pos == 0 else codec.encode1(pos, 0.0), (1, True))
+
+    def write_data3(self, cmd: int, a: float, b: float, c: float):
+        return self._queue(cmd, codec_for(cmd, WRITE3).encode3(a, b, c), None)
+
+    def read_data3(self, cmd: int):
+        return self._queue(cmd, codec_for(cmd, READ, 3).packet, (3, False))
+
+    def read_data4(self, cmd: int):
+        return self._queue(cmd, codec_for(cmd, READ, 4).packet, (4, False))
+
+    def read_data6(self, cmd: int):
+        return self._queue(cmd, codec_for(cmd, READ, 6).packet, (6, False))
+
+    def read_data9(self, cmd: int):
+        return self._queue(cmd, codec_for(cmd, READ, 9).packet, (9, False))
+
+    def execute(self) -> list:
+        """Send every queued command and return one result per command, in order.
+
+        Reads give (success, val) for read_data1 and (success, vals) otherwise,
+        exactly like the matching EIMUSerialClient call; writes give None. The
+        whole batch is one exchange under the client lock, at control priority
+        if it carries a write or a read_data1.
+        """
+        client = self._client
+        packets, cmds, replies = self._packets, self._cmds, self._replies
+        self._packets, self._cmds, self._replies = bytearray(), [], []
+        if not replies:
+            return []
+
+        total = sum(reply[0] for reply in replies if reply is not None)
+        control = any(reply is None or reply[1] for reply in replies)
+        decoder = client.decoder
+        with client.lock.hold(PRIORITY_CONTROL if control else PRIORITY_NORMAL):
+            if client.ser is None:
+                raise RuntimeError("Serial port is not connected")
+            short_reads, resyncs = decoder.short_reads, decoder.resyncs
+            start = perf_counter_ns()
+            client._sync_rx()
+            client.ser.write(packets)
+            client.ser.flush()
+
+            payload = b""
+            if total:
+                try:
+                    payload = bytes(decoder.read(client.ser, 4 * total))
+                except Exception:
+                    client._flush_rx()
+            latency = perf_counter_ns() - start
+
+            # short reads and resyncs are charged to the first reply the batch read cut off
+            short_reads = decoder.short_reads - short_reads
+            resyncs = decoder.resyncs - resyncs
+
+        results = []
+        offset = 0
+        for (cmd, size), reply in zip(cmds, replies):
+            if reply is None:
+                client.link.record(cmd, latency, True, size, 0)
+                client.params.pop(PARAM_WRITES.get(cmd), None)
+                results.append(None)
+                continue
+            count, scalar = reply
+            end = offset + 4 * count
+            success = end <= len(payload)
+            vals = float_struct(count).unpack_from(payload, offset) if success else tuple([0.0] * count)
+            results.append((success, vals[0] if scalar else vals))
+            if success and cmd in PARAM_READS:
+                client.params[cmd] = vals[0] if scalar else vals
+
+            received = max(0, min(end, len(payload)) - offset)
+            if success:
+                client.link.record(cmd, latency, True, size, received)
+            else:
+                client.link.record(cmd, latency, False, size, received, short_reads, resyncs)
+                short_reads = resyncs = 0
+            offset = end
+        return results
+
+
 class EIMUSerialClient:
-    """Python client for EIMU serial communication."""
+    """Python client for EIMU serial communication.
 
-    def __init__(self):
+    The client can be shared between threads: every request/response exchange
+    holds self.lock, and with prioritize_writes parameter writes and gets are
+    served ahead of queued vector reads, which go ahead of streaming reads.
+    """
+
+    def __init__(self, prioritize_writes: bool = True):
         self.ser: serial.Serial | None = None
+        self.lock = PriorityLock(prioritize_writes)
+        self.connect_time: float | None = None  # seconds from opening the port to the first handshake reply
+        self.decoder = FrameDecoder()
+        self.link = LinkStats(COMMAND_NAMES)
+        self.params = {}  # read/get command → last value read from or written to the device
+        self.cacheParams = True  # off on a shared mux connection, where other peers change parameters too
 
-    def connect(self, port: str, baud: int = 115200, timeout: float = 0.1):
-        self.ser = serial.Serial(port, baud, timeout=timeout)
-        sleep(3.0)
+        self.stream: SampleRingBuffer | None = None
+        self._stream_thread: threading.Thread | None = None
+        self._stream_stop = threading.Event()
 
-        for _ in range(10):
-            success, id = self.getWorldFrameId()
-            if success:
+    def connect(self, port: str, baud: int = 115200, timeout: float = 0.1, record: str | None = None,
+                deadline: float = 5.0):
+        """Open port (a serial port, socket://, replay:// or sim:// URL, see eimu.transport).
+
+        The handshake is polled with exponentially spaced attempts from the moment
+        the port opens, so a board that is already running answers within a few
+        milliseconds while one that resets on open gets up to deadline seconds to boot.
+        """
+        start = perf_counter()
+        self.ser = open_transport(port, baud, timeout, record=record)
+        self.invalidateParams()
+        # through eimu.mux_server the module is shared, a cached value may be stale at any time
+        self.cacheParams = not port.startswith(SHARED_SCHEMES)
+
+        delay = 0.01
+        while True:
+            success, frame_id = self._read_param1(GET_FRAME_ID, refresh=True)
+            # bytes that were on the line before the module answered (a bridge banner, boot
+            # messages) can fill the reply too, only a frame id the module can have counts
+            if success and frame_id in FRAME_IDS:
+                self.connect_time = perf_counter() - start
                 print("EIMU Connected Successfully")
                 return
-            sleep(0.1)
+            self.invalidateParams()
+            remaining = deadline - (perf_counter() - start)
+            if remaining <= 0:
+                break
+            sleep(min(delay, remaining))
+            delay = min(2 * delay, 0.5)
 
         self.disconnect()
         raise RuntimeError("EIMU could not connect, Please check connection and Try Again")
 
     def disconnect(self):
-        if self.ser and self.ser.is_open:
-            self.ser.close()
-            self.ser = None
+        self.stopStreaming()
+        with self.lock.hold(PRIORITY_CONTROL):
+            if self.ser and self.ser.is_open:
+                self.ser.close()
+                self.ser = None
     
     # ------------------ Packet Helpers ------------------
 
@@ -83,11 +288,19 @@ class EIMUSerialClient:
         """Flush any unread bytes in RX buffer"""
         if self.ser is None:
             return
+        self.decoder.reset()
         try:
             self.ser.reset_input_buffer()
         except serial.SerialException:
             pass
 
+    def _sync_rx(self):
+        """Drop stale bytes left over from earlier replies before a new request"""
+        try:
+            self.decoder.sync(self.ser)
+        except (serial.SerialException, Exception):
+            self._flush_rx()
+
 
     def _flush_tx(self):
         """Flush TX buffer"""
@@ -100,13 +313,12 @@ class EIMUSerialClient:
 
 
     def _send_packet(self, cmd: int, payload: bytes = b""):
+        self._send(encode_packet(cmd, payload))
+
+    def _send(self, packet: bytes):
         if self.ser is None:
             raise RuntimeError("Serial port is not connected")
-        self._flush_rx()
-        length = len(payload)
-        packet = bytearray([START_BYTE, cmd, length]) + payload
-        checksum = sum(packet) & 0xFF
-        packet.append(checksum)
+        self._sync_rx()
         self.ser.write(packet)
         self.ser.flush()
 
@@ -116,77 +328,249 @@ class EIMUSerialClient:
             raise RuntimeError("Serial port is not connected")
 
         try:
-            payload = self.ser.read(4 * count)
-
-            if len(payload) != 4 * count:
-                # partial frame → stream is now misaligned
-                self._flush_rx()
-                return False, tuple([0.0] * count)
-
+            return self.decoder.read_floats(self.ser, count)
         except (serial.SerialTimeoutException,
                 serial.SerialException,
                 Exception):
             # Any read-related failure → resync stream
             self._flush_rx()
             return False, tuple([0.0] * count)
-        
-        return True, struct.unpack("<" + "f" * count, payload)
     
+    def _read_into(self, out: np.ndarray) -> bool:
+        """Decode one reply straight into a float32 array, unrounded"""
+        if self.ser is None:
+            raise RuntimeError("Serial port is not connected")
+
+        nbytes = 4 * len(out)
+        try:
+            if out.dtype == np.dtype("<f4") and out.flags.c_contiguous:
+                # zero copy, the port reads right into the caller's memory
+                data = self.decoder.read(self.ser, nbytes, memoryview(out).cast("B"))
+                success = len(data) == nbytes
+            else:
+                data = self.decoder.read(self.ser, nbytes)
+                success = len(data) == nbytes
+                if success:
+                    out[:] = np.frombuffer(data, "<f4", len(out))
+        except (serial.SerialTimeoutException,
+                serial.SerialException,
+                Exception):
+            # Any read-related failure → resync stream
+            self._flush_rx()
+            success = False
+
+        if not success:
+            out[:] = 0.0
+        return success
+
+    def _transact(self, cmd: int, packet: bytes, count: int, out: np.ndarray | None = None,
+                  priority: int = PRIORITY_NORMAL) -> Tuple[bool, tuple]:
+        """Send one encoded request and read its reply of count floats (none if count is 0).
+
+        The exchange is atomic under self.lock, waiting its turn at priority.
+        With out the reply is decoded into that float32 array instead of a tuple.
+        """
+        decoder = self.decoder
+        with self.lock.hold(priority):
+            short_reads, resyncs, bytes_rx = decoder.short_reads, decoder.resyncs, decoder.bytes_rx
+            start = perf_counter_ns()
+
+            self._send(packet)
+            if out is not None:
+                success, vals = self._read_into(out), out
+            else:
+                success, vals = self._read_floats(count) if count else (True, ())
+
+            self.link.record(cmd, perf_counter_ns() - start, success, len(packet),
+                             decoder.bytes_rx - bytes_rx,
+                             decoder.short_reads - short_reads,
+                             decoder.resyncs - resyncs)
+        return success, vals
+
+    def stats(self) -> dict:
+        """Per-command counters and latency percentiles, keyed by command name"""
+        return self.link.snapshot()
+
+    def resetStats(self):
+        self.link.reset()
+        self.decoder.reset_stats()
+
+    # ------------------ Parameter Cache ------------------
+
+    def invalidateParams(self):
+        """Drop every cached parameter so the next get/read goes to the device"""
+        self.params.clear()
+
+    def _read_param1(self, cmd: int, refresh: bool = False) -> Tuple[bool, float]:
+        if not refresh and self.cacheParams and cmd in self.params:
+            return True, self.params[cmd]
+        success, val = self.read_data1(cmd)
+        if success:
+            self.params[cmd] = val
+        return success, val
+
+    def _read_param3(self, cmd: int, refresh: bool = False) -> Tuple[bool, tuple]:
+        if not refresh and self.cacheParams and cmd in self.params:
+            return True, self.params[cmd]
+        success, vals = self.read_data3(cmd)
+        if success:
+            self.params[cmd] = vals
+        return success, vals
+
+    def readParam(self, cmd: int, refresh: bool = False) -> Tuple[bool, float | tuple]:
+        """Any parameter in PARAM_READS, from the cache unless refresh or caching is off"""
+        if cmd in PARAM_SCALARS:
+            return self._read_param1(cmd, refresh)
+        return self._read_param3(cmd, refresh)
+
+    def prefetchParams(self, batch: int = 6) -> bool:
+        """Fill the parameter cache with every parameter in a few pipelined round trips.
+
+        Batches are kept small so the requests fit the firmware's serial RX buffer.
+        """
+        cmds = sorted(PARAM_READS)
+        success = True
+        for i in range(0, len(cmds), batch):
+            p = self.pipeline()
+            for cmd in cmds[i:i + batch]:
+                if cmd in PARAM_SCALARS:
+                    p.read_data1(cmd)
+                else:
+                    p.read_data3(cmd)
+            success = all(ok for ok, _ in p.execute()) and success
+        return success
+
     # ------------------ Generic Data ------------------
 
     def write_data1(self, cmd: int, val: float, pos: int = 0):
-        payload = struct.pack("<Bf", pos, val)
-        self._send_packet(cmd, payload)
+        self.params.pop(PARAM_WRITES.get(cmd), None)
+        self._transact(cmd, codec_for(cmd, WRITE1).encode1(pos, val), 0, priority=PRIORITY_CONTROL)
 
     def read_data1(self, cmd: int, pos: int = 0) -> Tuple[bool, float]:
-        payload = struct.pack("<Bf", pos, 0.0)
-        self._send_packet(cmd, payload)
-        success, (val,) = self._read_floats(1)
+        codec = codec_for(cmd, READ1, 1)
+        packet = codec.packet if pos == 0 else codec.encode1(pos, 0.0)
+        success, (val,) = self._transact(cmd, packet, 1, priority=PRIORITY_CONTROL)
         return success, val
 
     def write_data3(self, cmd: int, a: float, b: float, c: float):
-        payload = struct.pack("<fff", a, b, c)
-        self._send_packet(cmd, payload)
+        self.params.pop(PARAM_WRITES.get(cmd), None)
+        self._transact(cmd, codec_for(cmd, WRITE3).encode3(a, b, c), 0, priority=PRIORITY_CONTROL)
 
-    def read_data3(self, cmd: int) -> Tuple[bool, float, float, float]:
-        self._send_packet(cmd)
-        success, vals = self._read_floats(3)
+    def read_data3(self, cmd: int, out: np.ndarray | None = None) -> Tuple[bool, float, float, float]:
+        success, vals = self._transact(cmd, codec_for(cmd, READ, 3).packet, 3, out)
         return success, vals
         # return success, *vals
 
-    def read_data4(self, cmd: int) -> Tuple[bool, float, float, float, float]:
-        self._send_packet(cmd)
-        success, vals = self._read_floats(4)
+    def read_data4(self, cmd: int, out: np.ndarray | None = None) -> Tuple[bool, float, float, float, float]:
+        success, vals = self._transact(cmd, codec_for(cmd, READ, 4).packet, 4, out)
         return success, vals
         # return success, *vals
     
-    def read_data6(self, cmd: int) -> Tuple[bool, float, float, float, float, float, float]:
-        self._send_packet(cmd)
-        success, vals = self._read_floats(6)
+    def read_data6(self, cmd: int, out: np.ndarray | None = None) -> Tuple[bool, float, float, float, float, float, float]:
+        success, vals = self._transact(cmd, codec_for(cmd, READ, 6).packet, 6, out)
         return success, vals
         # return success, *vals
     
-    def read_data9(self, cmd: int) -> Tuple[bool, float, float, float, float, float, float, float, float, float]:
-        self._send_packet(cmd)
-        success, vals = self._read_floats(9)
+    def read_data9(self, cmd: int, out: np.ndarray | None = None) -> Tuple[bool, float, float, float, float, float, float, float, float, float]:
+        success, vals = self._transact(cmd, codec_for(cmd, READ, 9).packet, 9, out)
         return success, vals
         # return success, *vals
     
+    def read_data(self, cmd: int, count: int, out: np.ndarray | None = None) -> Tuple[bool, tuple]:
+        """Vector read of any size, for replies with no read_dataN of their own"""
+        return self._transact(cmd, codec_for(cmd, READ, count).packet, count, out)
+
+    def read_batch(self, cmd: int, out: np.ndarray, ok: np.ndarray | None = None) -> int:
+        """Fill each row of an (N, k) float32 array from N consecutive reads of cmd.
+
+        Failed rows are zeroed and flagged False in ok if it is given. Returns
+        the number of good rows.
+        """
+        packet = codec_for(cmd, READ, out.shape[1]).packet
+        good = 0
+        for i in range(len(out)):
+            success, _ = self._transact(cmd, packet, out.shape[1], out[i])
+            good += success
+            if ok is not None:
+                ok[i] = success
+        return good
+
+    def pipeline(self) -> EIMUPipeline:
+        """Start a batch of commands, e.g. imu.pipeline().read_data3(A).read_data3(B).execute()"""
+        return EIMUPipeline(self)
+
+    # ------------------ Streaming ------------------
+
+    def startStreaming(self, cmd: int = READ_IMU_DATA, count: int = 9, capacity: int = 4096, on_sample=None):
+        """Poll cmd back-to-back on a reader thread, pushing samples into self.stream.
+
+        on_sample(seq, t, row) is called on the reader thread after each sample
+        is committed; row is the ring's own row, valid until the call returns.
+        """
+        if self.ser is None:
+            raise RuntimeError("Serial port is not connected")
+        if self.isStreaming():
+            raise RuntimeError("EIMU is already streaming")
+        if self._stream_thread is not None:
+            # a reader told to stop without waiting may still be finishing its last read
+            self._stream_thread.join()
+
+        self.stream = SampleRingBuffer(capacity, count)
+        self._stream_stop = threading.Event()
+        self._stream_thread = threading.Thread(target=self._stream_loop,
+                                               args=(cmd, count, self._stream_stop, on_sample), daemon=True)
+        self._stream_thread.start()
+
+    def stopStreaming(self, wait: bool = True):
+        if self._stream_thread is None:
+            return
+        self._stream_stop.set()
+        if not wait:
+            return
+        if self._stream_thread is not threading.current_thread():
+            self._stream_thread.join()
+        self._stream_thread = None
+
+    def isStreaming(self) -> bool:
+        return (self._stream_thread is not None and self._stream_thread.is_alive()
+                and not self._stream_stop.is_set())
+
+    def _stream_loop(self, cmd: int, count: int, stop: threading.Event, on_sample=None):
+        stream = self.stream
+        packet = codec_for(cmd, READ, count).packet
+        while not stop.is_set():
+            try:
+                # decode straight into the ring, nothing is allocated per sample
+                row = stream.next_row()
+                success, _ = self._transact(cmd, packet, count, row, PRIORITY_STREAM)
+            except (serial.SerialException, RuntimeError):
+                # port went away under us
+                break
+            if success:
+                t = perf_counter()
+                stream.commit(t)
+                if on_sample is not None:
+                    on_sample(stream.count - 1, t, row)
+
     #---------------------------------------------------------------------
         
     def clearDataBuffer(self):
         success, _ = self.read_data1(CLEAR_DATA_BUFFER)
         return success
     
-    def setWorldFrameId(self, frame_id: int):
+    def setWorldFrameId(self, frame_id: int, force: bool = False):
+        """Set the reference frame, skipping the write if the cached frame already matches"""
+        if not force and self.cacheParams and self.params.get(GET_FRAME_ID) == float(frame_id):
+            return
         self.write_data1(SET_FRAME_ID, float(frame_id))
+        self.params[GET_FRAME_ID] = float(frame_id)
     
-    def getWorldFrameId(self):
-        success, frame_id = self.read_data1(GET_FRAME_ID)
+    def getWorldFrameId(self, refresh: bool = False):
+        success, frame_id = self._read_param1(GET_FRAME_ID, refresh)
         return success, int(frame_id)
     
-    def getFilterGain(self):
-        success, gain = self.read_data1(GET_FILTER_GAIN)
+    def getFilterGain(self, refresh: bool = False):
+        success, gain = self._read_param1(GET_FILTER_GAIN, refresh)
         return success, round(gain, 3)
     
     def readQuat(self):
@@ -197,24 +581,24 @@ class EIMUSerialClient:
         success, vals = self.read_data3(READ_RPY)
         return success, tuple(round(v, 6) for v in vals)
     
-    def readRPYVariance(self):
-        success, vals = self.read_data3(READ_RPY_VAR)
+    def readRPYVariance(self, refresh: bool = False):
+        success, vals = self._read_param3(READ_RPY_VAR, refresh)
         return success, tuple(round(v, 6) for v in vals)
     
     def readAcc(self):
         success, vals = self.read_data3(READ_ACC)
         return success, tuple(round(v, 6) for v in vals)
     
-    def readAccVariance(self):
-        success, vals = self.read_data3(READ_ACC_VAR)
+    def readAccVariance(self, refresh: bool = False):
+        success, vals = self._read_param3(READ_ACC_VAR, refresh)
         return success, tuple(round(v, 6) for v in vals)
     
     def readGyro(self):
         success, vals = self.read_data3(READ_GYRO)
         return success, tuple(round(v, 6) for v in vals)
     
-    def readGyroVariance(self):
-        success, vals = self.read_data3(READ_GYRO_VAR)
+    def readGyroVariance(self, refresh: bool = False):
+        success, vals = self._read_param3(READ_GYRO_VAR, refresh)
         return success, tuple(round(v, 6) for v in vals)
     
     def readMag(self):
@@ -241,8 +625,8 @@ class EIMUSerialClient:
     def setI2cAddress(self, i2cAddress: int):
         self.write_data1(SET_I2C_ADDR, float(i2cAddress))
     
-    def getI2cAddress(self):
-        success, i2cAddress = self.read_data1(GET_I2C_ADDR)
+    def getI2cAddress(self, refresh: bool = False):
+        success, i2cAddress = self._read_param1(GET_I2C_ADDR, refresh)
         return success, int(i2cAddress)
 
     def setFilterGain(self, gain: float):
@@ -251,8 +635,8 @@ class EIMUSerialClient:
     def setAccFilterCF(self, cf: float):
         self.write_data1(SET_ACC_LPF_CUT_FREQ, cf)
     
-    def getAccFilterCF(self):
-        success, cf = self.read_data1(GET_ACC_LPF_CUT_FREQ)
+    def getAccFilterCF(self, refresh: bool = False):
+        success, cf = self._read_param1(GET_ACC_LPF_CUT_FREQ, refresh)
         return success, round(cf, 3)
     
     def writeRPYVariance(self, r: float, p: float, y: float):
@@ -262,8 +646,8 @@ class EIMUSerialClient:
         success, vals = self.read_data3(READ_ACC_RAW)
         return success, tuple(round(v, 6) for v in vals)
     
-    def readAccOffset(self):
-        success, vals = self.read_data3(READ_ACC_OFF)
+    def readAccOffset(self, refresh: bool = False):
+        success, vals = self._read_param3(READ_ACC_OFF, refresh)
         return success, tuple(round(v, 6) for v in vals)
     
     def writeAccOffset(self, ax: float, ay: float, az: float):
@@ -276,8 +660,8 @@ class EIMUSerialClient:
         success, vals = self.read_data3(READ_GYRO_RAW)
         return success, tuple(round(v, 6) for v in vals)
     
-    def readGyroOffset(self):
-        success, vals = self.read_data3(READ_GYRO_OFF)
+    def readGyroOffset(self, refresh: bool = False):
+        success, vals = self._read_param3(READ_GYRO_OFF, refresh)
         return success, tuple(round(v, 6) for v in vals)
     
     def writeGyroOffset(self, gx: float, gy: float, gz: float):
@@ -290,29 +674,29 @@ class EIMUSerialClient:
         success, vals = self.read_data3(READ_MAG_RAW)
         return success, tuple(round(v, 6) for v in vals)
     
-    def readMagHardOffset(self):
-        success, vals = self.read_data3(READ_MAG_H_OFF)
+    def readMagHardOffset(self, refresh: bool = False):
+        success, vals = self._read_param3(READ_MAG_H_OFF, refresh)
         return success, tuple(round(v, 6) for v in vals)
     
     def writeMagHardOffset(self, mx: float, my: float, mz: float):
         self.write_data3(WRITE_MAG_H_OFF, mx, my, mz)
     
-    def readMagSoftOffset0(self):
-        success, vals = self.read_data3(READ_MAG_S_OFF0)
+    def readMagSoftOffset0(self, refresh: bool = False):
+        success, vals = self._read_param3(READ_MAG_S_OFF0, refresh)
         return success, tuple(round(v, 6) for v in vals)
     
     def writeMagSoftOffset0(self, mx: float, my: float, mz: float):
         self.write_data3(WRITE_MAG_S_OFF0, mx, my, mz)
     
-    def readMagSoftOffset1(self):
-        success, vals = self.read_data3(READ_MAG_S_OFF1)
+    def readMagSoftOffset1(self, refresh: bool = False):
+        success, vals = self._read_param3(READ_MAG_S_OFF1, refresh)
         return success, tuple(round(v, 6) for v in vals)
     
     def writeMagSoftOffset1(self, mx: float, my: float, mz: float):
         self.write_data3(WRITE_MAG_S_OFF1, mx, my, mz)
     
-    def readMagSoftOffset2(self):
-        success, vals = self.read_data3(READ_MAG_S_OFF2)
+    def readMagSoftOffset2(self, refresh: bool = False):
+        success, vals = self._read_param3(READ_MAG_S_OFF2, refresh)
         return success, tuple(round(v, 6) for v in vals)
     
     def writeMagSoftOffset2(self, mx: float, my: float, mz: float):
@@ -320,6 +704,7 @@ class EIMUSerialClient:
 
     def resetAllParams(self):
         success, _ = self.read_data1(RESET_PARAMS)
+        self.invalidateParams()
         return success
     
     #---------------------------------------------------------------------
\ No newline at end of file
@@ -0,0 +1,351 @@
+import asyncio
+from typing import Tuple
+
+import serial
+import serial_asyncio
+
+from eimu.eimu_serial import (codec_for, encode_packet, CLEAR_DATA_BUFFER, FRAME_IDS, GET_ACC_LPF_CUT_FREQ,
+                              GET_FILTER_GAIN, GET_FRAME_ID, GET_I2C_ADDR, READ_ACC, READ_ACC_GYRO, READ_ACC_OFF,
+                              READ_ACC_RAW, READ_ACC_VAR, READ_GYRO, READ_GYRO_OFF, READ_GYRO_RAW, READ_GYRO_VAR,
+                              READ_IMU_DATA, READ_LIN_ACC, READ_LIN_ACC_RAW, READ_MAG, READ_MAG_H_OFF,
+                              READ_MAG_RAW, READ_MAG_S_OFF0, READ_MAG_S_OFF1, READ_MAG_S_OFF2, READ_QUAT,
+                              READ_RPY, READ_RPY_VAR, RESET_PARAMS, SET_ACC_LPF_CUT_FREQ, SET_FILTER_GAIN,
+                              SET_FRAME_ID, SET_I2C_ADDR, WRITE_ACC_OFF, WRITE_ACC_VAR, WRITE_GYRO_OFF,
+                              WRITE_GYRO_VAR, WRITE_MAG_H_OFF, WRITE_MAG_S_OFF0, WRITE_MAG_S_OFF1,
+                              WRITE_MAG_S_OFF2, WRITE_RPY_VAR)
+from eimu.codec import READ, READ1, WRITE1, WRITE3
+from eimu.frame_decoder import FrameDecoder
+
+
+class _EIMUProtocol(asyncio.Protocol):
+    """Collects bytes from the serial transport so replies can be awaited by size.
+
+    in_waiting and an awaitable readinto() make it look like a serial port to
+    the *_async methods of FrameDecoder.
+    """
+
+    def __init__(self):
+        self.transport: serial_asyncio.SerialTransport | None = None
+        self.rx = bytearray()
+        self._waiter: asyncio.Future | None = None
+        self._closed = False
+        self.timeout = 0.1  # seconds readinto() waits, like the timeout of a serial port
+        self.connected = asyncio.Event()
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.connected.set()
+
+    def data_received(self, data: bytes):
+        self.rx += data
+        self._wake()
+
+    def connection_lost(self, exc):
+        self._closed = True
+        self._wake()
+
+    def _wake(self):
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+    @property
+    def in_waiting(self) -> int:
+        return len(self.rx)
+
+    async def readinto(self, b: memoryview) -> int:
+        """Wait up to timeout seconds to fill b, returning how many bytes did arrive"""
+        n = len(b)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout
+        while len(self.rx) < n and not self._closed:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            self._waiter = loop.create_future()
+            try:
+                await asyncio.wait_for(self._waiter, remaining)
+            except asyncio.TimeoutError:
+                break
+            finally:
+                self._waiter = None
+        got = min(n, len(self.rx))
+        b[:got] = self.rx[:got]
+        del self.rx[:got]
+        return got
+
+    def flush(self):
+        self.rx.clear()
+        if self.transport is None:
+            return
+        try:
+            self.transport.serial.reset_input_buffer()
+        except (serial.SerialException, AttributeError):
+            pass
+
+
+class AsyncEIMUSerialClient:
+    """asyncio client for EIMU serial communication, mirroring EIMUSerialClient as coroutines."""
+
+    def __init__(self):
+        self.protocol: _EIMUProtocol | None = None
+        self.timeout = 0.1
+        self.connect_time: float | None = None
+        self._lock = asyncio.Lock()
+        self.decoder = FrameDecoder()
+
+    async def connect(self, port: str, baud: int = 115200, timeout: float = 0.1, deadline: float = 5.0):
+        """Open port and poll the handshake with exponentially spaced attempts, see EIMUSerialClient.connect"""
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        _, self.protocol = await serial_asyncio.create_serial_connection(
+            loop, _EIMUProtocol, port, baudrate=baud)
+        # the transport reports connection_made on the next loop iteration
+        await self.protocol.connected.wait()
+        self.timeout = timeout
+        self.protocol.timeout = timeout
+        self.decoder.reset()
+
+        delay = 0.01
+        while True:
+            success, frame_id = await self.read_data1(GET_FRAME_ID)
+            # stray bytes ahead of the first reply can fill it too, see EIMUSerialClient.connect
+            if success and frame_id in FRAME_IDS:
+                self.connect_time = loop.time() - start
+                print("EIMU Connected Successfully")
+                return
+            remaining = deadline - (loop.time() - start)
+            if remaining <= 0:
+                break
+            await asyncio.sleep(min(delay, remaining))
+            delay = min(2 * delay, 0.5)
+
+        await self.disconnect()
+        raise RuntimeError("EIMU could not connect, Please check connection and Try Again")
+
+    async def disconnect(self):
+        if self.protocol and self.protocol.transport:
+            self.protocol.transport.close()
+        self.protocol = None
+
+    # ------------------ Packet Helpers ------------------
+
+    def _flush_rx(self):
+        """Flush any unread bytes in RX buffer"""
+        if self.protocol is None:
+            return
+        self.decoder.reset()
+        self.protocol.flush()
+
+    async def _sync_rx(self):
+        """Drop stale bytes left over from earlier replies before a new request"""
+        try:
+            await self.decoder.sync_async(self.protocol)
+        except Exception:
+            self._flush_rx()
+
+    async def _send_packet(self, cmd: int, payload: bytes = b""):
+        await self._send(encode_packet(cmd, payload))
+
+    async def _send(self, packet: bytes):
+        if self.protocol is None:
+            raise RuntimeError("Serial port is not connected")
+        await self._sync_rx()
+        self.protocol.transport.write(packet)
+
+    async def _read_floats(self, count: int) -> Tuple[bool, tuple]:
+        if self.protocol is None:
+            raise RuntimeError("Serial port is not connected")
+
+        try:
+            # a short reply gets the decoder's grace period, then its tail is dropped by the next _sync_rx
+            return await self.decoder.read_floats_async(self.protocol, count)
+        except Exception:
+            self._flush_rx()
+            return False, tuple([0.0] * count)
+
+    async def _transact(self, packet: bytes, count: int) -> Tuple[bool, tuple]:
+        # one request/response at a time, or concurrent tasks would read each other's replies
+        async with self._lock:
+            await self._send(packet)
+            return await self._read_floats(count)
+
+    # ------------------ Generic Data ------------------
+
+    async def write_data1(self, cmd: int, val: float, pos: int = 0):
+        packet = codec_for(cmd, WRITE1).encode1(pos, val)
+        async with self._lock:
+            await self._send(packet)
+
+    async def read_data1(self, cmd: int, pos: int = 0) -> Tuple[bool, float]:
+        codec = codec_for(cmd, READ1, 1)
+        success, (val,) = await self._transact(codec.packet if pos == 0 else codec.encode1(pos, 0.0), 1)
+        return success, val
+
+    async def write_data3(self, cmd: int, a: float, b: float, c: float):
+        packet = codec_for(cmd, WRITE3).encode3(a, b, c)
+        async with self._lock:
+            await self._send(packet)
+
+    async def read_data3(self, cmd: int) -> Tuple[bool, tuple]:
+        return await self._transact(codec_for(cmd, READ, 3).packet, 3)
+
+    async def read_data4(self, cmd: int) -> Tuple[bool, tuple]:
+        return await self._transact(codec_for(cmd, READ, 4).packet, 4)
+
+    async def read_data6(self, cmd: int) -> Tuple[bool, tuple]:
+        return await self._transact(codec_for(cmd, READ, 6).packet, 6)
+
+    async def read_data9(self, cmd: int) -> Tuple[bool, tuple]:
+        return await self._transact(codec_for(cmd, READ, 9).packet, 9)
+
+    #---------------------------------------------------------------------
+
+    async def clearDataBuffer(self):
+        success, _ = await self.read_data1(CLEAR_DATA_BUFFER)
+        return success
+    
+    async def setWorldFrameId(self, frame_id: int):
+        await self.write_data1(SET_FRAME_ID, float(frame_id))
+    
+    async def getWorldFrameId(self):
+        success, frame_id = await self.read_data1(GET_FRAME_ID)
+        return success, int(frame_id)
+    
+    async def getFilterGain(self):
+        success, gain = await self.read_data1(GET_FILTER_GAIN)
+        return success, round(gain, 3)
+    
+    async def readQuat(self):
+        success, vals = await self.read_data4(READ_QUAT)
+        return success, tuple(round(v, 6) for v in vals)
+    
+    async def readRPY(self):
+        success, vals = await self.read_data3(READ_RPY)
+        return success, tuple(round(v, 6) for v in vals)
+    
+    async def readRPYVariance(self):
+        success, vals = await self.read_data3(READ_RPY_VAR)
+        return success, tuple(round(v, 6) for v in vals)
+    
+    async def readAcc(self):
+        success, vals = await self.read_data3(READ_ACC)
+        return success, tuple(round(v, 6) for v in vals)
+    
+    async def readAccVariance(self):
+        success, vals = await self.read_data3(READ_ACC_VAR)
+        return success, tuple(round(v, 6) for v in vals)
+    
+    async def readGyro(self):
+        success, vals = await self.read_data3(READ_GYRO)
+        return success, tuple(round(v, 6) for v in vals)
+    
+    async def readGyroVariance(self):
+        success, vals = await self.read_data3(READ_GYRO_VAR)
+        return success, tuple(round(v, 6) for v in vals)
+    
+    async def readMag(self):
+        success, vals = await self.read_data3(READ_MAG)
+        return success, tuple(round(v, 6) for v in vals)
+    
+    async def readAccGyro(self):
+        success, vals = await self.read_data6(READ_ACC_GYRO)
+        return success, tuple(round(v, 6) for v in vals)
+    
+    async def readImuData(self):
+        success, vals = await self.read_data9(READ_IMU_DATA)
+        return success, tuple(round(v, 6) for v in vals)
+
+    async def readLinearAccRaw(self):
+        success, vals = await self.read_data3(READ_LIN_ACC_RAW)
+        return success, tuple(round(v, 6) for v in vals)
+    
+    async def readLinearAcc(self):
+        success, vals = await self.read_data3(READ_LIN_ACC)
+        return success, tuple(round(v, 6) for v in vals)
+    #---------------------------------------------------------------------
+
+    async def setI2cAddress(self, i2cAddress: int):
+        await self.write_data1(SET_I2C_ADDR, float(i2cAddress))
+    
+    async def getI2cAddress(self):
+        success, i2cAddress = await self.read_data1(GET_I2C_ADDR)
+        return success, int(i2cAddress)
+
+    async def setFilterGain(self, gain: float):
+        await self.write_data1(SET_FILTER_GAIN, gain)
+    
+    async def setAccFilterCF(self, cf: float):
+        await self.write_data1(SET_ACC_LPF_CUT_FREQ, cf)
+    
+    async def getAccFilterCF(self):
+        success, cf = await self.read_data1(GET_ACC_LPF_CUT_FREQ)
+        return success, round(cf, 3)
+    
+    async def writeRPYVariance(self, r: float, p: float, y: float):
+        await self.write_data3(WRITE_RPY_VAR, r, p, y)
+    
+    async def readAccRaw(self):
+        success, vals = await self.read_data3(READ_ACC_RAW)
+        return success, tuple(round(v, 6) for v in vals)
+    
+    async def readAccOffset(self):
+        success, vals = await self.read_data3(READ_ACC_OFF)
+        return success, tuple(round(v, 6) for v in vals)
+    
+    async def writeAccOffset(self, ax: float, ay: float, az: float):
+        await self.write_data3(WRITE_ACC_OFF, ax, ay, az)
+    
+    async def writeAccVariance(self, ax: float, ay: float, az: float):
+        await self.write_data3(WRITE_ACC_VAR, ax, ay, az)
+    
+    async def readGyroRaw(self):
+        success, vals = await self.read_data3(READ_GYRO_RAW)
+        return success, tuple(round(v, 6) for v in vals)
+    
+    async def readGyroOffset(self):
+        success, vals = await self.read_data3(READ_GYRO_OFF)
+        return success, tuple(round(v, 6) for v in vals)
+    
+    async def writeGyroOffset(self, gx: float, gy: float, gz: float):
+        await self.write_data3(WRITE_GYRO_OFF, gx, gy, gz)
+    
+    async def writeGyroVariance(self, gx: float, gy: float, gz: float):
+        await self.write_data3(WRITE_GYRO_VAR, gx, gy, gz)
+    
+    async def readMagRaw(self):
+        success, vals = await self.read_data3(READ_MAG_RAW)
+        return success, tuple(round(v, 6) for v in vals)
+    
+    async def readMagHardOffset(self):
+        success, vals = await self.read_data3(READ_MAG_H_OFF)
+        return success, tuple(round(v, 6) for v in vals)
+    
+    async def writeMagHardOffset(self, mx: float, my: float, mz: float):
+        await self.write_data3(WRITE_MAG_H_OFF, mx, my, mz)
+    
+    async def readMagSoftOffset0(self):
+        success, vals = await self.read_data3(READ_MAG_S_OFF0)
+        return success, tuple(round(v, 6) for v in vals)
+    
+    async def writeMagSoftOffset0(self, mx: float, my: float, mz: float):
+        await self.write_data3(WRITE_MAG_S_OFF0, mx, my, mz)
+    
+    async def readMagSoftOffset1(self):
+        success, vals = await self.read_data3(READ_MAG_S_OFF1)
+        return success, tuple(round(v, 6) for v in vals)
+    
+    async def writeMagSoftOffset1(self, mx: float, my: float, mz: float):
+        await self.write_data3(WRITE_MAG_S_OFF1, mx, my, mz)
+    
+    async def readMagSoftOffset2(self):
+        success, vals = await self.read_data3(READ_MAG_S_OFF2)
+        return success, tuple(round(v, 6) for v in vals)
+    
+    async def writeMagSoftOffset2(self, mx: float, my: float, mz: float):
+        await self.write_data3(WRITE_MAG_S_OFF2, mx, my, mz)
+
+    async def resetAllParams(self):
+        success, _ = await self.read_data1(RESET_PARAMS)
+        return success
+    
+    #---------------------------------------------------------------------
\ No newline at end of file
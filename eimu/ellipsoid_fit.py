@@ -0,0 +1,228 @@
+import numpy as np
+from scipy import linalg
+from typing import NamedTuple
+
+# C (Eq. 8, k=4)
+C = np.array([[-1,  1,  1,  0,  0,  0],
+              [ 1, -1,  1,  0,  0,  0],
+              [ 1,  1, -1,  0,  0,  0],
+              [ 0,  0,  0, -4,  0,  0],
+              [ 0,  0,  0,  0, -4,  0],
+              [ 0,  0,  0,  0,  0, -4]])
+C_INV = linalg.inv(C)
+
+MIN_SAMPLES = 10  # S is singular with fewer
+MIN_SCALE = 1e-6  # floor of the robust scale of the field norm error, far below any sensor noise
+
+
+def design_matrix(s: np.ndarray) -> np.ndarray:
+    """D (10, N) of samples s (3, N)"""
+    return np.array([s[0]**2., s[1]**2., s[2]**2.,
+                     2.*s[1]*s[2], 2.*s[0]*s[2], 2.*s[0]*s[1],
+                     2.*s[0], 2.*s[1], 2.*s[2], np.ones_like(s[0])])
+
+
+def scatter_matrix(s: np.ndarray) -> np.ndarray:
+    """S = D·Dᵀ (eq. 11) of samples s (3, N)"""
+    D = design_matrix(s)
+    return np.dot(D, D.T)
+
+
+def ellipsoid_from_scatter(S: np.ndarray):
+    """Ellipsoid parameters M, n, d from the scatter matrix alone.
+
+    Everything the fit needs from the samples is in S, so it can be summed up
+    sample by sample (see OnlineEllipsoidFit) and the fit costs the same for
+    any number of samples.
+    """
+    S_11 = S[:6, :6]
+    S_12 = S[:6, 6:]
+    S_21 = S[6:, :6]
+    S_22 = S[6:, 6:]
+
+    # v_1 (eq. 15, solution)
+    S_22_inv = linalg.inv(S_22)
+    E = np.dot(C_INV, S_11 - np.dot(S_12, np.dot(S_22_inv, S_21)))
+
+    E_w, E_v = np.linalg.eig(E)
+
+    v_1 = np.real(E_v[:, np.argmax(np.real(E_w))])
+    if v_1[0] < 0: v_1 = -v_1
+
+    # v_2 (eq. 13, solution)
+    v_2 = np.dot(np.dot(-S_22_inv, S_21), v_1)
+
+    # quadric-form parameters, v_1 is (a, b, c, f, g, h) of D: f pairs with yz, g with xz, h with xy
+    M = np.array([[v_1[0], v_1[5], v_1[4]],
+                  [v_1[5], v_1[1], v_1[3]],
+                  [v_1[4], v_1[3], v_1[2]]])
+    n = np.array([[v_2[0]],
+                  [v_2[1]],
+                  [v_2[2]]])
+    d = v_2[3]
+
+    return M, n, d
+
+
+def ellipsoid_fit(s: np.ndarray):
+    ''' Estimate ellipsoid parameters from a set of points.
+
+      Parameters
+      ----------
+      s : array_like
+        The samples (M,N) where M=3 (x,y,z) and N=number of samples.
+
+      Returns
+      -------
+      M, n, d : array_like, array_like, float
+        The ellipsoid parameters M, n, d.
+
+      References
+      ----------
+      .. [1] Qingde Li; Griffiths, J.G., "Least squares ellipsoid specific
+          fitting," in Geometric Modeling and Processing, 2004.
+          Proceedings, vol., no., pp.335-340, 2004
+    '''
+    return ellipsoid_from_scatter(scatter_matrix(s))
+
+
+def calibration_params(M: np.ndarray, n: np.ndarray, d: float, F: float = 1.0):
+    """Hard iron offset b (3, 1) and soft iron matrix A_1 (3, 3) of a fitted ellipsoid"""
+    # note: some implementations of sqrtm return complex type, taking real
+    M_1 = linalg.inv(M)
+    b = -np.dot(M_1, n)
+    A_1 = np.real(F / np.sqrt(np.dot(n.T, np.dot(M_1, n)) - d) * linalg.sqrtm(M))
+    return b, A_1
+
+
+def quadric_vector(M: np.ndarray, n: np.ndarray, d: float) -> np.ndarray:
+    """Parameters in the order of the rows of D, q(x) = D(x)ᵀv = xᵀMx + 2nᵀx + d"""
+    return np.array([M[0, 0], M[1, 1], M[2, 2], M[1, 2], M[0, 2], M[0, 1], n[0, 0], n[1, 0], n[2, 0], d])
+
+
+def norm_residual(S: np.ndarray, M: np.ndarray, n: np.ndarray, d: float) -> float:
+    """RMS over the samples in S of |A_1·(x - b)|² / F² - 1, the calibrated field norm error.
+
+    For the fitted quadric q(x) = xᵀMx + 2nᵀx + d that error is q(x) / k with
+    k = nᵀM⁻¹n - d, and q(x) = D(x)ᵀv, so its mean square is vᵀSv / (k²·N):
+    no sample is needed.
+    """
+    v = quadric_vector(M, n, d)
+    k = np.dot(n.T, np.dot(linalg.inv(M), n)).item() - d
+    count = S[9, 9]
+    return float(np.sqrt(max(np.dot(v, np.dot(S, v)), 0.0) / (k * k * count)))
+
+
+class FitReport(NamedTuple):
+    """Calibration and how well it explains the samples, norm stats are of |A_1·(x - b)| / F over the inliers"""
+    b: np.ndarray
+    A_1: np.ndarray
+    inliers: np.ndarray  # bool mask over the samples
+    inlier_fraction: float
+    norm_mean: float
+    norm_std: float
+    norm_max_error: float  # largest |norm - 1| among the inliers
+    iterations: int
+
+
+def field_norms(x: np.ndarray, b: np.ndarray, A_1: np.ndarray, F: float = 1.0) -> np.ndarray:
+    """Calibrated field norm |A_1·(x - b)| / F of every row of x (N, 3)"""
+    h = np.dot(x - b.ravel(), A_1.T)
+    return np.sqrt(np.einsum('ij,ij->i', h, h)) / F
+
+
+def fit_report(x: np.ndarray, b: np.ndarray, A_1: np.ndarray, F: float = 1.0, inliers=None,
+               iterations: int = 1) -> FitReport:
+    """FitReport of a calibration over the rows of x (N, 3), all of them inliers unless a mask is given"""
+    if inliers is None:
+        inliers = np.ones(len(x), dtype=bool)
+    norms = field_norms(x[inliers], b, A_1, F)
+    if not len(norms):
+        norms = np.full(1, np.nan)
+    return FitReport(b, A_1, inliers, float(inliers.mean()), float(norms.mean()), float(norms.std()),
+                     float(np.abs(norms - 1.0).max()), iterations)
+
+
+def robust_ellipsoid_fit(x: np.ndarray, F: float = 1.0, cutoff: float = 4.685, max_iterations: int = 20,
+                         tol: float = 1e-6) -> FitReport:
+    """Ellipsoid fit of the rows of x (N, 3) that ignores samples off the ellipsoid.
+
+    Iteratively reweighted least squares: the samples are refitted with Tukey
+    biweights of their field norm error |A_1·(x - b)|² / F² - 1, scaled by its
+    median absolute deviation, so a burst of interference ends up with zero
+    weight instead of dragging b. Each pass is one weighted scatter matrix,
+    D is built once and the whole loop is array operations over the samples.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    if len(x) < MIN_SAMPLES:
+        raise linalg.LinAlgError(f"{len(x)} samples, an ellipsoid needs at least {MIN_SAMPLES}")
+    D = design_matrix(x.T)
+    w = np.ones(len(x))
+    inliers = w > 0
+    b_prev = None
+    for i in range(1, max_iterations + 1):
+        M, n, d = ellipsoid_from_scatter(np.dot(D * w, D.T))
+        v = quadric_vector(M, n, d)
+        k = np.dot(n.T, np.dot(linalg.inv(M), n)).item() - d
+        e = np.dot(v, D) / k  # field norm error of each sample, see norm_residual
+        mad = np.median(np.abs(e - np.median(e)))
+        r = e / (cutoff * max(1.4826 * mad, MIN_SCALE))
+        keep = np.abs(r) < 1.0
+        if keep.sum() < MIN_SAMPLES:
+            break  # the samples are no ellipsoid, keep the last fit that had enough of them
+        inliers = keep
+        w = np.where(inliers, (1.0 - r * r) ** 2, 0.0)
+        b = -np.dot(linalg.inv(M), n)
+        if b_prev is not None and np.abs(b - b_prev).max() <= tol * (1.0 + np.abs(b_prev).max()):
+            break
+        b_prev = b
+    b, A_1 = calibration_params(*ellipsoid_from_scatter(np.dot(D * w, D.T)), F)
+    return fit_report(x, b, A_1, F, inliers, i)
+
+
+class OnlineEllipsoidFit:
+    """Li-Griffiths ellipsoid fit that takes samples as they arrive.
+
+    Only the 10x10 scatter matrix S is kept, so memory does not grow with the
+    number of samples and estimate() gives the current hard and soft iron
+    calibration and its residual at any time.
+    """
+
+    def __init__(self, F: float = 1.0):
+        self.F = F
+        self.S = np.zeros((10, 10))
+
+    @property
+    def count(self) -> int:
+        return int(self.S[9, 9])
+
+    def add(self, sample):
+        """Add one (x, y, z) sample"""
+        d = design_matrix(np.asarray(sample, dtype=np.float64))
+        self.S += np.outer(d, d)
+
+    def add_batch(self, samples: np.ndarray):
+        """Add the rows of an (N, 3) array"""
+        if len(samples):
+            self.S += scatter_matrix(np.asarray(samples, dtype=np.float64).T)
+
+    def reset(self):
+        self.S[:] = 0.0
+
+    def fit(self):
+        """M, n, d of the samples so far"""
+        return ellipsoid_from_scatter(self.S)
+
+    def estimate(self):
+        """(b, A_1, residual) of the samples so far, None while they cannot pin down an ellipsoid"""
+        if self.count < MIN_SAMPLES:
+            return None
+        try:
+            M, n, d = self.fit()
+            b, A_1 = calibration_params(M, n, d, self.F)
+            residual = norm_residual(self.S, M, n, d)
+        except (linalg.LinAlgError, ValueError):
+            return None
+        if not (np.all(np.isfinite(b)) and np.all(np.isfinite(A_1)) and np.isfinite(residual)):
+            return None
+        return b, A_1, residual
@@ -0,0 +1,140 @@
+from typing import Tuple
+
+from eimu.codec import float_struct
+
+
+class FrameDecoder:
+    """Reassembles fixed-size float replies from the serial stream.
+
+    EIMU replies carry no framing of their own, so a frame boundary is the end
+    of the reply the client is waiting for. Instead of flushing the port when a
+    read comes back short, the decoder keeps the bytes it already has and waits
+    a little longer for the rest. A reply that still doesn't complete is
+    abandoned, and its missing tail is dropped on its own when it arrives, just
+    before the next request goes out.
+    """
+
+    def __init__(self, capacity: int = 64, grace: int = 1):
+        self.grace = grace  # extra read timeouts to wait on a partial reply
+        self._buf = bytearray()
+        self._view = memoryview(self._buf)
+        self._reserve(4 * capacity)
+        self._skip = 0  # bytes of an abandoned reply still in flight
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.frames = 0
+        self.short_reads = 0
+        self.resyncs = 0
+        self.dropped_bytes = 0
+        self.bytes_rx = 0
+
+    def reset(self):
+        """Forget any partial state, e.g. after the port was flushed"""
+        self._skip = 0
+
+    def _reserve(self, nbytes: int):
+        if nbytes > len(self._buf):
+            self._view.release()
+            self._buf = bytearray(nbytes)
+            self._view = memoryview(self._buf)
+
+    def _discard(self, ser, nbytes: int) -> int:
+        dropped = 0
+        while dropped < nbytes:
+            chunk = min(nbytes - dropped, len(self._buf))
+            got = ser.readinto(self._view[:chunk]) or 0
+            if got == 0:
+                break
+            dropped += got
+        self.dropped_bytes += dropped
+        return dropped
+
+    def sync(self, ser):
+        """Drop stale bytes so the next reply starts on a frame boundary"""
+        waiting = ser.in_waiting
+        if self._skip > waiting:
+            # tail of the last abandoned reply may still be in flight, give it one timeout to land
+            self._discard(ser, self._skip)
+            waiting = ser.in_waiting
+        if waiting:
+            self._discard(ser, waiting)
+        self._skip = 0
+
+    def read(self, ser, nbytes: int, into: memoryview | None = None) -> memoryview:
+        """Read one reply of nbytes, returning a view of whatever arrived.
+
+        The bytes land in the decoder's own buffer, or straight in into
+        (a writable byte view of at least nbytes) when one is given.
+        """
+        if into is None:
+            self._reserve(nbytes)
+            into = self._view
+        fill = ser.readinto(into[:nbytes]) or 0
+        if fill < nbytes:
+            self.short_reads += 1
+            for _ in range(self.grace):
+                got = ser.readinto(into[fill:nbytes]) or 0
+                fill += got
+                if fill >= nbytes or got == 0:
+                    break
+
+        self.bytes_rx += fill
+        if fill < nbytes:
+            self.resyncs += 1
+            self._skip = nbytes - fill
+        else:
+            self.frames += 1
+        return into[:fill]
+
+    def read_floats(self, ser, count: int) -> Tuple[bool, tuple]:
+        data = self.read(ser, 4 * count)
+        if len(data) != 4 * count:
+            return False, tuple([0.0] * count)
+        return True, float_struct(count).unpack_from(data)
+
+    # ------------------ asyncio ------------------
+    # the same policy for a port whose readinto() is a coroutine, see AsyncEIMUSerialClient
+
+    async def _discard_async(self, port, nbytes: int) -> int:
+        dropped = 0
+        while dropped < nbytes:
+            chunk = min(nbytes - dropped, len(self._buf))
+            got = await port.readinto(self._view[:chunk])
+            if got == 0:
+                break
+            dropped += got
+        self.dropped_bytes += dropped
+        return dropped
+
+    async def sync_async(self, port):
+        """sync() for an asyncio port"""
+        waiting = port.in_waiting
+        if self._skip > waiting:
+            await self._discard_async(port, self._skip)
+            waiting = port.in_waiting
+        if waiting:
+            await self._discard_async(port, waiting)
+        self._skip = 0
+
+    async def read_floats_async(self, port, count: int) -> Tuple[bool, tuple]:
+        """read_floats() for an asyncio port"""
+        nbytes = 4 * count
+        self._reserve(nbytes)
+        into = self._view
+        fill = await port.readinto(into[:nbytes])
+        if fill < nbytes:
+            self.short_reads += 1
+            for _ in range(self.grace):
+                got = await port.readinto(into[fill:nbytes])
+                fill += got
+                if fill >= nbytes or got == 0:
+                    break
+
+        self.bytes_rx += fill
+        if fill < nbytes:
+            self.resyncs += 1
+            self._skip = nbytes - fill
+            return False, tuple([0.0] * count)
+        self.frames += 1
+        return True, float_struct(count).unpack_from(into)
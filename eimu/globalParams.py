@@ -2,6 +2,8 @@
 class g():
   app = None
   imu = None
+  io = None # EIMUExecutor that runs every g.imu call off the Tk thread
+  bus = None # AcquisitionBus streaming IMU data to every page that plots it
   port = "None"
 
   i2cAddress = None
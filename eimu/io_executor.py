@@ -0,0 +1,96 @@
+import queue
+import traceback
+import tkinter as tk
+from concurrent.futures import Future, ThreadPoolExecutor
+from time import perf_counter
+
+
+class EIMUExecutor:
+    """Runs all device I/O on one worker thread and hands results back to Tk.
+
+    Every call returns a concurrent.futures.Future straight away, so the Tk
+    thread never waits on the serial link. Client methods can be called on
+    the executor directly (io.readRPY() is a Future of imu.readRPY()), and
+    any other function can go through submit(). Callbacks added with then()
+    run on the Tk thread from a single after() loop started by start().
+
+    Calls run one at a time in submission order, so a set followed by a get
+    reads back the value just written.
+    """
+
+    def __init__(self, client=None, interval: int = 10, budget: float = 0.008):
+        self.client = client
+        self.interval = interval  # ms between dispatcher runs
+        self.budget = budget  # seconds of callbacks per dispatcher run, the rest wait for the next one
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="eimu-io")
+        self._ready = queue.SimpleQueue()
+        self._widget = None
+        self._after_id = None
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        return self._pool.submit(fn, *args, **kwargs)
+
+    def call(self, name: str, *args, **kwargs) -> Future:
+        """Future of self.client.<name>(*args, **kwargs), the client is looked up when the call runs"""
+        return self._pool.submit(lambda: getattr(self.client, name)(*args, **kwargs))
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return lambda *args, **kwargs: self.call(name, *args, **kwargs)
+
+    def then(self, future: Future, callback, on_error=None) -> Future:
+        """Run callback(result) on the Tk thread once future is done, or on_error(exc) if it raised.
+
+        Callbacks that are methods of a widget destroyed in the meantime are
+        dropped, so a page can be closed with requests still in flight.
+        """
+        future.add_done_callback(lambda f: self._ready.put((f, callback, on_error)))
+        return future
+
+    def start(self, widget: tk.Misc):
+        """Start delivering callbacks from widget's event loop"""
+        self.stop()
+        self._widget = widget
+        self._after_id = widget.after(self.interval, self._dispatch)
+
+    def stop(self):
+        if self._after_id is not None:
+            self._widget.after_cancel(self._after_id)
+            self._after_id = None
+
+    def shutdown(self):
+        self.stop()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _dispatch(self):
+        end = perf_counter() + self.budget
+        while perf_counter() < end:
+            try:
+                future, callback, on_error = self._ready.get_nowait()
+            except queue.Empty:
+                break
+            if future.cancelled() or not self._alive(callback):
+                continue
+            try:
+                exc = future.exception()
+                if exc is None:
+                    callback(future.result())
+                elif on_error is not None:
+                    on_error(exc)
+                else:
+                    traceback.print_exception(exc)
+            except Exception:
+                # a broken callback must not stop the dispatcher
+                traceback.print_exc()
+        self._after_id = self._widget.after(self.interval, self._dispatch)
+
+    @staticmethod
+    def _alive(callback) -> bool:
+        owner = getattr(callback, "__self__", None)
+        if not isinstance(owner, tk.Misc):
+            return True
+        try:
+            return bool(owner.winfo_exists())
+        except tk.TclError:
+            return False
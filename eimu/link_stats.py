@@ -0,0 +1,127 @@
+import threading
+
+
+class LatencyHistogram:
+    """HDR-style histogram of latencies in nanoseconds.
+
+    Values below 2**bits are counted exactly; above that each power of two is
+    split into 2**(bits-1) linear sub-buckets, so every recorded value is
+    known to within 1/2**(bits-1) of its size whatever its magnitude.
+    """
+
+    def __init__(self, bits: int = 6):
+        self.bits = bits
+        self._sub = 1 << bits
+        self._half = self._sub >> 1
+        self.counts = []
+        self.reset()
+
+    def reset(self):
+        self.counts = [0] * self._sub
+        self.total = 0
+        self.max = 0
+        self.sum = 0
+
+    def _index(self, value: int) -> int:
+        if value < self._sub:
+            return value
+        shift = value.bit_length() - self.bits
+        top = value >> shift
+        return self._sub + (shift - 1) * self._half + (top - self._half)
+
+    def _value(self, index: int) -> int:
+        """Midpoint of the bucket at index"""
+        if index < self._sub:
+            return index
+        shift = (index - self._sub) // self._half + 1
+        top = (index - self._sub) % self._half + self._half
+        return (top << shift) + (1 << shift) // 2
+
+    def record(self, value: int):
+        value = max(int(value), 0)
+        i = self._index(value)
+        if i >= len(self.counts):
+            self.counts.extend([0] * (i + 1 - len(self.counts)))
+        self.counts[i] += 1
+        self.total += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def percentile(self, p: float) -> int:
+        if self.total == 0:
+            return 0
+        rank = max(1, round(self.total * p / 100.0))
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank:
+                return min(self._value(i), self.max)
+        return self.max
+
+    def mean(self) -> float:
+        return self.sum / self.total if self.total else 0.0
+
+
+class CommandStats:
+    """Traffic and latency counters for one command ID."""
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.failures = 0
+        self.short_reads = 0
+        self.resyncs = 0
+        self.bytes_tx = 0
+        self.bytes_rx = 0
+        self.latency.reset()
+
+    def as_dict(self) -> dict:
+        us = 1e-3
+        return {
+            "count": self.count,
+            "failures": self.failures,
+            "short_reads": self.short_reads,
+            "resyncs": self.resyncs,
+            "bytes_tx": self.bytes_tx,
+            "bytes_rx": self.bytes_rx,
+            "mean_us": round(self.latency.mean() * us, 1),
+            "p50_us": round(self.latency.percentile(50) * us, 1),
+            "p95_us": round(self.latency.percentile(95) * us, 1),
+            "p99_us": round(self.latency.percentile(99) * us, 1),
+            "max_us": round(self.latency.max * us, 1),
+        }
+
+
+class LinkStats:
+    """Per-command CommandStats, safe to record from several threads."""
+
+    def __init__(self, names: dict | None = None):
+        self.names = names or {}
+        self.commands = {}
+        self._lock = threading.Lock()
+
+    def record(self, cmd: int, latency_ns: int, success: bool, bytes_tx: int, bytes_rx: int,
+               short_reads: int = 0, resyncs: int = 0):
+        with self._lock:
+            stats = self.commands.get(cmd)
+            if stats is None:
+                stats = self.commands[cmd] = CommandStats()
+            stats.count += 1
+            stats.failures += 0 if success else 1
+            stats.short_reads += short_reads
+            stats.resyncs += resyncs
+            stats.bytes_tx += bytes_tx
+            stats.bytes_rx += bytes_rx
+            stats.latency.record(latency_ns)
+
+    def reset(self):
+        with self._lock:
+            self.commands.clear()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {self.names.get(cmd, hex(cmd)): stats.as_dict()
+                    for cmd, stats in sorted(self.commands.items())}
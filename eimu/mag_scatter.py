@@ -0,0 +1,90 @@
+PAIRS = ((0, 1), (1, 2), (2, 0))  # x-y, y-z and z-x
+COLORS = ('r', 'g', 'b')
+
+
+class MagScatterView:
+    """Live x-y, y-z and z-x scatter of magnetometer samples on one axes.
+
+    The samples are read from a CaptureBuffer the caller fills, the view keeps
+    no copy of its own. update() only draws the samples added since the last
+    frame, on top of a saved copy of the axes that already holds the earlier
+    ones, and then saves the result, so a frame costs the same with ten points
+    as with ten thousand. Everything is drawn again only when the figure is
+    redrawn for another reason (resize, zoom) or when a sample falls outside
+    the axis limits, which grow by a margin each time so that stays rare.
+    """
+
+    def __init__(self, ax, buffer, colors=COLORS, size: float = 6.0, margin: float = 0.25):
+        self.ax = ax
+        self.canvas = ax.figure.canvas
+        self.buffer = buffer
+        self.margin = margin
+
+        self._drawn = 0  # samples in the saved background
+        self._synced = 0  # samples in the history collections, what a full redraw shows
+        self._background = None
+        self._limits = None
+        # history is drawn by normal redraws, fresh only ever holds the samples being blitted
+        self._history = [ax.scatter([], [], color=c, s=size) for c in colors]
+        self._fresh = [ax.scatter([], [], color=c, s=size, animated=True) for c in colors]
+        self._cid = self.canvas.mpl_connect('draw_event', self._on_draw)
+
+    def update(self):
+        """Show the samples added to the buffer since the last update"""
+        new = self.buffer.data[self._drawn:]
+        if not len(new):
+            return
+        if self._limits is None or new.min() < self._limits[0] or new.max() > self._limits[1]:
+            self._fit_limits()
+            self._redraw()
+            return
+        if self._background is None or not self.canvas.supports_blit:
+            self._redraw()
+            return
+        self._blit()
+
+    def clear(self):
+        """Forget what was drawn, call after clearing the buffer"""
+        self._drawn = self._synced = 0
+        self._limits = None
+        self._redraw()
+
+    def disconnect(self):
+        self.canvas.mpl_disconnect(self._cid)
+
+    def _fit_limits(self):
+        shown = self.buffer.data
+        lo, hi = shown.min(), shown.max()
+        pad = self.margin * max(hi - lo, 1e-6)
+        self._limits = (lo - pad, hi + pad)
+        self.ax.set_xlim(*self._limits)
+        self.ax.set_ylim(*self._limits)
+
+    def _sync(self):
+        shown = self.buffer.data
+        for coll, (i, j) in zip(self._history, PAIRS):
+            coll.set_offsets(shown[:, (i, j)])
+        self._synced = len(shown)
+
+    def _redraw(self):
+        self._sync()
+        self.canvas.draw_idle()
+
+    def _blit(self):
+        new = self.buffer.data[self._drawn:]
+        self.canvas.restore_region(self._background)
+        for coll, (i, j) in zip(self._fresh, PAIRS):
+            coll.set_offsets(new[:, (i, j)])
+            self.ax.draw_artist(coll)
+        self.canvas.blit(self.ax.bbox)
+        self._background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self._drawn += len(new)
+
+    def _on_draw(self, event):
+        # a full redraw only shows the history collections, add what they were missing on top
+        self._background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self._drawn = self._synced
+        if self._drawn < len(self.buffer) and self.canvas.supports_blit:
+            self._blit()
+        # keep the next full redraw complete, it costs a copy here but no drawing
+        self._sync()
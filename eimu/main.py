@@ -3,6 +3,7 @@ import ttkbootstrap as tb
 from ttkbootstrap.constants import *
 
 from eimu.globalParams import g
+from eimu.io_executor import EIMUExecutor
 from eimu.pages.SerialConnectPage import SerialConnectFrame
 from eimu.pages.MainAppPage import MainAppFrame
 
@@ -35,7 +36,10 @@ class App(tb.Window):
 
 def main():
   g.app = App(title="EASY IMU SETUP APPLICATION", size=(900,650))
+  g.io = EIMUExecutor()
+  g.io.start(g.app)
   g.app.mainloop()
+  g.io.shutdown()
 
 if __name__ == "__main__":
   main()
\ No newline at end of file
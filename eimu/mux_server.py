@@ -0,0 +1,255 @@
+"""Share one EIMU between many local programs.
+
+A serial port can only be opened by one process, so EIMUMuxServer opens the
+module once and speaks the EIMU protocol itself on a Unix or TCP socket. Any
+number of EIMUSerialClients (the setup app, a ROS node, a logger, notebooks)
+connect to it like to the module:
+
+  python3 -m eimu.mux_server /dev/ttyUSB0 --listen unix:///tmp/eimu.sock
+  imu.connect("unix:///tmp/eimu.sock")      # or tcp://127.0.0.1:7650
+
+READ_IMU_DATA is streamed from the module by one AcquisitionBus while at least
+one client is connected, and not at all when none is. A client read
+of it, or of READ_RPY, READ_ACC, READ_GYRO and READ_ACC_GYRO (slices of it), is
+answered with the newest sample that client has not had yet, so live data adds
+no serial traffic however many clients poll it. Every other command goes
+through the shared client, whose lock puts them on the wire one at a time and
+ahead of the stream. Parameter reads come out of its cache, which stays right
+because every write to the module goes through the server.
+"""
+import argparse
+import os
+import socket
+import socketserver
+import stat
+import threading
+
+import serial
+
+from eimu.eimu_serial import (EIMUSerialClient, CODECS, PARAM_READS, READ_ACC, READ_ACC_GYRO, READ_GYRO,
+                              READ_IMU_DATA, READ_RPY, RESET_PARAMS, START_BYTE)
+from eimu.acquisition import AcquisitionBus
+from eimu.codec import PacketParser, READ1, WRITE1, WRITE3
+from eimu.shm_ring import ShmRingPublisher
+from eimu.transport import parse_socket_url
+
+DEFAULT_LISTEN = "unix:///tmp/eimu.sock"
+
+# reads answered from a streamed READ_IMU_DATA sample (rpy, acc, gyro)
+STREAM_SLICES = {
+    READ_IMU_DATA: slice(0, 9),
+    READ_RPY: slice(0, 3),
+    READ_ACC: slice(3, 6),
+    READ_GYRO: slice(6, 9),
+    READ_ACC_GYRO: slice(3, 9),
+}
+
+
+class _PeerHandler(socketserver.BaseRequestHandler):
+    """One connected client: parse its requests, answer them in order"""
+
+    def handle(self):
+        mux = self.server.mux
+        self.seq = -1  # last stream sample this peer was given
+        parser = PacketParser(START_BYTE)
+        mux._count_peer(1)
+        try:
+            while True:
+                data = self.request.recv(4096)
+                if not data:
+                    break
+                reply = b"".join(mux.respond(self, cmd, payload) for cmd, payload in parser.feed(data))
+                if reply:
+                    self.request.sendall(reply)
+        except (OSError, RuntimeError, serial.SerialException):
+            # peer hung up, or the module went away under the server
+            pass
+        finally:
+            mux._count_peer(-1)
+
+
+class _TCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def server_bind(self):
+        self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        super().server_bind()
+
+
+class _UnixServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+
+class EIMUMuxServer:
+    """Serves a connected EIMUSerialClient to many socket clients.
+
+    fresh_timeout is how long a streamed read waits for a sample newer than
+    the last one its client got before answering with the newest anyway, so
+    clients polling faster than the module see each sample once.
+    """
+
+    def __init__(self, client: EIMUSerialClient, listen: str = DEFAULT_LISTEN, stream: bool = True,
+                 fresh_timeout: float = 0.05):
+        self.client = client
+        self.listen = listen
+        self.fresh_timeout = fresh_timeout
+        self.bus = AcquisitionBus(client) if stream else None
+
+        self.peers = 0
+        self.forwarded = 0  # requests that went to the module
+        self.fanned_out = 0  # reads answered from the stream
+        self.dropped = 0  # unknown or malformed requests
+
+        self._sub = None
+        self._seq = -1
+        self._sample = None
+        self._fresh = threading.Condition()
+        self._stats_lock = threading.Lock()
+        self._thread = None
+
+        family, address = parse_socket_url(listen)
+        if family == socket.AF_UNIX:
+            _remove_stale_socket(address)
+            self._server = _UnixServer(address, _PeerHandler)
+        else:
+            self._server = _TCPServer(address, _PeerHandler)
+        self._server.mux = self
+
+    def start(self):
+        """Start serving on a background thread, the stream starts with the first peer"""
+        self._thread = threading.Thread(target=self._server.serve_forever, name="eimu-mux", daemon=True)
+        self._thread.start()
+
+    def close(self):
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread = None
+        self._server.server_close()
+        with self._stats_lock:
+            if self._sub is not None:
+                self._sub.close()
+                self._sub = None
+        family, address = parse_socket_url(self.listen)
+        if family == socket.AF_UNIX:
+            _remove_stale_socket(address)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _count_peer(self, delta: int):
+        with self._stats_lock:
+            self.peers += delta
+            if self.bus is None:
+                return
+            # stream only while someone can read it
+            if self.peers > 0 and self._sub is None:
+                self._sub = self.bus.subscribe(callback=self._on_sample)
+            elif self.peers == 0 and self._sub is not None:
+                self._sub.close()
+                self._sub = None
+                with self._fresh:
+                    self._sample = None  # stale by the time the next peer asks
+
+    def _on_sample(self, t: float, vals):
+        with self._fresh:
+            self._seq += 1
+            self._sample = vals
+            self._fresh.notify_all()
+
+    def _next_sample(self, peer):
+        with self._fresh:
+            if self._seq <= peer.seq:
+                self._fresh.wait_for(lambda: self._seq > peer.seq, self.fresh_timeout)
+            peer.seq = self._seq
+            return self._sample
+
+    def respond(self, peer, cmd: int, payload: bytes) -> bytes:
+        """Reply bytes for one request from peer, empty for writes and failed reads"""
+        codec = CODECS.get(cmd)
+        if codec is None or len(payload) != codec.request.size:
+            with self._stats_lock:
+                self.dropped += 1
+            return b""
+
+        if self._sub is not None and cmd in STREAM_SLICES and self.client.isStreaming():
+            sample = self._next_sample(peer)
+            if sample is not None:
+                with self._stats_lock:
+                    self.fanned_out += 1
+                return codec.reply.pack(*sample[STREAM_SLICES[cmd]])
+
+        with self._stats_lock:
+            self.forwarded += 1
+        client = self.client
+        if codec.kind == WRITE1:
+            pos, val = codec.request.unpack(payload)
+            client.write_data1(cmd, val, pos)
+            return b""
+        if codec.kind == WRITE3:
+            client.write_data3(cmd, *codec.request.unpack(payload))
+            return b""
+
+        if codec.kind == READ1:
+            pos, _ = codec.request.unpack(payload)
+            if cmd in PARAM_READS and pos == 0:
+                success, val = client.readParam(cmd)
+            else:
+                success, val = client.read_data1(cmd, pos)
+                if cmd == RESET_PARAMS:
+                    client.invalidateParams()
+            vals = (val,)
+        elif cmd in PARAM_READS:
+            success, vals = client.readParam(cmd)
+        else:
+            success, vals = client.read_data(cmd, codec.reply_count)
+        # no reply on failure, the peer times out as it would on the module
+        return codec.reply.pack(*vals) if success else b""
+
+
+def _remove_stale_socket(path: str):
+    """Remove a socket file left by an earlier server, never a regular file"""
+    try:
+        if stat.S_ISSOCK(os.stat(path).st_mode):
+            os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Share one EIMU module with many clients over a socket")
+    parser.add_argument("port", help="serial port of the module (or sim://)")
+    parser.add_argument("--baud", type=int, default=115200)
+    parser.add_argument("--listen", default=DEFAULT_LISTEN, help="unix://path or tcp://host:port to serve on")
+    parser.add_argument("--no-stream", action="store_true",
+                        help="forward every read to the module instead of streaming READ_IMU_DATA")
+    parser.add_argument("--shm", metavar="NAME", default=None,
+                        help="also publish the stream to a shared memory ring (see eimu.shm_ring)")
+    args = parser.parse_args()
+
+    client = EIMUSerialClient()
+    client.connect(args.port, args.baud)
+    server = EIMUMuxServer(client, args.listen, stream=not args.no_stream)
+    server.start()
+    publisher = None
+    if args.shm and server.bus is not None:
+        publisher = ShmRingPublisher(args.shm)
+        publisher.attach(server.bus)
+    print(f"Serving EIMU on {args.listen}, connect clients to that port")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if publisher is not None:
+            publisher.close()
+        server.close()
+        client.disconnect()
+
+
+if __name__ == "__main__":
+    main()
@@ -20,7 +20,7 @@ class AccCalibrateFrame(tb.Frame):
     self.loop_count = 0
     self.no_of_samples = 1000
 
-    g.imu.setWorldFrameId(1)
+    g.io.setWorldFrameId(1)
 
     self.acc_x = deque(maxlen=self.no_of_samples)
     self.acc_y = deque(maxlen=self.no_of_samples)
@@ -33,11 +33,6 @@ class AccCalibrateFrame(tb.Frame):
     self.azValFrame = tb.Frame(self)
 
     ax=0.0; ay=0.0; az=0.0
-    success, buffer = g.imu.readAccOffset()
-    if success:
-      ax = buffer[0]
-      ay = buffer[1]
-      az = buffer[2]
 
     self.axText = tb.Label(self.axValFrame, text="AX-OFFSET:", font=('Monospace',10, 'bold') ,bootstyle="danger")
     self.axVal = tb.Label(self.axValFrame, text=f'{ax}', font=('Monospace',10), bootstyle="dark")
@@ -90,9 +85,18 @@ class AccCalibrateFrame(tb.Frame):
     self.ayValFrame.pack(side='top', fill='x')
     self.azValFrame.pack(side='top', fill='x')
 
+    g.io.then(g.io.readAccOffset(), self.show_offset)
+
     # start process
     self.calibrate_imu()
 
+  def show_offset(self, result):
+    success, buffer = result
+    if success:
+      self.axVal.configure(text=f'{buffer[0]}')
+      self.ayVal.configure(text=f'{buffer[1]}')
+      self.azVal.configure(text=f'{buffer[2]}')
+
   def reset_all_params(self):
     self.loop_count = 0
 
@@ -111,43 +115,50 @@ class AccCalibrateFrame(tb.Frame):
       self.ayVal.configure(text="0.0")
       self.azVal.configure(text="0.0")
 
-      success, buffer = g.imu.readAccRaw()
+      g.io.then(g.io.readAccRaw(), self.on_read_data)
 
-      if success:
-        ax = buffer[0]
-        ay = buffer[1]
-        az = buffer[2]
+    else:
+      self.reset_all_params()
+      self.canvas.after(10, self.calibrate_imu)
 
-        self.acc_x.append(ax)
-        self.acc_y.append(ay)
-        self.acc_z.append(az)
+  def on_read_data(self, result):
+    success, buffer = result
+    if success:
+      ax = buffer[0]
+      ay = buffer[1]
+      az = buffer[2]
 
-        self.loop_count += 1
-        percent = (self.loop_count*100)/self.no_of_samples
-        self.textVal.configure(text=f'{int(percent)} %')
-        self.progressBar['value'] = percent
+      self.acc_x.append(ax)
+      self.acc_y.append(ay)
+      self.acc_z.append(az)
 
-        if self.loop_count >= self.no_of_samples:
-          percent = 100.0
-          self.textVal.configure(text=f'{int(percent)} %')
-          self.progressBar['value'] = percent
-          self.plot_calibrated_data()
-        else:
-          self.canvas.after(10, self.read_data)
+      self.loop_count += 1
+      percent = (self.loop_count*100)/self.no_of_samples
+      self.textVal.configure(text=f'{int(percent)} %')
+      self.progressBar['value'] = percent
 
+      if self.loop_count >= self.no_of_samples:
+        percent = 100.0
+        self.textVal.configure(text=f'{int(percent)} %')
+        self.progressBar['value'] = percent
+        self.plot_calibrated_data()
+      else:
+        self.canvas.after(10, self.read_data)
     else:
-      self.reset_all_params()
-      self.canvas.after(10, self.calibrate_imu)
+      self.canvas.after(10, self.read_data) # retry a dropped sample instead of stalling the loop
 
   def plot_calibrated_data(self):
     ax_offset = self.average(self.acc_x)
     ay_offset = self.average(self.acc_y)
     az_offset = (self.average(self.acc_z) - 9.8)
 
-    g.imu.writeAccOffset(ax_offset, ay_offset, az_offset)
-
-    success, buffer = g.imu.readAccOffset()
+    g.io.writeAccOffset(ax_offset, ay_offset, az_offset)
+    self.computed = (ax_offset, ay_offset, az_offset)
+    g.io.then(g.io.readAccOffset(), self.show_calibrated_data)
 
+  def show_calibrated_data(self, result):
+    ax_offset, ay_offset, az_offset = self.computed
+    success, buffer = result
     if success:
       ax_offset = buffer[0]
       ay_offset = buffer[1]
@@ -7,6 +7,7 @@ import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
 
 from eimu.globalParams import g
+from eimu.eimu_serial import READ_LIN_ACC_RAW, READ_LIN_ACC
 from eimu.components.SetValueFrame import SetValueFrame
 from eimu.components.SelectValueFrame import SelectValueFrame
 
@@ -24,8 +25,9 @@ class AccFilterFrame(tb.Frame):
     self.accFiltDataList = []
 
     self.dataPoints = 50
+    self.accFuture = None # read in flight, animation frames skip the device until it lands
     
-    g.imu.setWorldFrameId(1)
+    g.io.setWorldFrameId(1)
 
     self.label = tb.Label(self, text="FILTER ACC DATA", font=('Monospace',16, 'bold') ,bootstyle="dark")
 
@@ -33,11 +35,9 @@ class AccFilterFrame(tb.Frame):
     self.selectCoord = SelectValueFrame(self, keyTextInit=f"CO-ORDINATE: ", valTextInit=g.coordList[g.coordNum],
                                           initialComboValues=g.coordList, middileware_func=self.selectCoordFunc )
     
-    success, accFilterCF = g.imu.getAccFilterCF()
-    if success:
-      g.accFilterCF = accFilterCF
     self.setAccFilterCFFrame = SetValueFrame(self, keyTextInit="ACC_LPF_CF: ", valTextInit=g.accFilterCF,
                                 middleware_func=self.setAccFilterCFFunc)
+    g.io.then(g.io.getAccFilterCF(), self.showAccFilterCF)
     
     buttonStyle = tb.Style()
     buttonStyleName = 'primary.TButton'
@@ -55,11 +55,6 @@ class AccFilterFrame(tb.Frame):
     self.azValFrame = tb.Frame(self.accelerationValFrame)
 
     ax=0.0; ay=0.0; az=0.0
-    success, buffer = g.imu.readLinearAcc()
-    if success:
-      ax = buffer[0]
-      ay = buffer[1]
-      az = buffer[2]
 
     self.axText = tb.Label(self.axValFrame, text="AX:", font=('Monospace',10, 'bold') ,bootstyle="danger")
     self.axVal = tb.Label(self.axValFrame, text=f'{ax}', font=('Monospace',10), bootstyle="dark")
@@ -94,18 +89,38 @@ class AccFilterFrame(tb.Frame):
     self.axValFrame.pack(side='top', fill='x')
     self.ayValFrame.pack(side='top', fill='x')
     self.azValFrame.pack(side='top', fill='x')  
+
+    g.io.then(g.io.readLinearAcc(), self.showLinearAcc)
   
     ############################################
   
 
+  def showAccFilterCF(self, result):
+    success, accFilterCF = result
+    if success:
+      g.accFilterCF = accFilterCF
+    self.setAccFilterCFFrame.showValue(g.accFilterCF)
+
+  def showLinearAcc(self, result):
+    success, buffer = result
+    if success:
+      self.axVal.configure(text=f"{buffer[0]}")
+      self.ayVal.configure(text=f"{buffer[1]}")
+      self.azVal.configure(text=f"{buffer[2]}")
+
   def setAccFilterCFFunc(self, text):
     if text:
-      g.imu.setAccFilterCF(float(text))
-      success, accFilterCF = g.imu.getAccFilterCF()
-      if success:
-        g.accFilterCF = accFilterCF
+      return g.io.submit(self.writeAccFilterCF, float(text))
   
     return g.accFilterCF
+
+  def writeAccFilterCF(self, cf):
+    # runs on the io thread, must not touch any widget
+    g.imu.setAccFilterCF(cf)
+    success, accFilterCF = g.imu.getAccFilterCF()
+    if success:
+      g.accFilterCF = accFilterCF
+    return g.accFilterCF
   
 
   def selectCoordFunc(self, coord_val_str):
@@ -126,20 +141,28 @@ class AccFilterFrame(tb.Frame):
     self.fig, self.ax = None, None 
 
 
-  def animate(self,i):
+  def readAcc(self):
+    # runs on the io thread, raw and filtered acc in one round trip
+    return g.imu.pipeline() \
+      .read_data3(READ_LIN_ACC_RAW) \
+      .read_data3(READ_LIN_ACC) \
+      .execute()
 
+  def animate(self,i):
+    if self.accFuture is None or self.accFuture.done():
+      self.accFuture = g.io.then(g.io.submit(self.readAcc), self.plotAcc)
 
-    success0, buffer0 = g.imu.readLinearAccRaw()
-    success1, buffer1 = g.imu.readLinearAcc()
+  def plotAcc(self, result):
+    (success0, buffer0), (success1, buffer1) = result
 
-    if success0 and success1:
+    if success0 and success1 and self.fig is not None:
       ax_raw = buffer0[0]
       ay_raw = buffer0[1]
       az_raw = buffer0[2]
 
-      ax = buffer1[0]
-      ay = buffer1[1]
-      az = buffer1[2]
+      ax = round(buffer1[0], 6)
+      ay = round(buffer1[1], 6)
+      az = round(buffer1[2], 6)
 
       self.axVal.configure(text=f"{ax}")
       self.ayVal.configure(text=f"{ay}")
@@ -182,6 +205,7 @@ class AccFilterFrame(tb.Frame):
       self.axes.set_ylabel("linear acceleration in m/s^2") # Set title of y axis 
       self.axes.set_xlabel("number of data points") # Set title of z axis 
       self.axes.legend(["unfiltered", "filtered"], loc ="upper right")
+      self.fig.canvas.draw_idle()
 
         
         
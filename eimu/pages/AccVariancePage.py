@@ -17,7 +17,7 @@ class AccVarianceFrame(tb.Frame):
     self.loop_count = 0
     self.no_of_samples = 1000
 
-    g.imu.setWorldFrameId(1)
+    g.io.setWorldFrameId(1)
 
     self.accx_arr = []
     self.accy_arr = []
@@ -30,11 +30,6 @@ class AccVarianceFrame(tb.Frame):
     self.azValFrame = tb.Frame(self)
 
     ax=0.0; ay=0.0; az=0.0
-    success, buffer = g.imu.readAccVariance()
-    if success:
-      ax = buffer[0]
-      ay = buffer[1]
-      az = buffer[2]
 
     self.axText = tb.Label(self.axValFrame, text="AX-VARIANCE:", font=('Monospace',10, 'bold') ,bootstyle="danger")
     self.axVal = tb.Label(self.axValFrame, text=f'{ax}', font=('Monospace',10), bootstyle="dark")
@@ -86,9 +81,18 @@ class AccVarianceFrame(tb.Frame):
     self.ayValFrame.pack(side='top', fill='x')
     self.azValFrame.pack(side='top', fill='x', pady=(0,20))
 
+    g.io.then(g.io.readAccVariance(), self.show_variance)
+
     # start process
     self.compute_variance()
 
+  def show_variance(self, result):
+    success, buffer = result
+    if success:
+      self.axVal.configure(text=f'{buffer[0]}')
+      self.ayVal.configure(text=f'{buffer[1]}')
+      self.azVal.configure(text=f'{buffer[2]}')
+
   def reset_all_params(self):
     self.loop_count = 0
 
@@ -107,32 +111,37 @@ class AccVarianceFrame(tb.Frame):
       self.ayVal.configure(text="0.0")
       self.azVal.configure(text="0.0")
 
-      success, buffer = g.imu.readLinearAcc()
-      if success:
-        accx_cal = buffer[0]
-        accy_cal = buffer[1]
-        accz_cal = buffer[2]
+      g.io.then(g.io.readLinearAcc(), self.on_read_cal_data)
 
-        self.accx_arr.append(accx_cal)
-        self.accy_arr.append(accy_cal)
-        self.accz_arr.append(accz_cal)
+    else:
+      self.reset_all_params()
+      self.canvas.after(10, self.compute_variance)
 
-        self.loop_count += 1
-        percent = (self.loop_count*100)/self.no_of_samples
-        self.textVal.configure(text=f'{int(percent)} %')
-        self.progressBar['value'] = percent
+  def on_read_cal_data(self, result):
+    success, buffer = result
+    if success:
+      accx_cal = buffer[0]
+      accy_cal = buffer[1]
+      accz_cal = buffer[2]
 
-        if self.loop_count >= self.no_of_samples:
-          percent = 100.0
-          self.textVal.configure(text=f'{int(percent)} %')
-          self.progressBar['value'] = percent
-          self.print_computed_variance()
-        else:
-          self.canvas.after(10, self.read_cal_data)
+      self.accx_arr.append(accx_cal)
+      self.accy_arr.append(accy_cal)
+      self.accz_arr.append(accz_cal)
 
+      self.loop_count += 1
+      percent = (self.loop_count*100)/self.no_of_samples
+      self.textVal.configure(text=f'{int(percent)} %')
+      self.progressBar['value'] = percent
+
+      if self.loop_count >= self.no_of_samples:
+        percent = 100.0
+        self.textVal.configure(text=f'{int(percent)} %')
+        self.progressBar['value'] = percent
+        self.print_computed_variance()
+      else:
+        self.canvas.after(10, self.read_cal_data)
     else:
-      self.reset_all_params()
-      self.canvas.after(10, self.compute_variance)
+      self.canvas.after(10, self.read_cal_data) # retry a dropped sample instead of stalling the loop
 
   def print_computed_variance(self):
 
@@ -140,9 +149,13 @@ class AccVarianceFrame(tb.Frame):
     accy_variance = np.var(self.accy_arr)
     accz_variance = np.var(self.accz_arr)
 
-    g.imu.writeAccVariance(accx_variance, accy_variance, accz_variance)
+    g.io.writeAccVariance(accx_variance, accy_variance, accz_variance)
+    self.computed = (accx_variance, accy_variance, accz_variance)
+    g.io.then(g.io.readAccVariance(), self.show_computed_variance)
 
-    success, buffer = g.imu.readAccVariance()
+  def show_computed_variance(self, result):
+    accx_variance, accy_variance, accz_variance = self.computed
+    success, buffer = result
     if success:
       accx_variance = buffer[0]
       accy_variance = buffer[1]
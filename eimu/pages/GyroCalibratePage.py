@@ -20,7 +20,7 @@ class GyroCalibrateFrame(tb.Frame):
     self.loop_count = 0
     self.no_of_samples = 1000
 
-    g.imu.setWorldFrameId(1)
+    g.io.setWorldFrameId(1)
 
     self.gyro_x = deque(maxlen=self.no_of_samples)
     self.gyro_y = deque(maxlen=self.no_of_samples)
@@ -33,11 +33,6 @@ class GyroCalibrateFrame(tb.Frame):
     self.gzValFrame = tb.Frame(self)
 
     gx=0.0; gy=0.0; gz=0.0
-    success, buffer = g.imu.readGyroOffset()
-    if success:
-      gx = buffer[0]
-      gy = buffer[1]
-      gz = buffer[2]
 
     self.gxText = tb.Label(self.gxValFrame, text="GX-OFFSET:", font=('Monospace',10, 'bold') ,bootstyle="danger")
     self.gxVal = tb.Label(self.gxValFrame, text=f'{gx}', font=('Monospace',10), bootstyle="dark")
@@ -90,9 +85,18 @@ class GyroCalibrateFrame(tb.Frame):
     self.gyValFrame.pack(side='top', fill='x')
     self.gzValFrame.pack(side='top', fill='x')
 
+    g.io.then(g.io.readGyroOffset(), self.show_offset)
+
     # start process
     self.calibrate_imu()
 
+  def show_offset(self, result):
+    success, buffer = result
+    if success:
+      self.gxVal.configure(text=f'{buffer[0]}')
+      self.gyVal.configure(text=f'{buffer[1]}')
+      self.gzVal.configure(text=f'{buffer[2]}')
+
   def reset_all_params(self):
     self.loop_count = 0
     
@@ -111,32 +115,37 @@ class GyroCalibrateFrame(tb.Frame):
       self.gyVal.configure(text="0.0")
       self.gzVal.configure(text="0.0")
 
-      success, buffer = g.imu.readGyroRaw()
-      if success:
-        gx = buffer[0]
-        gy = buffer[1]
-        gz = buffer[2]
+      g.io.then(g.io.readGyroRaw(), self.on_read_data)
 
-        self.gyro_x.append(gx)
-        self.gyro_y.append(gy)
-        self.gyro_z.append(gz)
+    else:
+      self.reset_all_params()
+      self.canvas.after(10, self.calibrate_imu)
 
-        self.loop_count += 1
-        percent = (self.loop_count*100)/self.no_of_samples
-        self.textVal.configure(text=f'{int(percent)} %')
-        self.progressBar['value'] = percent
+  def on_read_data(self, result):
+    success, buffer = result
+    if success:
+      gx = buffer[0]
+      gy = buffer[1]
+      gz = buffer[2]
+
+      self.gyro_x.append(gx)
+      self.gyro_y.append(gy)
+      self.gyro_z.append(gz)
 
-        if self.loop_count >= self.no_of_samples:
-          percent = 100.0
-          self.textVal.configure(text=f'{int(percent)} %')
-          self.progressBar['value'] = percent
-          self.plot_calibrated_data()
-        else:
-          self.canvas.after(10, self.read_data)
+      self.loop_count += 1
+      percent = (self.loop_count*100)/self.no_of_samples
+      self.textVal.configure(text=f'{int(percent)} %')
+      self.progressBar['value'] = percent
 
+      if self.loop_count >= self.no_of_samples:
+        percent = 100.0
+        self.textVal.configure(text=f'{int(percent)} %')
+        self.progressBar['value'] = percent
+        self.plot_calibrated_data()
+      else:
+        self.canvas.after(10, self.read_data)
     else:
-      self.reset_all_params()
-      self.canvas.after(10, self.calibrate_imu)
+      self.canvas.after(10, self.read_data) # retry a dropped sample instead of stalling the loop
 
   def plot_calibrated_data(self):
 
@@ -144,10 +153,13 @@ class GyroCalibrateFrame(tb.Frame):
     gy_offset = self.average(self.gyro_y)
     gz_offset = self.average(self.gyro_z)
 
-    g.imu.writeGyroOffset(gx_offset, gy_offset, gz_offset)
-
-    success, buffer = g.imu.readGyroOffset()
+    g.io.writeGyroOffset(gx_offset, gy_offset, gz_offset)
+    self.computed = (gx_offset, gy_offset, gz_offset)
+    g.io.then(g.io.readGyroOffset(), self.show_calibrated_data)
 
+  def show_calibrated_data(self, result):
+    gx_offset, gy_offset, gz_offset = self.computed
+    success, buffer = result
     if success:
       gx_offset = buffer[0]
       gy_offset = buffer[1]
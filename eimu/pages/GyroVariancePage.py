@@ -17,7 +17,7 @@ class GyroVarianceFrame(tb.Frame):
     self.loop_count = 0
     self.no_of_samples = 1000
 
-    g.imu.setWorldFrameId(1)
+    g.io.setWorldFrameId(1)
 
     self.gyrox_arr = []
     self.gyroy_arr = []
@@ -30,11 +30,6 @@ class GyroVarianceFrame(tb.Frame):
     self.gzValFrame = tb.Frame(self)
 
     gx=0.0; gy=0.0; gz=0.0
-    success, buffer = g.imu.readGyroVariance()
-    if success:
-      gx = buffer[0]
-      gy = buffer[1]
-      gz = buffer[2]
 
     self.gxText = tb.Label(self.gxValFrame, text="GX-VARIANCE:", font=('Monospace',10, 'bold') ,bootstyle="danger")
     self.gxVal = tb.Label(self.gxValFrame, text=f'{gx}', font=('Monospace',10), bootstyle="dark")
@@ -86,9 +81,18 @@ class GyroVarianceFrame(tb.Frame):
     self.gyValFrame.pack(side='top', fill='x')
     self.gzValFrame.pack(side='top', fill='x', pady=(0,20))
 
+    g.io.then(g.io.readGyroVariance(), self.show_variance)
+
     # start process
     self.compute_variance()
 
+  def show_variance(self, result):
+    success, buffer = result
+    if success:
+      self.gxVal.configure(text=f'{buffer[0]}')
+      self.gyVal.configure(text=f'{buffer[1]}')
+      self.gzVal.configure(text=f'{buffer[2]}')
+
   def reset_all_params(self):
     self.loop_count = 0
 
@@ -107,32 +111,37 @@ class GyroVarianceFrame(tb.Frame):
       self.gyVal.configure(text="0.0")
       self.gzVal.configure(text="0.0")
 
-      success, buffer = g.imu.readGyro()
-      if success:
-        gyrox_cal = buffer[0]
-        gyroy_cal = buffer[1]
-        gyroz_cal = buffer[2]
+      g.io.then(g.io.readGyro(), self.on_read_cal_data)
+
+    else:
+      self.reset_all_params()
+      self.canvas.after(10, self.compute_variance)
+
+  def on_read_cal_data(self, result):
+    success, buffer = result
+    if success:
+      gyrox_cal = buffer[0]
+      gyroy_cal = buffer[1]
+      gyroz_cal = buffer[2]
         
-        self.gyrox_arr.append(gyrox_cal)
-        self.gyroy_arr.append(gyroy_cal)
-        self.gyroz_arr.append(gyroz_cal)
+      self.gyrox_arr.append(gyrox_cal)
+      self.gyroy_arr.append(gyroy_cal)
+      self.gyroz_arr.append(gyroz_cal)
 
-        self.loop_count += 1
-        percent = (self.loop_count*100)/self.no_of_samples
+      self.loop_count += 1
+      percent = (self.loop_count*100)/self.no_of_samples
+      self.textVal.configure(text=f'{int(percent)} %')
+      self.progressBar['value'] = percent
+
+      if self.loop_count >= self.no_of_samples:
+        percent = 100.0
         self.textVal.configure(text=f'{int(percent)} %')
         self.progressBar['value'] = percent
-
-        if self.loop_count >= self.no_of_samples:
-          percent = 100.0
-          self.textVal.configure(text=f'{int(percent)} %')
-          self.progressBar['value'] = percent
-          self.print_computed_variance()
-        else:
-          self.canvas.after(10, self.read_cal_data)
-
+        self.print_computed_variance()
+      else:
+        self.canvas.after(10, self.read_cal_data)
     else:
-      self.reset_all_params()
-      self.canvas.after(10, self.compute_variance)
+      self.canvas.after(10, self.read_cal_data) # retry a dropped sample instead of stalling the loop
 
   def print_computed_variance(self):
 
@@ -140,9 +149,13 @@ class GyroVarianceFrame(tb.Frame):
     gyroy_variance = np.var(self.gyroy_arr)
     gyroz_variance = np.var(self.gyroz_arr)
 
-    g.imu.writeGyroVariance(gyrox_variance, gyroy_variance, gyroz_variance)
+    g.io.writeGyroVariance(gyrox_variance, gyroy_variance, gyroz_variance)
+    self.computed = (gyrox_variance, gyroy_variance, gyroz_variance)
+    g.io.then(g.io.readGyroVariance(), self.show_computed_variance)
 
-    success, buffer = g.imu.readGyroVariance()
+  def show_computed_variance(self, result):
+    gyrox_variance, gyroy_variance, gyroz_variance = self.computed
+    success, buffer = result
     if success:
       gyrox_variance = buffer[0]
       gyroy_variance = buffer[1]
@@ -16,11 +16,9 @@ class I2CSetupFrame(tb.Frame):
     self.frame = tb.Frame(self)
 
     #create widgets to be added to frame
-    success, address = g.imu.getI2cAddress()
-    if success:
-      g.i2cAddress = address
     self.setI2Caddress = SetValueFrame(self.frame, keyTextInit="*I2C_ADDRESS: ", valTextInit=g.i2cAddress,
                                 middleware_func=self.setI2CaddressFunc)
+    g.io.then(g.io.getI2cAddress(), self.showI2Caddress)
 
     #add framed widgets to frame
     self.setI2Caddress.pack(side='top', expand=True, fill="both")
@@ -31,11 +29,22 @@ class I2CSetupFrame(tb.Frame):
     self.frame.place(relx=0.5, rely=0.5, anchor="center", relwidth=0.3)
 
 
+  def showI2Caddress(self, result):
+    success, address = result
+    if success:
+      g.i2cAddress = address
+    self.setI2Caddress.showValue(g.i2cAddress)
+
   def setI2CaddressFunc(self, text):
     if text:
-      g.imu.setI2cAddress(int(text))
-      success, address = g.imu.getI2cAddress()
-      if success:
-        g.i2cAddress = address
+      return g.io.submit(self.writeI2Caddress, int(text))
   
+    return g.i2cAddress
+
+  def writeI2Caddress(self, address):
+    # runs on the io thread, must not touch any widget
+    g.imu.setI2cAddress(address)
+    success, address = g.imu.getI2cAddress()
+    if success:
+      g.i2cAddress = address
     return g.i2cAddress
\ No newline at end of file
@@ -11,6 +11,7 @@ from eimu.components.SetValueFrame import SetValueFrame
 from eimu.components.SelectValueFrame import SelectValueFrame
 
 from math import pi
+from time import perf_counter
 
 toRad = 2 * pi / 360
 toDeg = 1 / toRad
@@ -22,6 +23,7 @@ class ImuVisualizeFrame(tb.Frame):
     super().__init__(master=parentFrame)
 
     self.fig, self.ax = None, None
+    self.anims = {} # running animation of each open plot window
 
     self.world_axis_x_color = '#a00000'
     self.world_axis_y_color = 'green'
@@ -35,7 +37,7 @@ class ImuVisualizeFrame(tb.Frame):
 
     self.sensor_axis_line_width = str(4.0)
 
-    g.imu.setWorldFrameId(1)
+    g.io.setWorldFrameId(1)
 
     # self.plot_elevation_angle = 60 
     # self.plot_horizontal_angle = 60
@@ -43,17 +45,13 @@ class ImuVisualizeFrame(tb.Frame):
     self.label = tb.Label(self, text="VIZUALIZE IMU DATA", font=('Monospace',16, 'bold') ,bootstyle="dark")
   
     #create widgets to be added to the Fame
-    success, frameId = g.imu.getWorldFrameId()
-    if success:
-      g.frameId = frameId
-    self.selectFrameId = SelectValueFrame(self, keyTextInit=f"REFERENCE_FRAME: ", valTextInit=g.frameList[g.frameId],
+    self.selectFrameId = SelectValueFrame(self, keyTextInit=f"REFERENCE_FRAME: ", valTextInit=g.frameList[1],
                                           initialComboValues=g.frameList, middileware_func=self.selectFrameIdFunc )
+    g.io.then(g.io.getWorldFrameId(), self.showFrameId)
     
-    success, filterGain = g.imu.getFilterGain()
-    if success:
-      g.filterGain = filterGain
     self.setFilterGain = SetValueFrame(self, keyTextInit="FILTER_GAIN: ", valTextInit=g.filterGain,
                                 middleware_func=self.setFilterGainFunc)
+    g.io.then(g.io.getFilterGain(), self.showFilterGain)
     
     buttonStyle = tb.Style()
     buttonStyleName = 'primary.TButton'
@@ -81,17 +79,6 @@ class ImuVisualizeFrame(tb.Frame):
     self.gzValFrame = tb.Frame(self.angularVelValFrame)
 
     r=0.0; p=0.0; y=0.0; ax=0.0; ay=0.0; az=0.0; gx=0.0; gy=0.0; gz=0.0
-    success, buffer = g.imu.readImuData()
-    if success:
-      r = buffer[0]
-      p = buffer[1]
-      y = buffer[2]
-      ax = buffer[3]
-      ay = buffer[4]
-      az = buffer[5]
-      gx = buffer[6]
-      gy = buffer[7]
-      gz = buffer[8]
 
     self.rText = tb.Label(self.rValFrame, text="R:", font=('Monospace',10, 'bold') ,bootstyle="danger")
     self.rVal = tb.Label(self.rValFrame, text=f'{round(r*toDeg,2)}', font=('Monospace',10), bootstyle="dark")
@@ -173,21 +160,44 @@ class ImuVisualizeFrame(tb.Frame):
     self.gxValFrame.pack(side='top', fill='x')
     self.gyValFrame.pack(side='top', fill='x')
     self.gzValFrame.pack(side='top', fill='x')    
+
+    g.io.then(g.io.readImuData(), self.showImuData)
   
     ############################################
 
 
+  def showFrameId(self, result):
+    success, frameId = result
+    if success:
+      g.frameId = frameId
+      self.selectFrameId.setVal(g.frameList[g.frameId])
+
+  def showFilterGain(self, result):
+    success, filterGain = result
+    if success:
+      g.filterGain = filterGain
+    self.setFilterGain.showValue(g.filterGain)
+
   def setFilterGainFunc(self, text):
     if text:
-      g.imu.setFilterGain(float(text))
-      success, filterGain = g.imu.getFilterGain()
-      if success:
-        g.filterGain = filterGain
+      return g.io.submit(self.writeFilterGain, float(text))
   
     return g.filterGain
+
+  def writeFilterGain(self, gain):
+    # runs on the io thread, must not touch any widget
+    g.imu.setFilterGain(gain)
+    success, filterGain = g.imu.getFilterGain()
+    if success:
+      g.filterGain = filterGain
+    return g.filterGain
   
 
   def selectFrameIdFunc(self, frame_val_str):
+    return g.io.submit(self.writeFrameId, frame_val_str)
+
+  def writeFrameId(self, frame_val_str):
+    # runs on the io thread, must not touch any widget
     if frame_val_str:
       
       if frame_val_str == g.frameList[0]:
@@ -208,100 +218,82 @@ class ImuVisualizeFrame(tb.Frame):
     return g.frameList[g.frameId]
 
 
-  def onClose(self,event): 
-    plt.close()
-    self.fig, self.ax = None, None 
+  def onClose(self, event, imuSub): 
+    plt.close(event.canvas.figure)
+    self.anims.pop(event.canvas.figure, None)
+    if event.canvas.figure is self.fig:
+      self.fig, self.ax = None, None
+    # only this window's subscription, other windows keep theirs
+    imuSub.close()
 
 
-  def animate(self,i):
+  def showImuData(self, result):
+    success, buffer = result
+    if success:
+      r, p, y, ax, ay, az, gx, gy, gz = buffer
 
-      success, buffer = g.imu.readImuData()
+      self.rVal.configure(text=f"{round(r*toDeg,2)}")
+      self.pVal.configure(text=f"{round(p*toDeg,2)}")
+      self.yVal.configure(text=f"{round(y*toDeg,2)}")
+      
+      self.axVal.configure(text=f"{ax}")
+      self.ayVal.configure(text=f"{ay}")
+      self.azVal.configure(text=f"{az}")
+      
+      self.gxVal.configure(text=f"{gx}")
+      self.gyVal.configure(text=f"{gy}")
+      self.gzVal.configure(text=f"{gz}")
+
+
+  def animate(self, i, imuSub, sensorLines, frameTimeText, frameTime):
+    # newest sample off the shared bus, no request of our own
+    start = perf_counter()
+    success, t, vals = imuSub.latest()
+    if success:
+      self.plotImuData((True, tuple(round(float(v), 6) for v in vals)), sensorLines)
+    self.showFrameTime(start, frameTimeText, frameTime)
+    # only these are redrawn, over the cached background of the world axes
+    return (*sensorLines, frameTimeText)
+
+  def plotImuData(self, result, sensorLines):
+      self.showImuData(result)
+      success, buffer = result
       
       if success:
         r = buffer[0]
         p = buffer[1]
         y = buffer[2]
-        ax = buffer[3]
-        ay = buffer[4]
-        az = buffer[5]
-        gx = buffer[6]
-        gy = buffer[7]
-        gz = buffer[8]
-
-        self.rVal.configure(text=f"{round(r*toDeg,2)}")
-        self.pVal.configure(text=f"{round(p*toDeg,2)}")
-        self.yVal.configure(text=f"{round(y*toDeg,2)}")
-        
-        self.axVal.configure(text=f"{ax}")
-        self.ayVal.configure(text=f"{ay}")
-        self.azVal.configure(text=f"{az}")
-        
-        self.gxVal.configure(text=f"{gx}")
-        self.gyVal.configure(text=f"{gy}")
-        self.gzVal.configure(text=f"{gz}")
 
         #-----------------------------------------------------------------------
         ##### convert rpy to DCM #####################
-        DCM = [[np.cos(p)*np.cos(y), np.cos(p)*np.sin(y), -1.0*np.sin(p)], # cθcψ, cθsψ, −sθ
-              [(np.sin(r)*np.sin(p)*np.cos(y)) - (np.cos(r)*np.sin(y)), (np.sin(r)*np.sin(p)*np.sin(y)) + (np.cos(r)*np.cos(y)), np.sin(r)*np.cos(p)], # sϕsθcψ - cϕsψ, sϕsθsψ + cϕcψ, sϕcθ
-              [(np.cos(r)*np.sin(p)*np.cos(y)) + (np.sin(r)*np.sin(y)), (np.cos(r)*np.sin(p)*np.sin(y)) - (np.sin(r)*np.cos(y)), np.cos(r)*np.cos(p)]] # cϕsθcψ + sϕsψ, cϕsθsψ - sϕcψ, cϕcθ
+        cr, sr = np.cos(r), np.sin(r)
+        cp, sp = np.cos(p), np.sin(p)
+        cy, sy = np.cos(y), np.sin(y)
+        DCM = [[cp*cy, cp*sy, -1.0*sp], # cθcψ, cθsψ, −sθ
+              [(sr*sp*cy) - (cr*sy), (sr*sp*sy) + (cr*cy), sr*cp], # sϕsθcψ - cϕsψ, sϕsθsψ + cϕcψ, sϕcθ
+              [(cr*sp*cy) + (sr*sy), (cr*sp*sy) - (sr*cy), cr*cp]] # cϕsθcψ + sϕsψ, cϕsθsψ - sϕcψ, cϕcθ
         
-        ##### get the IMU sensor coordinate vector from the DCM #####################
-        x_vect = DCM[0]
-        y_vect = DCM[1]
-        z_vect = DCM[2]
+        ##### the rows of the DCM are the IMU sensor coordinate vectors #####################
+        for line, vect in zip(sensorLines, DCM):
+          line.set_data_3d([0, vect[0]], [0, vect[1]], [0, vect[2]])
         #----------------------------------------------------------------------
 
-
-
-        # Clear all axis
-        self.ax.cla()
-        
-        self.ax.set_xlim(-1.0, 1.0)
-        self.ax.set_ylim(-1.0, 1.0)
-        self.ax.set_zlim(-1.0, 1.0)
-        self.ax.grid(False)
-        # self.ax.view_init(self.plot_elevation_angle, self.plot_horizontal_angle)
-        
-        # defining world axes
-        x0 = [0, 1]
-        x1 = [0, 0]
-        x2 = [0, 0]  
-        self.ax.plot(x0, x1, x2, c=self.world_axis_x_color, lw=self.world_axis_line_width)
-
-        y0 = [0, 0]
-        y1 = [0, 1]
-        y2 = [0, 0]  
-        self.ax.plot(y0, y1, y2, c=self.world_axis_y_color, lw=self.world_axis_line_width)
-
-        z0 = [0, 0]
-        z1 = [0, 0]
-        z2 = [0, 1]  
-        self.ax.plot(z0, z1, z2, c=self.world_axis_z_color, lw=self.world_axis_line_width)
-
-
-        # defining sensor axes
-        x0 = [0, x_vect[0]]
-        x1 = [0, x_vect[1]]
-        x2 = [0, x_vect[2]]  
-        self.ax.plot(x0, x1, x2, c=self.sensor_axis_x_color, lw=self.sensor_axis_line_width)
-
-        y0 = [0, y_vect[0]]
-        y1 = [0, y_vect[1]]
-        y2 = [0, y_vect[2]]  
-        self.ax.plot(y0, y1, y2, c=self.sensor_axis_y_color, lw=self.sensor_axis_line_width)
-
-        z0 = [0, z_vect[0]]
-        z1 = [0, z_vect[1]]
-        z2 = [0, z_vect[2]]  
-        self.ax.plot(z0, z1, z2, c=self.sensor_axis_z_color, lw=self.sensor_axis_line_width)
-          
-          
-        ##    # Pause the plot for INTERVAL seconds 
-        ##    plt.pause(INTERVAL)
+  def showFrameTime(self, start, frameTimeText, frameTime):
+    # smoothed time spent updating the artists, and the rate frames actually arrive at
+    now = perf_counter()
+    frameTime['update'] = 0.9*frameTime['update'] + 0.1*(now - start)
+    if frameTime['last'] is not None:
+      frameTime['period'] = 0.9*frameTime['period'] + 0.1*(now - frameTime['last'])
+    frameTime['last'] = now
+    fps = 1.0/frameTime['period'] if frameTime['period'] > 0 else 0.0
+    frameTimeText.set_text(f"update {frameTime['update']*1000:.2f} ms | {fps:.1f} fps")
 
 
   def runVisualization(self):
+    # every window gets its own subscription and artists, handed to its animation,
+    # so closing one leaves the others running
+    imuSub = g.bus.subscribe(maxsize=1)
+
     self.fig = plt.figure()
     self.ax = self.fig.add_subplot(111, projection='3d')
 
@@ -311,7 +303,7 @@ class ImuVisualizeFrame(tb.Frame):
     self.ax.grid(False)
     # self.ax.view_init(self.plot_elevation_angle, self.plot_horizontal_angle)
     
-    # defining axes
+    # defining world axes, drawn once into the blit background
     x0 = [0, 1]
     x1 = [0, 0]
     x2 = [0, 0]  
@@ -327,6 +319,18 @@ class ImuVisualizeFrame(tb.Frame):
     z2 = [0, 1]  
     self.ax.plot(z0, z1, z2, c=self.world_axis_z_color, lw=self.world_axis_line_width)
 
-    self.fig.canvas.mpl_connect('close_event', self.onClose)
-    self.anim = FuncAnimation(self.fig, self.animate, frames = np.arange(0, 1000000, 1), interval=50)
-    plt.show()
\ No newline at end of file
+    # defining sensor axes, created once and moved with set_data_3d every frame
+    sensorLines = []
+    for vect, color in zip(np.eye(3), [self.sensor_axis_x_color, self.sensor_axis_y_color, self.sensor_axis_z_color]):
+      line, = self.ax.plot([0, vect[0]], [0, vect[1]], [0, vect[2]], c=color, lw=self.sensor_axis_line_width, animated=True)
+      sensorLines.append(line)
+
+    frameTimeText = self.ax.text2D(0.02, 0.98, "", transform=self.ax.transAxes, va='top',
+                                   family='monospace', fontsize=9, animated=True)
+    frameTime = {'update': 0.0, 'period': 0.0, 'last': None}
+
+    self.fig.canvas.mpl_connect('close_event', lambda event: self.onClose(event, imuSub))
+    self.anims[self.fig] = FuncAnimation(self.fig, self.animate, frames = np.arange(0, 1000000, 1), interval=50,
+                                    fargs=(imuSub, sensorLines, frameTimeText, frameTime),
+                                    blit=True, cache_frame_data=False)
+    plt.show()
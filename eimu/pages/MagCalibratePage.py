@@ -1,15 +1,19 @@
 import tkinter as tk
+from tkinter import filedialog
 import ttkbootstrap as tb
 from ttkbootstrap.constants import *
 
 import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
 import numpy as np
-from scipy import linalg
 import time
 from termcolor import colored
 
 from eimu.globalParams import g
+from eimu.mag_scatter import MagScatterView
+from eimu.capture_buffer import CaptureBuffer
+from eimu.ellipsoid_fit import OnlineEllipsoidFit, robust_ellipsoid_fit, fit_report
+from eimu.components.SelectValueFrame import SelectValueFrame
 
 
 
@@ -21,17 +25,20 @@ class MagCalibrateFrame(tb.Frame):
     self.A_1 = np.eye(3)
     self.F = 1
 
-    self.magArray = []
-    self.mag_x = []
-    self.mag_y = []
-    self.mag_z = []
+    self.magBuffer = None # samples of the current capture, read in place by the plot and the fit
+    self.magView = None # plots the captured samples while the plot window is open
+    self.magFit = None # running ellipsoid fit of the capture, updated with every sample
 
     self.anim = None
     self.stop = False
     self.calibrated = False
     self.HISTORY_SIZE = 10000
+    self.FIT_EVERY = 10 # samples between live estimates
+    self.fitModeList = ["LEAST_SQUARES", "ROBUST"] # ROBUST drops samples off the ellipsoid, e.g. interference bursts
+    self.fitMode = self.fitModeList[0]
+    self.magFuture = None # read in flight, animation frames skip the device until it lands
 
-    g.imu.setWorldFrameId(1)
+    g.io.setWorldFrameId(1)
 
     self.fig, self.ax = None, None
     
@@ -40,15 +47,25 @@ class MagCalibrateFrame(tb.Frame):
     self.frame = tb.Frame(self)
     
     #create widgets to be added to frame1
+    self.selectFitMode = SelectValueFrame(self.frame, keyTextInit="FIT_MODE: ", valTextInit=self.fitMode,
+                                          initialComboValues=self.fitModeList, middileware_func=self.selectFitModeFunc)
+
     buttonStyle = tb.Style()
     buttonStyleName = 'primary.TButton'
     buttonStyle.configure(buttonStyleName, font=('Monospace',10,'bold'))
     self.calMagButton = tb.Button(self.frame, text="START",
                                style=buttonStyleName, padding=20,
                                command=self.runCalibration)
+    self.saveButton = tb.Button(self.frame, text="SAVE SAMPLES",
+                               style=buttonStyleName, padding=10, state="disabled",
+                               command=self.saveSamples)
     
     #add framed widgets to frame
+    self.selectFitMode.pack(side='top', expand=True, fill="both", pady=(0,10))
     self.calMagButton.pack(side='top', expand=True, fill="both")
+    self.saveButton.pack(side='top', expand=True, fill="both", pady=(10,0))
+    self.estimateLabel = tb.Label(self.frame, text="", font=('Monospace',10), bootstyle="dark")
+    self.estimateLabel.pack(side='top', pady=(10,0))
 
     #add label and frame to CalibrateAccFrame
     self.label.pack(side='top', pady=(20,50))
@@ -57,22 +74,36 @@ class MagCalibrateFrame(tb.Frame):
 
   def calibrate(self):
       
-    # ellipsoid fit
-    s = np.array(self.magArray).T
-    M, n, d = self.__ellipsoid_fit(s)
-    
-    # calibration parameters
-    # note: some implementations of sqrtm return complex type, taking real
-    M_1 = linalg.inv(M)
-    self.b = -np.dot(M_1, n)
-    self.A_1 = np.real(self.F / np.sqrt(np.dot(n.T, np.dot(M_1, n)) - d) * linalg.sqrtm(M))
-
-    ################################################
+    # the capture is over, it can be exported from now on
+    self.saveButton.configure(state="normal")
 
+    # ellipsoid fit
+    s = self.magBuffer.data
+    if self.fitMode == "ROBUST":
+      try:
+        report = robust_ellipsoid_fit(s, self.F)
+      except np.linalg.LinAlgError:
+        report = None
+    else:
+      # the scatter matrix was summed up during the capture
+      estimate = self.magFit.estimate()
+      report = None if estimate is None else fit_report(s, estimate[0], estimate[1], self.F)
+    if report is None:
+      print(colored("\nNot enough samples to fit the ellipsoid", 'red'))
+      return
+
+    self.b, self.A_1 = report.b, report.A_1
+    self.printFit(report)
+
+    g.io.then(g.io.submit(self.writeCalibration, self.b, self.A_1), self.printCalibration)
+
+
+  def writeCalibration(self, b, A_1):
+    # runs on the io thread, must not touch any widget
     b_vect = np.zeros([3, 1])
     A_mat = np.eye(3)
     
-    g.imu.writeMagHardOffset(self.b[0][0], self.b[1][0], self.b[2][0])
+    g.imu.writeMagHardOffset(b[0][0], b[1][0], b[2][0])
 
     success, buffer = g.imu.readMagHardOffset()
     if success:
@@ -81,7 +112,7 @@ class MagCalibrateFrame(tb.Frame):
       b_vect[2][0] = buffer[2]
     
 
-    g.imu.writeMagSoftOffset0(self.A_1[0][0], self.A_1[0][1], self.A_1[0][2])
+    g.imu.writeMagSoftOffset0(A_1[0][0], A_1[0][1], A_1[0][2])
 
     success, buffer = g.imu.readMagSoftOffset0()
     if success:
@@ -90,7 +121,7 @@ class MagCalibrateFrame(tb.Frame):
       A_mat[0][2] = buffer[2]
 
 
-    g.imu.writeMagSoftOffset1(self.A_1[1][0], self.A_1[1][1], self.A_1[1][2])
+    g.imu.writeMagSoftOffset1(A_1[1][0], A_1[1][1], A_1[1][2])
 
     success, buffer = g.imu.readMagSoftOffset1()
     if success:
@@ -99,89 +130,61 @@ class MagCalibrateFrame(tb.Frame):
       A_mat[1][2] = buffer[2]
 
 
-    g.imu.writeMagSoftOffset2(self.A_1[2][0], self.A_1[2][1], self.A_1[2][2])
+    g.imu.writeMagSoftOffset2(A_1[2][0], A_1[2][1], A_1[2][2])
 
     success, buffer = g.imu.readMagSoftOffset2()
     if success:
       A_mat[2][0] = buffer[0]
       A_mat[2][1] = buffer[1]
       A_mat[2][2] = buffer[2]
-    
-
-    ################################################
-    
-    print(colored("\nHard Iron Offset (b_vect)", 'green'))
-    print(b_vect)
-    
-    print(colored("\nSoft Iron Offset (A_mat):", 'green'))
-    print(A_mat)
 
+    return b_vect, A_mat
 
 
+  def showEstimate(self, estimate):
+    if estimate is None:
+      return
+    b, A_1, residual = estimate
+    self.estimateLabel.configure(
+      text=f"b = [{b[0][0]:.2f}, {b[1][0]:.2f}, {b[2][0]:.2f}]\nresidual = {residual:.4f}  (N={self.magFit.count})")
 
-  def __ellipsoid_fit(self, s):
-    ''' Estimate ellipsoid parameters from a set of points.
 
-      Parameters
-      ----------
-      s : array_like
-        The samples (M,N) where M=3 (x,y,z) and N=number of samples.
+  def printFit(self, report):
+    self.estimateLabel.configure(
+      text=f"b = [{report.b[0][0]:.2f}, {report.b[1][0]:.2f}, {report.b[2][0]:.2f}]\n"
+           f"inliers = {100 * report.inlier_fraction:.1f}%\n|B|/F = {report.norm_mean:.4f} +/- {report.norm_std:.4f}")
 
-      Returns
-      -------
-      M, n, d : array_like, array_like, float
-        The ellipsoid parameters M, n, d.
+    print(colored(f"\nFit ({self.fitMode}, {report.iterations} iterations)", 'green'))
+    print(f"inliers: {report.inliers.sum()} of {len(report.inliers)} ({100 * report.inlier_fraction:.1f}%)")
+    print(f"|B|/F: mean {report.norm_mean:.5f}, std {report.norm_std:.5f}, max error {report.norm_max_error:.5f}")
 
-      References
-      ----------
-      .. [1] Qingde Li; Griffiths, J.G., "Least squares ellipsoid specific
-          fitting," in Geometric Modeling and Processing, 2004.
-          Proceedings, vol., no., pp.335-340, 2004
-    '''
 
-    # D (samples)
-    D = np.array([s[0]**2., s[1]**2., s[2]**2.,
-                  2.*s[1]*s[2], 2.*s[0]*s[2], 2.*s[0]*s[1],
-                  2.*s[0], 2.*s[1], 2.*s[2], np.ones_like(s[0])])
-
-    # S, S_11, S_12, S_21, S_22 (eq. 11)
-    S = np.dot(D, D.T)
-    S_11 = S[:6,:6]
-    S_12 = S[:6,6:]
-    S_21 = S[6:,:6]
-    S_22 = S[6:,6:]
-
-    # C (Eq. 8, k=4)
-    C = np.array([[-1,  1,  1,  0,  0,  0],
-                  [ 1, -1,  1,  0,  0,  0],
-                  [ 1,  1, -1,  0,  0,  0],
-                  [ 0,  0,  0, -4,  0,  0],
-                  [ 0,  0,  0,  0, -4,  0],
-                  [ 0,  0,  0,  0,  0, -4]])
-
-    # v_1 (eq. 15, solution)
-    E = np.dot(linalg.inv(C),
-                S_11 - np.dot(S_12, np.dot(linalg.inv(S_22), S_21)))
+  def printCalibration(self, result):
+    b_vect, A_mat = result
+    
+    print(colored("\nHard Iron Offset (b_vect)", 'green'))
+    print(b_vect)
+    
+    print(colored("\nSoft Iron Offset (A_mat):", 'green'))
+    print(A_mat)
 
-    E_w, E_v = np.linalg.eig(E)
 
-    v_1 = E_v[:, np.argmax(E_w)]
-    if v_1[0] < 0: v_1 = -v_1
 
-    # v_2 (eq. 13, solution)
-    v_2 = np.dot(np.dot(-np.linalg.inv(S_22), S_21), v_1)
 
-    # quadric-form parameters
-    M = np.array([[v_1[0], v_1[3], v_1[4]],
-                  [v_1[3], v_1[1], v_1[5]],
-                  [v_1[4], v_1[5], v_1[2]]])
-    n = np.array([[v_2[0]],
-                  [v_2[1]],
-                  [v_2[2]]])
-    d = v_2[3]
+  def saveSamples(self):
+    if self.magBuffer is None or not len(self.magBuffer):
+      return
+    path = filedialog.asksaveasfilename(defaultextension=".npy", initialfile="mag_samples.npy",
+                                        filetypes=[("NumPy array", "*.npy"), ("CSV", "*.csv"), ("Text", "*.txt")])
+    if path:
+      # written straight from the capture array, see CaptureBuffer.save
+      self.magBuffer.save(path)
+      print(colored(f"\nSaved {len(self.magBuffer)} samples to {path}", 'green'))
 
-    return M, n, d
 
+  def selectFitModeFunc(self, fit_mode_str):
+    self.fitMode = fit_mode_str
+    return self.fitMode
 
 
   def onClick(self,event):   
@@ -189,10 +192,7 @@ class MagCalibrateFrame(tb.Frame):
       self.anim.event_source.stop()
       # if self.calibrated == False:
       self.calibrate()
-      self.mag_x = []
-      self.mag_y = []
-      self.mag_z = []
-      self.magArray = []
+      # the samples stay in magBuffer, the plot still shows them and SAVE SAMPLES exports them
         # self.calibrated == True
       self.stop = True
     # else:
@@ -205,10 +205,11 @@ class MagCalibrateFrame(tb.Frame):
     self.A_1 = np.eye(3)
     self.F = 1
 
-    self.magArray = []
-    self.mag_x = []
-    self.mag_y = []
-    self.mag_z = []
+    # magBuffer keeps the last capture for saveSamples, runCalibration starts a new one
+    if self.magBuffer is not None and len(self.magBuffer):
+      self.saveButton.configure(state="normal")
+    self.magView = None # plots the captured samples while the plot window is open
+    self.magFit = None # running ellipsoid fit of the capture, updated with every sample
 
     self.anim = None
     self.stop = False
@@ -219,43 +220,48 @@ class MagCalibrateFrame(tb.Frame):
 
       
   def animate(self,i):
-    if len(self.mag_x) == self.HISTORY_SIZE:
+    if self.magBuffer.full:
       print("History size is full")
       self.anim.event_source.stop()
       # if self.calibrated == False:
       self.calibrate()
-      self.mag_x = []
-      self.mag_y = []
-      self.mag_z = []
-      self.magArray = []
+      # the samples stay in magBuffer, the plot still shows them and SAVE SAMPLES exports them
         # self.calibrated == True
       self.stop = True
 
-    success, buffer = g.imu.readMagRaw()
-    if success:
+    if self.magFuture is None or self.magFuture.done():
+      self.magFuture = g.io.then(g.io.readMagRaw(), self.plotMag)
+
+    # the scatter is drawn by plotMag, nothing for the animation to blit
+    return ()
+
+  def plotMag(self, result):
+    success, buffer = result
+    if success and self.ax is not None and not self.stop:
       mx = buffer[0]
       my = buffer[1]
       mz = buffer[2]
 
-      self.magArray.append([mx,my,mz])
-      self.mag_x.append(mx)
-      self.mag_y.append(my)
-      self.mag_z.append(mz)
-
-      # Clear all axis
-      self.ax.cla()
+      if self.magBuffer.append((mx, my, mz)):
+        self.magFit.add((mx, my, mz))
+        if self.magFit.count % self.FIT_EVERY == 0:
+          self.showEstimate(self.magFit.estimate())
 
-      # Display the sub-plots
-      self.ax.scatter(self.mag_x, self.mag_y, color='r')
-      self.ax.scatter(self.mag_y, self.mag_z, color='g')
-      self.ax.scatter(self.mag_z, self.mag_x, color='b')
+      # draws only the new sample, the earlier ones stay on screen
+      self.magView.update()
     
 
   def runCalibration(self):
     self.fig, self.ax = plt.subplots(1, 1)
     self.ax.set_aspect(1)
+    self.magBuffer = CaptureBuffer(self.HISTORY_SIZE)
+    self.magView = MagScatterView(self.ax, self.magBuffer)
+    self.magFit = OnlineEllipsoidFit(self.F)
+    self.estimateLabel.configure(text="")
+    self.saveButton.configure(state="disabled")
 
     self.fig.canvas.mpl_connect('close_event', self.onClose)
     self.fig.canvas.mpl_connect('button_press_event', self.onClick)    
-    self.anim = FuncAnimation(self.fig, self.animate, frames = np.arange(0, 10000, 1), interval=50)
+    self.anim = FuncAnimation(self.fig, self.animate, frames = np.arange(0, 10000, 1), interval=50,
+                              blit=True, cache_frame_data=False)
     plt.show()
\ No newline at end of file
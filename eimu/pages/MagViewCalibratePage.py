@@ -7,6 +7,8 @@ from matplotlib.animation import FuncAnimation
 import numpy as np
 
 from eimu.globalParams import g
+from eimu.mag_scatter import MagScatterView
+from eimu.capture_buffer import CaptureBuffer
 
 
 
@@ -18,17 +20,16 @@ class MagViewCalibrationFrame(tb.Frame):
     self.A_1 = np.eye(3)
     self.F = 1
 
-    self.magArray = []
-    self.mag_x = []
-    self.mag_y = []
-    self.mag_z = []
+    self.magBuffer = None # samples of the current capture, read in place by the plot and the fit
+    self.magView = None # plots the captured samples while the plot window is open
 
     self.anim = None
     self.stop = False
     self.calibrated = False
     self.HISTORY_SIZE = 10000
+    self.magFuture = None # read in flight, animation frames skip the device until it lands
 
-    g.imu.setWorldFrameId(1)
+    g.io.setWorldFrameId(1)
 
     self.fig, self.ax = None, None
 
@@ -66,10 +67,8 @@ class MagViewCalibrationFrame(tb.Frame):
     self.A_1 = np.eye(3)
     self.F = 1
 
-    self.magArray = []
-    self.mag_x = []
-    self.mag_y = []
-    self.mag_z = []
+    self.magBuffer = None # samples of the current capture, read in place by the plot and the fit
+    self.magView = None # plots the captured samples while the plot window is open
 
     self.anim = None
     self.stop = False
@@ -80,34 +79,36 @@ class MagViewCalibrationFrame(tb.Frame):
 
       
   def animate(self,i):
-    if len(self.mag_x) == self.HISTORY_SIZE:
+    if self.magBuffer.full:
       self.anim.event_source.stop()
       
-    success, buffer = g.imu.readMag()
-    if success:
+    if self.magFuture is None or self.magFuture.done():
+      self.magFuture = g.io.then(g.io.readMag(), self.plotMag)
+
+    # the scatter is drawn by plotMag, nothing for the animation to blit
+    return ()
+
+  def plotMag(self, result):
+    success, buffer = result
+    if success and self.ax is not None:
       mx = buffer[0]
       my = buffer[1]
       mz = buffer[2]
 
-      self.magArray.append([mx,my,mz])
-      self.mag_x.append(mx)
-      self.mag_y.append(my)
-      self.mag_z.append(mz)
-
-      # Clear all axis
-      self.ax.cla()
+      self.magBuffer.append((mx, my, mz))
 
-      # Display the sub-plots
-      self.ax.scatter(self.mag_x, self.mag_y, color='r')
-      self.ax.scatter(self.mag_y, self.mag_z, color='g')
-      self.ax.scatter(self.mag_z, self.mag_x, color='b')
+      # draws only the new sample, the earlier ones stay on screen
+      self.magView.update()
     
 
   def runCalibration(self):
     self.fig, self.ax = plt.subplots(1, 1)
     self.ax.set_aspect(1)
+    self.magBuffer = CaptureBuffer(self.HISTORY_SIZE)
+    self.magView = MagScatterView(self.ax, self.magBuffer)
 
     self.fig.canvas.mpl_connect('close_event', self.onClose)
     self.fig.canvas.mpl_connect('button_press_event', self.onClick)    
-    self.anim = FuncAnimation(self.fig, self.animate, frames = np.arange(0, 10000, 1), interval=50)
+    self.anim = FuncAnimation(self.fig, self.animate, frames = np.arange(0, 10000, 1), interval=50,
+                              blit=True, cache_frame_data=False)
     plt.show()
\ No newline at end of file
@@ -2,6 +2,9 @@ import tkinter as tk
 import ttkbootstrap as tb
 from ttkbootstrap.constants import *
 
+from eimu.globalParams import g
+from eimu.acquisition import AcquisitionBus
+from eimu.eimu_serial import GET_FRAME_ID, GET_FILTER_GAIN, GET_ACC_LPF_CUT_FREQ, GET_I2C_ADDR
 from eimu.pages.MagCalibratePage import MagCalibrateFrame
 from eimu.pages.MagViewCalibratePage import MagViewCalibrationFrame
 from eimu.pages.GyroCalibratePage import GyroCalibrateFrame
@@ -89,9 +92,17 @@ class MainAppFrame(tb.Frame):
 
     
     ############Initialize the mainContentFrame ################
+    self.currentButton = None
     self.displayPage(self.button11, self.displayResetPage)
     ############################################################
 
+    # one shared acquisition loop, it only runs while some page is subscribed
+    g.bus = AcquisitionBus(g.imu)
+
+    # fetch all device params off the Tk thread, pages open from the cached snapshot
+    self.disable_all_nav_buttons()
+    g.io.then(g.io.prefetchParams(), self.publishParams, self.publishParams)
+
 
     #add framed widgets to MainAppFrame
     self.sideNavFrame.pack(side="left", fill="y", padx=10)
@@ -112,12 +123,42 @@ class MainAppFrame(tb.Frame):
     self.button10.configure(state="normal")
     self.button11.configure(state="normal")
   
+  def disable_all_nav_buttons(self):
+    self.button1.configure(state="disabled")
+    self.button2.configure(state="disabled")
+    self.button3.configure(state="disabled")
+    self.button4.configure(state="disabled")
+    self.button5.configure(state="disabled")
+    self.button6.configure(state="disabled")
+    self.button7.configure(state="disabled")
+    self.button8.configure(state="disabled")
+    self.button9.configure(state="disabled")
+    self.button10.configure(state="disabled")
+    self.button11.configure(state="disabled")
+  
   def displayPage(self, button, page):
+    self.currentButton = button
     self.enable_all_nav_buttons()
     button.configure(state='disabled') # disable the clicked nav button
     self.delete_pages()
     page()
 
+  def publishParams(self, result):
+    # also called with the exception if prefetch failed, pages then fall back to reading from the device
+    # publish the snapshot
+    params = g.imu.params
+    if GET_FRAME_ID in params:
+      g.frameId = int(params[GET_FRAME_ID])
+    if GET_FILTER_GAIN in params:
+      g.filterGain = round(params[GET_FILTER_GAIN], 3)
+    if GET_ACC_LPF_CUT_FREQ in params:
+      g.accFilterCF = round(params[GET_ACC_LPF_CUT_FREQ], 3)
+    if GET_I2C_ADDR in params:
+      g.i2cAddress = int(params[GET_I2C_ADDR])
+
+    self.enable_all_nav_buttons()
+    self.currentButton.configure(state='disabled')
+
   def delete_pages(self):
     for frame in self.mainContentFrame.winfo_children():
       frame.destroy()
@@ -17,7 +17,7 @@ class OrientationVarianceFrame(tb.Frame):
     self.loop_count = 0
     self.no_of_samples = 1000
 
-    g.imu.setWorldFrameId(1)
+    g.io.setWorldFrameId(1)
 
     self.r_arr = []
     self.p_arr = []
@@ -30,11 +30,6 @@ class OrientationVarianceFrame(tb.Frame):
     self.yValFrame = tb.Frame(self)
 
     r=0.0; p=0.0; y=0.0
-    success, buffer = g.imu.readRPYVariance()
-    if success:
-      r = buffer[0]
-      p = buffer[1]
-      y = buffer[2]
 
     self.rText = tb.Label(self.rValFrame, text="R-VARIANCE:", font=('Monospace',10, 'bold') ,bootstyle="danger")
     self.rVal = tb.Label(self.rValFrame, text=f'{r}', font=('Monospace',10), bootstyle="dark")
@@ -86,9 +81,18 @@ class OrientationVarianceFrame(tb.Frame):
     self.pValFrame.pack(side='top', fill='x')
     self.yValFrame.pack(side='top', fill='x', pady=(0,20))
 
+    g.io.then(g.io.readRPYVariance(), self.show_variance)
+
     # start process
     self.compute_variance()
 
+  def show_variance(self, result):
+    success, buffer = result
+    if success:
+      self.rVal.configure(text=f'{buffer[0]}')
+      self.pVal.configure(text=f'{buffer[1]}')
+      self.yVal.configure(text=f'{buffer[2]}')
+
   def reset_all_params(self):
     self.loop_count = 0
 
@@ -107,32 +111,37 @@ class OrientationVarianceFrame(tb.Frame):
       self.pVal.configure(text="0.0")
       self.yVal.configure(text="0.0")
 
-      success, buffer = g.imu.readRPY()
-      if success:
-        r = buffer[0]
-        p = buffer[1]
-        y = buffer[2]
+      g.io.then(g.io.readRPY(), self.on_read_cal_data)
 
-        self.r_arr.append(r)
-        self.p_arr.append(p)
-        self.y_arr.append(y)
+    else:
+      self.reset_all_params()
+      self.canvas.after(10, self.compute_variance)
 
-        self.loop_count += 1
-        percent = (self.loop_count*100)/self.no_of_samples
-        self.textVal.configure(text=f'{int(percent)} %')
-        self.progressBar['value'] = percent
+  def on_read_cal_data(self, result):
+    success, buffer = result
+    if success:
+      r = buffer[0]
+      p = buffer[1]
+      y = buffer[2]
 
-        if self.loop_count >= self.no_of_samples:
-          percent = 100.0
-          self.textVal.configure(text=f'{int(percent)} %')
-          self.progressBar['value'] = percent
-          self.print_computed_variance()
-        else:
-          self.canvas.after(10, self.read_cal_data)
+      self.r_arr.append(r)
+      self.p_arr.append(p)
+      self.y_arr.append(y)
 
+      self.loop_count += 1
+      percent = (self.loop_count*100)/self.no_of_samples
+      self.textVal.configure(text=f'{int(percent)} %')
+      self.progressBar['value'] = percent
+
+      if self.loop_count >= self.no_of_samples:
+        percent = 100.0
+        self.textVal.configure(text=f'{int(percent)} %')
+        self.progressBar['value'] = percent
+        self.print_computed_variance()
+      else:
+        self.canvas.after(10, self.read_cal_data)
     else:
-      self.reset_all_params()
-      self.canvas.after(10, self.compute_variance)
+      self.canvas.after(10, self.read_cal_data) # retry a dropped sample instead of stalling the loop
 
   def print_computed_variance(self):
 
@@ -140,9 +149,13 @@ class OrientationVarianceFrame(tb.Frame):
     p_variance = np.var(self.p_arr)
     y_variance = np.var(self.y_arr)
     
-    g.imu.writeRPYVariance(r_variance, p_variance, y_variance)
+    g.io.writeRPYVariance(r_variance, p_variance, y_variance)
+    self.computed = (r_variance, p_variance, y_variance)
+    g.io.then(g.io.readRPYVariance(), self.show_computed_variance)
 
-    success, buffer = g.imu.readRPYVariance()
+  def show_computed_variance(self, result):
+    r_variance, p_variance, y_variance = self.computed
+    success, buffer = result
     if success:
       r_variance = buffer[0]
       p_variance = buffer[1]
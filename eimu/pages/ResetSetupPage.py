@@ -33,15 +33,18 @@ class ResetSetupFrame(tk.Frame):
     dialog = Messagebox.show_question(title="RESET WARNING!!!", message="This will reset all parameters on the controller's MEMORY to default.\nAre you sure you want to continue?")
 
     if dialog == "Yes":
-      success = self.resetAllParams()
-      if success:
-        Messagebox.show_info("SUCCESS:\n\nParameters Reset was successful\nReset Controller and Restart Application", "SUCCESS")
-      else:
-        Messagebox.show_error("ERROR:\n\nSomething went wrong\nAttempt to reset was unsuccessful", "ERROR")
+      self.resetButton.configure(state="disabled")
+      g.io.then(self.resetAllParams(), self.onReset)
     
     else:
       Messagebox.show_error("INFO:\n\nOperation Was Cancelled", "ERROR")
 
+  def onReset(self, success):
+    self.resetButton.configure(state="normal")
+    if success:
+      Messagebox.show_info("SUCCESS:\n\nParameters Reset was successful\nReset Controller and Restart Application", "SUCCESS")
+    else:
+      Messagebox.show_error("ERROR:\n\nSomething went wrong\nAttempt to reset was unsuccessful", "ERROR")
+
   def resetAllParams(self):
-    success = g.imu.resetAllParams()
-    return success
\ No newline at end of file
+    return g.io.resetAllParams()
\ No newline at end of file
@@ -5,6 +5,7 @@ from ttkbootstrap.dialogs import Messagebox
 
 import serial.tools.list_ports
 from eimu.eimu_serial import EIMUSerialClient
+from eimu.discovery import discover_ports
 
 import time
 
@@ -39,11 +40,16 @@ class SerialConnectFrame(tb.Frame):
     self.refreshButton = tb.Button(self.frame, text="REFRESH",
                                style=buttonStyleName, padding=10, width=20,
                                command=self.refresh_serial_func)
+    
+    self.autoConnectButton = tb.Button(self.frame, text="AUTO CONNECT",
+                               style=buttonStyleName, padding=10, width=20,
+                               command=self.auto_connect_func)
 
     #add framed widgets to frame
     self.selectPort.pack(side='top', fill="both", pady=(5,35))
     self.connectButton.pack(side='top', fill="both", pady=10)
     self.refreshButton.pack(side='top', fill="both", pady=10)
+    self.autoConnectButton.pack(side='top', fill="both", pady=10)
 
     # add frame to Serial ConnectFrame
     self.frame.place(relx=0.5, rely=0.5, anchor="center")
@@ -69,6 +75,7 @@ class SerialConnectFrame(tb.Frame):
 
 
   def connectToPort(self, port):
+    # runs on the io thread, must not touch any widget
     try:
       serial_port = port
       serial_baudrate = 115200
@@ -76,12 +83,23 @@ class SerialConnectFrame(tb.Frame):
 
       g.imu = EIMUSerialClient()
       g.imu.connect(serial_port, serial_baudrate, serial_timeout)
+      g.io.client = g.imu
       success = g.imu.clearDataBuffer()
       g.imu.setWorldFrameId(1)
       return True
     except:
       return False
 
+  def disable_buttons(self):
+    self.connectButton.configure(state="disabled")
+    self.refreshButton.configure(state="disabled")
+    self.autoConnectButton.configure(state="disabled")
+
+  def enable_buttons(self):
+    self.connectButton.configure(state="normal", text="CONNECT")
+    self.refreshButton.configure(state="normal")
+    self.autoConnectButton.configure(state="normal", text="AUTO CONNECT")
+
   
   def refresh_serial_func(self):
     port_list = self.refreshPortlist()
@@ -91,12 +109,53 @@ class SerialConnectFrame(tb.Frame):
 
 
   def connect_serial_func(self):
-    port = self.selectPort.getSelectedVal()
-    serIsConnected = self.connectToPort(port)
+    self.port = self.selectPort.getSelectedVal()
+    self.disable_buttons()
+    self.connectButton.configure(text="CONNECTING...")
+    g.io.then(g.io.submit(self.connectToPort, self.port), self.onConnect)
+
+  def onConnect(self, serIsConnected):
+    port = self.port
+    self.enable_buttons()
     if serIsConnected:
       # print("connection successful")
       Messagebox.show_info(f"SUCCESS:\n\nEIMU Module found on port: {port}\n\nclick OK to continue", "SUCCESS")
       self.next_func()
     else:
       # print("Error connecting to driver")
-      Messagebox.show_error(f"ERROR:\n\nno EIMU Module found on port: {port}\n\ntry again or try another port", "ERROR")
\ No newline at end of file
+      Messagebox.show_error(f"ERROR:\n\nno EIMU Module found on port: {port}\n\ntry again or try another port", "ERROR")
+
+
+  def auto_connect_func(self):
+    # probe every port concurrently off the Tk thread
+    self.disable_buttons()
+    self.autoConnectButton.configure(text="SEARCHING...")
+    g.io.then(g.io.submit(self.discoverPorts), self.onDiscovery)
+
+  def discoverPorts(self):
+    # runs on the io thread, must not touch any widget
+    try:
+      return discover_ports(timeout=0.05, keep_best=True)
+    except Exception:
+      return []
+
+  def onDiscovery(self, foundPorts):
+    self.foundPorts = foundPorts
+    self.enable_buttons()
+
+    if len(self.foundPorts)==0:
+      Messagebox.show_error("ERROR:\n\nno EIMU Module found on any port\n\ncheck the connection and try again", "ERROR")
+      return
+
+    best = self.foundPorts[0]
+    self.selectPort.setComboArrVal([probe.port for probe in self.foundPorts])
+    self.selectPort.setComboVal(best.port)
+    self.selectPort.setVal(self.selectPortFunc(best.port))
+
+    g.imu = best.client
+    g.io.client = g.imu
+    g.io.clearDataBuffer()
+    g.io.setWorldFrameId(1)
+
+    Messagebox.show_info(f"SUCCESS:\n\nEIMU Module found on port: {best.port}\n\nclick OK to continue", "SUCCESS")
+    self.next_func()
@@ -0,0 +1,77 @@
+import heapq
+import itertools
+import threading
+from contextlib import contextmanager
+from time import monotonic
+
+PRIORITY_CONTROL = 0  # parameter writes and anything the user is waiting on
+PRIORITY_NORMAL = 1   # ordinary one-off reads
+PRIORITY_STREAM = 2   # back-to-back acquisition reads
+
+
+class PriorityLock:
+    """Reentrant mutex that is handed to the most urgent waiter on release.
+
+    Waiters are served lowest priority number first and in arrival order within
+    a priority, so a thread that releases and immediately re-acquires (like the
+    streaming loop) queues behind everyone already waiting instead of winning
+    the race every time. With prioritized=False every waiter is served FIFO.
+    """
+
+    def __init__(self, prioritized: bool = True):
+        self.prioritized = prioritized
+        self._cond = threading.Condition(threading.Lock())
+        self._owner = None
+        self._depth = 0
+        self._waiters = []  # heap of (priority, ticket)
+        self._tickets = itertools.count()
+
+    def acquire(self, priority: int = PRIORITY_NORMAL, timeout: float | None = None) -> bool:
+        me = threading.get_ident()
+        with self._cond:
+            if self._owner == me:
+                self._depth += 1
+                return True
+            if self._owner is None and not self._waiters:
+                self._owner, self._depth = me, 1
+                return True
+
+            entry = (priority if self.prioritized else 0, next(self._tickets))
+            heapq.heappush(self._waiters, entry)
+            deadline = None if timeout is None else monotonic() + timeout
+            while self._owner is not None or self._waiters[0] != entry:
+                remaining = None if deadline is None else deadline - monotonic()
+                if remaining is not None and remaining <= 0:
+                    self._waiters.remove(entry)
+                    heapq.heapify(self._waiters)
+                    self._cond.notify_all()
+                    return False
+                self._cond.wait(remaining)
+            heapq.heappop(self._waiters)
+            self._owner, self._depth = me, 1
+            return True
+
+    def release(self):
+        with self._cond:
+            if self._owner != threading.get_ident():
+                raise RuntimeError("cannot release a PriorityLock held by another thread")
+            self._depth -= 1
+            if self._depth == 0:
+                self._owner = None
+                if self._waiters:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def hold(self, priority: int = PRIORITY_NORMAL):
+        self.acquire(priority)
+        try:
+            yield self
+        finally:
+            self.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
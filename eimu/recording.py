@@ -0,0 +1,405 @@
+"""Append-only binary session recordings.
+
+A recording keeps timestamped frames of any number of commands (raw acc, gyro
+and mag, linear acc, RPY, quaternions, ...). SessionRecorder buffers each
+command in one preallocated chunk and appends the chunk to the file when it
+fills, so memory use stays at one chunk per command however long the run.
+SessionReader memory-maps the file and hands out chunks as NumPy views, so
+only the time range asked for is ever read from disk.
+
+Every chunk carries per-axis min, max, mean and M2 of its frames. The reader
+finds chunks by time with a binary search over their start and end times and
+stacks the chunk statistics into a SummaryPyramid, so stats() over hours of
+data and envelope() for a zoomed-out plot read the summaries plus at most two
+partly covered chunks, never the whole range.
+
+File layout, all little-endian:
+
+  header   magic "EIMUREC1", version, chunk size
+  chunk    "CHNK", cmd, width, count, t0, t1, then width float64 each of
+           min, max, mean and M2, count float64 host times and count x width
+           float32 values, padded to 8 bytes
+  ...
+  index    per chunk (offset, cmd, width, count, t0, t1) and its statistics
+  trailer  index offset, "EIMUIDX1"
+
+The index is written by close(). A file cut short by a crash has no index,
+the reader then walks the chunk headers instead and keeps every whole chunk.
+Version 1 files have no statistics in them, the reader works them out from
+the frames the first time they are needed.
+"""
+import argparse
+import os
+import struct
+import threading
+from time import perf_counter, sleep
+from typing import NamedTuple, Tuple
+
+import numpy as np
+
+from eimu.eimu_serial import EIMUSerialClient, CODECS, COMMAND_NAMES
+from eimu.acquisition import AcquisitionBus
+from eimu.summary_pyramid import SummaryPyramid, RangeStats, frame_stats, merge_stats
+
+REC_MAGIC = b"EIMUREC1"
+REC_VERSION = 2
+CHUNK_MAGIC = b"CHNK"
+INDEX_MAGIC = b"EIMUIDX1"
+
+_HEADER = struct.Struct("<8sII")  # magic, version, chunk size
+_CHUNK = struct.Struct("<4sBBHIdd4x")  # magic, cmd, width, reserved, count, t0, t1
+_ENTRY = struct.Struct("<QBBHIdd")  # offset, cmd, width, reserved, count, t0, t1
+_TRAILER = struct.Struct("<Q8s")  # index offset, magic
+
+
+class ChunkInfo(NamedTuple):
+    offset: int  # of the chunk header
+    cmd: int
+    width: int
+    count: int
+    t0: float
+    t1: float
+    data_offset: int  # of the host times
+    stats: np.ndarray | None  # (4, width) min, max, mean, M2, None in version 1 files
+
+
+class Envelope(NamedTuple):
+    """Zoomed-out view of a time range, one point per bin"""
+    t: np.ndarray
+    min: np.ndarray
+    max: np.ndarray
+    mean: np.ndarray
+
+
+def _stats_size(width: int, version: int) -> int:
+    return 32 * width if version >= 2 else 0
+
+
+def _chunk_size(count: int, width: int, version: int = REC_VERSION) -> int:
+    size = _CHUNK.size + _stats_size(width, version) + 8 * count + 4 * count * width
+    return size + (-size % 8)
+
+
+class SessionRecorder:
+    """Appends frames to a new recording at path.
+
+    append() may be called from an acquisition thread while flush() and
+    close() are called from another.
+    """
+
+    def __init__(self, path: str, chunk_size: int = 4096):
+        self.path = path
+        self.chunk_size = chunk_size
+        self.frames = 0
+        self._file = open(path, "wb")
+        self._file.write(_HEADER.pack(REC_MAGIC, REC_VERSION, chunk_size))
+        self._buffers = {}  # cmd → [t array, vals array, fill]
+        self._index = []  # (ChunkInfo, statistics bytes) per chunk written
+        self._subs = []
+        self._lock = threading.Lock()
+
+    def append(self, cmd: int, t: float, vals):
+        """Add one frame of cmd, every frame of a command must have the same width"""
+        with self._lock:
+            buf = self._buffers.get(cmd)
+            if buf is None:
+                width = len(vals)
+                buf = self._buffers[cmd] = [np.empty(self.chunk_size, "<f8"),
+                                            np.empty((self.chunk_size, width), "<f4"), 0]
+            fill = buf[2]
+            buf[0][fill] = t
+            buf[1][fill] = vals
+            buf[2] = fill + 1
+            self.frames += 1
+            if buf[2] == self.chunk_size:
+                self._write_chunk(cmd, buf)
+
+    def attach(self, bus: AcquisitionBus, decimation: int = 1):
+        """Record every decimation-th sample an AcquisitionBus publishes, as bus.cmd frames"""
+        cmd = bus.cmd
+        sub = bus.subscribe(decimation, callback=lambda t, vals: self.append(cmd, t, vals))
+        self._subs.append(sub)
+        return sub
+
+    def flush(self):
+        """Write out every partly filled chunk, so the file holds all frames so far"""
+        with self._lock:
+            for cmd, buf in self._buffers.items():
+                if buf[2]:
+                    self._write_chunk(cmd, buf)
+            self._file.flush()
+
+    def close(self):
+        for sub in self._subs:
+            sub.close()
+        self._subs = []
+        self.flush()
+        with self._lock:
+            if self._file.closed:
+                return
+            index_offset = self._file.tell()
+            for info, stats in self._index:
+                self._file.write(_ENTRY.pack(info.offset, info.cmd, info.width, 0, info.count, info.t0, info.t1))
+                self._file.write(stats)
+            self._file.write(_TRAILER.pack(index_offset, INDEX_MAGIC))
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _write_chunk(self, cmd: int, buf: list):
+        t, vals, count = buf
+        width = vals.shape[1]
+        offset = self._file.tell()
+        stats = np.array(frame_stats(vals[:count]), dtype="<f8")
+        info = ChunkInfo(offset, cmd, width, count, float(t[0]), float(t[count - 1]),
+                         offset + _CHUNK.size + stats.nbytes, stats)
+        self._file.write(_CHUNK.pack(CHUNK_MAGIC, cmd, width, 0, count, info.t0, info.t1))
+        self._file.write(stats.tobytes())
+        self._file.write(memoryview(t[:count]).cast("B"))
+        self._file.write(memoryview(vals[:count]).cast("B"))
+        self._file.write(bytes(info.offset + _chunk_size(count, width) - self._file.tell()))
+        self._index.append((info, stats.tobytes()))
+        buf[2] = 0
+
+
+class SessionReader:
+    """Memory-mapped view of a recording.
+
+    Nothing is loaded up front: chunk() returns views straight into the
+    mapping, read() only copies the chunks that overlap the time range and
+    stats() and envelope() work from the chunk statistics.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._map = np.memmap(path, dtype=np.uint8, mode="r")
+        magic, self.version, self.chunk_size = _HEADER.unpack_from(self._map, 0)
+        if magic != REC_MAGIC:
+            raise RuntimeError(f"{path} is not an EIMU recording")
+        if self.version > REC_VERSION:
+            raise RuntimeError(f"{path} is recording version {self.version}, "
+                               f"this reader knows up to {REC_VERSION}")
+
+        index = self._read_index()
+        self.recovered = index is None  # no index, the recorder was not closed
+        if index is None:
+            index = self._scan()
+        self._chunks = {}
+        for info in index:
+            self._chunks.setdefault(info.cmd, []).append(info)
+        self._pyramids = {}
+
+    @property
+    def commands(self) -> list:
+        return sorted(self._chunks)
+
+    def chunks(self, cmd: int) -> list:
+        return self._chunks.get(cmd, [])
+
+    def count(self, cmd: int) -> int:
+        return sum(info.count for info in self.chunks(cmd))
+
+    def width(self, cmd: int) -> int:
+        chunks = self.chunks(cmd)
+        return chunks[0].width if chunks else 0
+
+    def time_range(self, cmd: int) -> Tuple[float, float]:
+        chunks = self.chunks(cmd)
+        if not chunks:
+            return 0.0, 0.0
+        return chunks[0].t0, chunks[-1].t1
+
+    def chunk(self, info: ChunkInfo) -> Tuple[np.ndarray, np.ndarray]:
+        """(t, values) of one chunk as read-only views into the file"""
+        start = info.data_offset
+        t = np.frombuffer(self._map, "<f8", info.count, start)
+        vals = np.frombuffer(self._map, "<f4", info.count * info.width, start + 8 * info.count)
+        return t, vals.reshape(info.count, info.width)
+
+    def pyramid(self, cmd: int) -> SummaryPyramid:
+        """Chunk statistics of cmd and the coarser levels over them, built on first use"""
+        pyramid = self._pyramids.get(cmd)
+        if pyramid is None:
+            chunks = self.chunks(cmd)
+            width = self.width(cmd)
+            stats = np.array([info.stats if info.stats is not None else frame_stats(self.chunk(info)[1])
+                              for info in chunks]).reshape(len(chunks), 4, width)
+            pyramid = self._pyramids[cmd] = SummaryPyramid(
+                [info.count for info in chunks], [info.t0 for info in chunks], [info.t1 for info in chunks],
+                stats[:, 0], stats[:, 1], stats[:, 2], stats[:, 3])
+        return pyramid
+
+    def locate(self, cmd: int, t_start: float | None = None, t_end: float | None = None) -> Tuple[int, int]:
+        """Chunks i to j - 1 of cmd hold every frame with t_start <= t <= t_end"""
+        _, t0, t1 = self.pyramid(cmd).levels[0][:3]
+        i = 0 if t_start is None else int(np.searchsorted(t1, t_start, "left"))
+        j = len(t0) if t_end is None else int(np.searchsorted(t0, t_end, "right"))
+        return i, max(i, j)
+
+    def read(self, cmd: int, t_start: float | None = None, t_end: float | None = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Copy of every frame of cmd with t_start <= t <= t_end, as (t, values)"""
+        i, j = self.locate(cmd, t_start, t_end)
+        ts, vals = [], []
+        for info in self.chunks(cmd)[i:j]:
+            t, v = self._slice(info, t_start, t_end)
+            ts.append(t)
+            vals.append(v)
+        if not ts:
+            return np.zeros(0), np.zeros((0, self.width(cmd)), dtype=np.float32)
+        return np.concatenate(ts), np.concatenate(vals)
+
+    def stats(self, cmd: int, t_start: float | None = None, t_end: float | None = None) -> RangeStats:
+        """Exact per-axis count, min, max, mean and variance of cmd between t_start and t_end.
+
+        Chunks wholly inside the range come from the summary pyramid, only the
+        (at most two) chunks the range cuts through are read.
+        """
+        chunks = self.chunks(cmd)
+        i, j = self.locate(cmd, t_start, t_end)
+        if i == j:
+            empty = np.zeros((0, self.width(cmd)))
+            return merge_stats(np.zeros(0), empty, empty, empty, empty)
+        lo = -np.inf if t_start is None else t_start
+        hi = np.inf if t_end is None else t_end
+        a = i if chunks[i].t0 >= lo else i + 1
+        b = j if chunks[j - 1].t1 <= hi else j - 1
+        partial = sorted({i, j - 1} - set(range(a, b)))
+        if a >= b:
+            a = b = 0
+
+        count, mn, mx, mean, m2 = self.pyramid(cmd).stats(a, b)
+        for k in partial:
+            _, v = self._slice(chunks[k], t_start, t_end)
+            for part, arr in zip((mn, mx, mean, m2), frame_stats(v)):
+                part.append(arr[None])
+            count.append(np.array([len(v)]))
+        return merge_stats(*(np.concatenate(part) for part in (count, mn, mx, mean, m2)))
+
+    def envelope(self, cmd: int, t_start: float | None = None, t_end: float | None = None,
+                 bins: int = 1000) -> Envelope:
+        """About bins points of min, max and mean over the range, for plotting long recordings.
+
+        Wide ranges use the coarsest pyramid level that still gives bins points
+        and snap to whole summary nodes; a range of only a few chunks is read
+        and binned from the frames instead.
+        """
+        pyramid = self.pyramid(cmd)
+        i, j = self.locate(cmd, t_start, t_end)
+        if (j - i) * 4 < bins:
+            t, v = self.read(cmd, t_start, t_end)
+            if len(t) == 0:
+                width = self.width(cmd)
+                return Envelope(t, np.zeros((0, width)), np.zeros((0, width)), np.zeros((0, width)))
+            starts = np.unique(np.linspace(0, len(t), min(bins, len(t)), endpoint=False).astype(int))
+            sizes = np.diff(np.append(starts, len(t)))[:, None]
+            return Envelope(t[starts], np.minimum.reduceat(v, starts), np.maximum.reduceat(v, starts),
+                            np.add.reduceat(v.astype(np.float64), starts) / sizes)
+
+        k = pyramid.level_for(i, j, bins)
+        step = pyramid.fanout ** k
+        _, t0, t1, mn, mx, mean, _ = pyramid.levels[k]
+        a, b = i // step, -(-j // step)
+        return Envelope((t0[a:b] + t1[a:b]) / 2, mn[a:b], mx[a:b], mean[a:b])
+
+    def close(self):
+        # the mapping goes once the last view handed out is gone
+        self._chunks = {}
+        self._pyramids = {}
+        self._map = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _slice(self, info: ChunkInfo, t_start: float | None, t_end: float | None):
+        t, v = self.chunk(info)
+        i = 0 if t_start is None else np.searchsorted(t, t_start, "left")
+        j = len(t) if t_end is None else np.searchsorted(t, t_end, "right")
+        return t[i:j], v[i:j]
+
+    def _info(self, offset: int, cmd: int, width: int, count: int, t0: float, t1: float, stats_offset: int):
+        stats_size = _stats_size(width, self.version)
+        stats = None
+        if stats_size:
+            stats = np.frombuffer(self._map, "<f8", 4 * width, stats_offset).reshape(4, width)
+        return ChunkInfo(offset, cmd, width, count, t0, t1, offset + _CHUNK.size + stats_size, stats)
+
+    def _read_index(self):
+        size = len(self._map)
+        if size < _HEADER.size + _TRAILER.size:
+            return None
+        index_offset, magic = _TRAILER.unpack_from(self._map, size - _TRAILER.size)
+        if magic != INDEX_MAGIC:
+            return None
+        index = []
+        pos, end = index_offset, size - _TRAILER.size
+        while pos < end:
+            offset, cmd, width, _, count, t0, t1 = _ENTRY.unpack_from(self._map, pos)
+            index.append(self._info(offset, cmd, width, count, t0, t1, pos + _ENTRY.size))
+            pos += _ENTRY.size + _stats_size(width, self.version)
+        return index
+
+    def _scan(self) -> list:
+        index = []
+        offset, size = _HEADER.size, len(self._map)
+        while offset + _CHUNK.size <= size:
+            magic, cmd, width, _, count, t0, t1 = _CHUNK.unpack_from(self._map, offset)
+            length = _chunk_size(count, width, self.version)
+            if magic != CHUNK_MAGIC or offset + length > size:
+                break  # the index, or a chunk the recorder never finished
+            index.append(self._info(offset, cmd, width, count, t0, t1, offset + _CHUNK.size))
+            offset += length
+        return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record EIMU frames to a session file, or describe one")
+    sub = parser.add_subparsers(dest="action", required=True)
+    rec = sub.add_parser("record", help="stream a command from the module into a new recording")
+    rec.add_argument("port", help="serial port of the module, sim:// or a mux server URL")
+    rec.add_argument("path")
+    rec.add_argument("--baud", type=int, default=115200)
+    rec.add_argument("--cmd", default="READ_IMU_DATA", choices=sorted(n for n in COMMAND_NAMES.values()
+                                                                      if n.startswith("READ_")))
+    rec.add_argument("--seconds", type=float, default=None, help="stop after this long, default runs until Ctrl-C")
+    info = sub.add_parser("info", help="list the commands, frames and time span in a recording")
+    info.add_argument("path")
+    args = parser.parse_args()
+
+    if args.action == "info":
+        with SessionReader(args.path) as reader:
+            if reader.recovered:
+                print("no index, recovered from chunk headers")
+            for cmd in reader.commands:
+                t0, t1 = reader.time_range(cmd)
+                print(f"{COMMAND_NAMES.get(cmd, hex(cmd)):<18}{reader.count(cmd):>10} frames  {t1 - t0:10.1f} s")
+        return
+
+    cmd = next(val for val, name in COMMAND_NAMES.items() if name == args.cmd)
+    client = EIMUSerialClient()
+    client.connect(args.port, args.baud)
+    bus = AcquisitionBus(client, cmd, CODECS[cmd].reply_count)
+    recorder = SessionRecorder(args.path)
+    recorder.attach(bus)
+    print(f"Recording {args.cmd} to {args.path}")
+    start = perf_counter()
+    try:
+        while args.seconds is None or perf_counter() - start < args.seconds:
+            sleep(0.1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        recorder.close()
+        bus.close()
+        client.disconnect()
+    print(f"{recorder.frames} frames, {os.path.getsize(args.path) / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
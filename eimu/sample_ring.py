@@ -0,0 +1,76 @@
+import numpy as np
+from typing import Tuple
+
+
+class SampleRingBuffer:
+    """Preallocated ring of timestamped samples with one writer and any number of readers.
+
+    The writer fills a row and only then advances the sample counter, so readers
+    never need a lock: they snapshot the counter, copy the rows they want and
+    drop any row the writer lapped while they were copying. The row being
+    written is never handed out, so at most capacity - 1 samples are readable.
+    """
+
+    def __init__(self, capacity: int, width: int):
+        self.capacity = capacity
+        self.width = width
+        self._t = np.zeros(capacity, dtype=np.float64)
+        self._data = np.zeros((capacity, width), dtype=np.float32)
+        self._count = 0
+
+    @property
+    def count(self) -> int:
+        """Total number of samples ever pushed"""
+        return self._count
+
+    def push(self, t: float, values):
+        i = self._count % self.capacity
+        self._t[i] = t
+        self._data[i] = values
+        self._count += 1
+
+    def next_row(self) -> np.ndarray:
+        """Writable view of the row the next sample goes into, publish it with commit()"""
+        return self._data[self._count % self.capacity]
+
+    def commit(self, t: float):
+        self._t[self._count % self.capacity] = t
+        self._count += 1
+
+    def clear(self):
+        self._count = 0
+
+    def latest(self) -> Tuple[bool, float, np.ndarray]:
+        end = self._count
+        if end == 0:
+            return False, 0.0, np.zeros(self.width, dtype=np.float32)
+        i = (end - 1) % self.capacity
+        t = float(self._t[i])
+        vals = self._data[i].copy()
+        if self._count - self.capacity + 1 >= end:
+            # lapped while copying, the row now holds a newer sample
+            return self.latest()
+        return True, t, vals
+
+    def read(self, n: int | None = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Copy of the most recent n samples (oldest first) as (t, values)"""
+        end = self._count
+        n = min(self.capacity if n is None else n, end, self.capacity - 1)
+        return self._copy(end - n, end)
+
+    def read_since(self, seq: int) -> Tuple[int, np.ndarray, np.ndarray]:
+        """Samples pushed after sequence number seq, plus the sequence to pass next time"""
+        end = self._count
+        start = max(seq, end - self.capacity + 1)
+        t, vals = self._copy(start, end)
+        return end, t, vals
+
+    def _copy(self, start: int, end: int) -> Tuple[np.ndarray, np.ndarray]:
+        idx = np.arange(start, end) % self.capacity
+        t = self._t[idx]
+        vals = self._data[idx]
+        overwritten = self._count - self.capacity + 1 - start
+        if overwritten > 0:
+            t = t[overwritten:]
+            vals = vals[overwritten:]
+        return t, vals
@@ -0,0 +1,212 @@
+"""IMU samples in shared memory, for readers in other processes.
+
+ShmRingPublisher keeps a SampleRingBuffer-style ring of READ_IMU_DATA samples
+in a multiprocessing.shared_memory block. ShmRingReader maps the same block
+as a NumPy structured array (SAMPLE_DTYPE), so a co-located process gets the
+latest samples with plain memory copies, no socket, pickling or syscall per
+sample:
+
+  python3 -m eimu.shm_ring /dev/ttyUSB0 --name eimu
+
+  reader = ShmRingReader("eimu")
+  rows = reader.read(100)          # rows["t"], rows["rpy"], rows["acc"], rows["gyro"]
+
+There is one writer. It fills a row and only then advances the sample
+counter, and readers drop any row the writer lapped while they were copying,
+exactly like SampleRingBuffer. This relies on the stores reaching other cores
+in program order, which x86 and the counter's single aligned 8-byte store on
+ARM64 give us in practice.
+"""
+import argparse
+import threading
+from multiprocessing import resource_tracker, shared_memory
+from typing import Tuple
+
+import numpy as np
+
+from eimu.eimu_serial import EIMUSerialClient
+from eimu.acquisition import AcquisitionBus
+
+SHM_MAGIC = b"EIMUSHM1"
+DEFAULT_NAME = "eimu"
+SAMPLE_DTYPE = np.dtype([("t", "<f8"), ("rpy", "<f4", 3), ("acc", "<f4", 3), ("gyro", "<f4", 3)])
+# magic, capacity, item size, then the sample counter on its own cache line
+_HEADER_DTYPE = np.dtype([("magic", "S8"), ("capacity", "<u8"), ("itemsize", "<u8"),
+                          ("pad", "u1", 40), ("count", "<u8"), ("pad2", "u1", 56)])
+_HEADER_SIZE = _HEADER_DTYPE.itemsize
+
+_published = set()  # names of the blocks publishers in this process created, see _attach
+
+
+class ShmRingPublisher:
+    """Writes samples into a new shared memory ring called name."""
+
+    def __init__(self, name: str = DEFAULT_NAME, capacity: int = 4096):
+        self.name = name
+        self.capacity = capacity
+        self._shm = shared_memory.SharedMemory(name, create=True,
+                                               size=_HEADER_SIZE + capacity * SAMPLE_DTYPE.itemsize)
+        _published.add(name)
+        self._header, self._rows = _map(self._shm, capacity)
+        self._header["magic"] = SHM_MAGIC
+        self._header["capacity"] = capacity
+        self._header["itemsize"] = SAMPLE_DTYPE.itemsize
+        self._header["count"] = 0
+        # rpy, acc and gyro sit back to back in a row, so a sample is two stores
+        self._t = self._rows["t"]
+        self._vals = np.ndarray((capacity, 9), "<f4", self._shm.buf, offset=_HEADER_SIZE + 8,
+                                strides=(SAMPLE_DTYPE.itemsize, 4))
+        self._sub = None
+        self._lock = threading.Lock()  # close() waits out a push in flight on the acquisition thread
+
+    @property
+    def count(self) -> int:
+        return int(self._header["count"])
+
+    def push(self, t: float, vals):
+        """Publish one sample, vals being the 9 floats of READ_IMU_DATA"""
+        with self._lock:
+            if self._vals is None:
+                return  # closed, the bus handed this sample out just before we left it
+            count = int(self._header["count"])
+            i = count % self.capacity
+            self._t[i] = t
+            self._vals[i] = vals
+            self._header["count"] = count + 1
+
+    def attach(self, bus, decimation: int = 1):
+        """Publish every decimation-th sample of an AcquisitionBus streaming READ_IMU_DATA"""
+        self.detach()
+        self._sub = bus.subscribe(decimation, callback=self.push)
+        return self._sub
+
+    def detach(self):
+        if self._sub is not None:
+            self._sub.close()
+            self._sub = None
+
+    def close(self):
+        """Stop publishing and remove the block, readers already attached keep their mapping"""
+        self.detach()
+        # the bus may still be calling push(), the views must outlive that call
+        with self._lock:
+            self._header = self._rows = self._t = self._vals = None
+        self._shm.close()
+        self._shm.unlink()
+        _published.discard(self.name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ShmRingReader:
+    """Maps the ring a ShmRingPublisher created, read-only."""
+
+    def __init__(self, name: str = DEFAULT_NAME):
+        self.name = name
+        self._shm = _attach(name)
+        header = np.ndarray((), _HEADER_DTYPE, self._shm.buf)
+        if bytes(header["magic"]) != SHM_MAGIC or int(header["itemsize"]) != SAMPLE_DTYPE.itemsize:
+            self._shm.close()
+            raise RuntimeError(f"shared memory block {name} is not an EIMU sample ring")
+        self.capacity = int(header["capacity"])
+        self._header, self.samples = _map(self._shm, self.capacity)
+        self.samples.flags.writeable = False
+
+    @property
+    def count(self) -> int:
+        """Total number of samples ever published"""
+        return int(self._header["count"])
+
+    def latest(self) -> Tuple[bool, np.void]:
+        end = self.count
+        if end == 0:
+            return False, np.zeros((), SAMPLE_DTYPE)[()]
+        row = self.samples[(end - 1) % self.capacity].copy()
+        if self.count - self.capacity + 1 >= end:
+            # lapped while copying, the row now holds a newer sample
+            return self.latest()
+        return True, row
+
+    def read(self, n: int | None = None) -> np.ndarray:
+        """Copy of the most recent n samples, oldest first"""
+        end = self.count
+        n = min(self.capacity if n is None else n, end, self.capacity - 1)
+        return self._copy(end - n, end)
+
+    def read_since(self, seq: int) -> Tuple[int, np.ndarray]:
+        """Samples published after sequence number seq, plus the sequence to pass next time"""
+        end = self.count
+        start = max(seq, end - self.capacity + 1)
+        return end, self._copy(start, end)
+
+    def _copy(self, start: int, end: int) -> np.ndarray:
+        if start >= end:
+            return np.zeros(0, SAMPLE_DTYPE)
+        i, j = start % self.capacity, end % self.capacity
+        if i < j:
+            rows = self.samples[i:j].copy()
+        else:
+            rows = np.concatenate((self.samples[i:], self.samples[:j]))
+        overwritten = self.count - self.capacity + 1 - start
+        return rows[overwritten:] if overwritten > 0 else rows
+
+    def close(self):
+        self._header = self.samples = None
+        self._shm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _map(shm: shared_memory.SharedMemory, capacity: int):
+    header = np.ndarray((), _HEADER_DTYPE, shm.buf)
+    rows = np.ndarray((capacity,), SAMPLE_DTYPE, shm.buf, offset=_HEADER_SIZE)
+    return header, rows
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    try:
+        return shared_memory.SharedMemory(name, track=False)
+    except TypeError:
+        # before Python 3.13 every attach is tracked, and the tracker would
+        # remove the publisher's block when this reader exits. A block this
+        # process published is tracked once for both, under the publisher.
+        shm = shared_memory.SharedMemory(name)
+        if name not in _published:
+            resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Publish EIMU samples to a shared memory ring")
+    parser.add_argument("port", help="serial port of the module, sim:// or a mux server URL")
+    parser.add_argument("--baud", type=int, default=115200)
+    parser.add_argument("--name", default=DEFAULT_NAME, help="shared memory block name")
+    parser.add_argument("--capacity", type=int, default=4096)
+    args = parser.parse_args()
+
+    client = EIMUSerialClient()
+    client.connect(args.port, args.baud)
+    bus = AcquisitionBus(client)
+    publisher = ShmRingPublisher(args.name, args.capacity)
+    publisher.attach(bus)
+    print(f"Publishing EIMU samples to shared memory block: {args.name}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        publisher.close()
+        bus.close()
+        client.disconnect()
+
+
+if __name__ == "__main__":
+    main()
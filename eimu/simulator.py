@@ -0,0 +1,337 @@
+"""In-process stand-in for the MPU9250 EIMU module.
+
+SimulatedEIMU speaks the same START_BYTE/cmd/len/payload/checksum protocol as
+the firmware and answers every command in eimu_serial.py from a synthetic
+motion and noise model. It can be reached in three ways:
+
+  - LoopbackSerial(device): a serial.Serial look-alike to assign to
+    EIMUSerialClient.ser, for tests and benchmarks with no OS port at all.
+  - the sim:// port in eimu.transport, which wraps a LoopbackSerial.
+  - serve_pty(device): a pseudo-terminal the unmodified client or the GUI can
+    connect() to like a real port (POSIX only), also via `python -m eimu.simulator`.
+"""
+import argparse
+import os
+import struct
+import threading
+from dataclasses import dataclass, field
+from time import perf_counter
+
+import numpy as np
+import serial
+
+from eimu.eimu_serial import (CLEAR_DATA_BUFFER, GET_ACC_LPF_CUT_FREQ, GET_FILTER_GAIN, GET_FRAME_ID,
+                              GET_I2C_ADDR, PARAM_WRITES, READ_ACC, READ_ACC_GYRO, READ_ACC_OFF, READ_ACC_RAW,
+                              READ_ACC_VAR, READ_GYRO, READ_GYRO_OFF, READ_GYRO_RAW, READ_GYRO_VAR, READ_IMU_DATA,
+                              READ_LIN_ACC, READ_LIN_ACC_RAW, READ_MAG, READ_MAG_H_OFF, READ_MAG_RAW,
+                              READ_MAG_S_OFF0, READ_MAG_S_OFF1, READ_MAG_S_OFF2, READ_QUAT, READ_QUAT_RPY,
+                              READ_RPY, READ_RPY_VAR, RESET_PARAMS, START_BYTE)
+from eimu.codec import PacketParser
+
+GRAVITY = 9.81
+DEFAULT_TUMBLE = (0.3, 0.2, 0.5)  # rad/s, slow enough to follow and covers every attitude
+
+
+def rpy_to_dcm(r: float, p: float, y: float) -> np.ndarray:
+    """World to body rotation, same convention as ImuVisualizeFrame"""
+    cr, sr = np.cos(r), np.sin(r)
+    cp, sp = np.cos(p), np.sin(p)
+    cy, sy = np.cos(y), np.sin(y)
+    return np.array([[cp*cy, cp*sy, -sp],
+                     [sr*sp*cy - cr*sy, sr*sp*sy + cr*cy, sr*cp],
+                     [cr*sp*cy + sr*sy, cr*sp*sy - sr*cy, cr*cp]])
+
+
+def rpy_to_quat(r: float, p: float, y: float) -> np.ndarray:
+    cr, sr = np.cos(r/2), np.sin(r/2)
+    cp, sp = np.cos(p/2), np.sin(p/2)
+    cy, sy = np.cos(y/2), np.sin(y/2)
+    return np.array([cr*cp*cy + sr*sp*sy,
+                     sr*cp*cy - cr*sp*sy,
+                     cr*sp*cy + sr*cp*sy,
+                     cr*cp*sy - sr*sp*cy])
+
+
+def _wrap(angle: float) -> float:
+    return (angle + np.pi) % (2*np.pi) - np.pi
+
+
+@dataclass
+class MotionModel:
+    """Constant Euler-rate tumble plus sensor errors.
+
+    Angles are in rad, rates in rad/s, acc in m/s^2 and mag in uT.
+    """
+    rpy_rate: tuple = (0.0, 0.0, 0.0)
+    linear_acc: tuple = (0.0, 0.0, 0.0)
+
+    acc_noise: float = 0.02
+    gyro_noise: float = 0.002
+    mag_noise: float = 0.3
+
+    acc_bias: tuple = (0.05, -0.03, 0.1)
+    gyro_bias: tuple = (0.01, -0.005, 0.002)
+    earth_field: tuple = (22.0, 0.0, -42.0)
+    hard_iron: tuple = (12.0, -8.0, 5.0)
+    soft_iron: list = field(default_factory=lambda: [[1.05, 0.02, 0.0],
+                                                     [0.02, 0.97, 0.01],
+                                                     [0.0, 0.01, 1.0]])
+
+    def rpy(self, t: float) -> np.ndarray:
+        return np.array([_wrap(rate * t) for rate in self.rpy_rate])
+
+    def body_rate(self, t: float) -> np.ndarray:
+        r, p, _ = self.rpy(t)
+        dr, dp, dy = self.rpy_rate
+        return np.array([dr - dy*np.sin(p),
+                         dp*np.cos(r) + dy*np.sin(r)*np.cos(p),
+                         -dp*np.sin(r) + dy*np.cos(r)*np.cos(p)])
+
+
+def default_params() -> dict:
+    return {
+        READ_ACC_OFF: (0.0, 0.0, 0.0),
+        READ_GYRO_OFF: (0.0, 0.0, 0.0),
+        READ_RPY_VAR: (0.0, 0.0, 0.0),
+        READ_ACC_VAR: (0.0, 0.0, 0.0),
+        READ_GYRO_VAR: (0.0, 0.0, 0.0),
+        READ_MAG_H_OFF: (0.0, 0.0, 0.0),
+        READ_MAG_S_OFF0: (1.0, 0.0, 0.0),
+        READ_MAG_S_OFF1: (0.0, 1.0, 0.0),
+        READ_MAG_S_OFF2: (0.0, 0.0, 1.0),
+        GET_I2C_ADDR: 104.0,
+        GET_FILTER_GAIN: 0.1,
+        GET_FRAME_ID: 1.0,
+        GET_ACC_LPF_CUT_FREQ: 5.0,
+    }
+
+class SimulatedEIMU:
+    """Protocol-level EIMU device driven by a MotionModel."""
+
+    def __init__(self, motion: MotionModel | None = None, seed: int | None = None, clock=perf_counter):
+        self.motion = motion or MotionModel()
+        self.rng = np.random.default_rng(seed)
+        self.clock = clock
+        self.params = default_params()
+
+        self._t0 = clock()
+        self._parser = PacketParser(START_BYTE)
+        self._lin_acc_filt = np.zeros(3)
+        self._last_filt_t = None
+
+    # ------------------ Protocol ------------------
+
+    def handle(self, data: bytes) -> bytes:
+        """Feed request bytes, get back the reply bytes for every complete packet"""
+        out = bytearray()
+        for cmd, payload in self._parser.feed(data):
+            out += self.respond(cmd, payload)
+        return bytes(out)
+
+    @property
+    def packets(self) -> int:
+        return self._parser.packets
+
+    @property
+    def bad_packets(self) -> int:
+        return self._parser.bad_packets
+
+    def respond(self, cmd: int, payload: bytes) -> bytes:
+        if cmd in PARAM_WRITES:
+            self._write_param(PARAM_WRITES[cmd], payload)
+            return b""
+
+        if cmd == RESET_PARAMS:
+            self.params = default_params()
+            return struct.pack("<f", 1.0)
+        if cmd == CLEAR_DATA_BUFFER:
+            self._lin_acc_filt[:] = 0.0
+            self._last_filt_t = None
+            return struct.pack("<f", 1.0)
+
+        vals = self.read(cmd)
+        if vals is None:
+            return b""
+        return struct.pack("<" + "f" * len(vals), *vals)
+
+    def _write_param(self, key: int, payload: bytes):
+        if len(payload) == 5:
+            _, val = struct.unpack("<Bf", payload)
+            self.params[key] = float(int(val)) if key in (GET_I2C_ADDR, GET_FRAME_ID) else val
+        elif len(payload) == 12:
+            self.params[key] = struct.unpack("<fff", payload)
+
+    # ------------------ Sensor model ------------------
+
+    def now(self) -> float:
+        return self.clock() - self._t0
+
+    def read(self, cmd: int):
+        """Values the firmware would send for a read/get command, or None if unknown"""
+        if cmd in self.params:
+            val = self.params[cmd]
+            return val if isinstance(val, tuple) else (val,)
+
+        t = self.now()
+        m = self.motion
+        rpy = m.rpy(t)
+        dcm = rpy_to_dcm(*rpy)
+
+        if cmd == READ_RPY:
+            return tuple(rpy)
+        if cmd == READ_QUAT:
+            return tuple(rpy_to_quat(*rpy))
+        if cmd == READ_QUAT_RPY:
+            return tuple(rpy_to_quat(*rpy)) + tuple(rpy)
+        if cmd == READ_ACC_RAW:
+            return tuple(self._acc_raw(dcm))
+        if cmd == READ_ACC:
+            return tuple(self._acc(dcm))
+        if cmd == READ_GYRO_RAW:
+            return tuple(self._gyro_raw(t))
+        if cmd == READ_GYRO:
+            return tuple(self._gyro(t))
+        if cmd == READ_MAG_RAW:
+            return tuple(self._mag_raw(dcm))
+        if cmd == READ_MAG:
+            return tuple(self._mag(dcm))
+        if cmd == READ_ACC_GYRO:
+            return tuple(self._acc(dcm)) + tuple(self._gyro(t))
+        if cmd == READ_IMU_DATA:
+            return tuple(rpy) + tuple(self._acc(dcm)) + tuple(self._gyro(t))
+        if cmd == READ_LIN_ACC_RAW:
+            return tuple(self._lin_acc_raw(dcm))
+        if cmd == READ_LIN_ACC:
+            return tuple(self._lin_acc(t, dcm))
+        return None
+
+    def _noise(self, std: float) -> np.ndarray:
+        return self.rng.normal(0.0, std, 3)
+
+    def _acc_raw(self, dcm: np.ndarray) -> np.ndarray:
+        m = self.motion
+        specific_force = dcm @ (np.array([0.0, 0.0, GRAVITY]) + np.array(m.linear_acc))
+        return specific_force + np.array(m.acc_bias) + self._noise(m.acc_noise)
+
+    def _acc(self, dcm: np.ndarray) -> np.ndarray:
+        return self._acc_raw(dcm) - np.array(self.params[READ_ACC_OFF])
+
+    def _gyro_raw(self, t: float) -> np.ndarray:
+        m = self.motion
+        return m.body_rate(t) + np.array(m.gyro_bias) + self._noise(m.gyro_noise)
+
+    def _gyro(self, t: float) -> np.ndarray:
+        return self._gyro_raw(t) - np.array(self.params[READ_GYRO_OFF])
+
+    def _mag_raw(self, dcm: np.ndarray) -> np.ndarray:
+        m = self.motion
+        field_body = dcm @ np.array(m.earth_field)
+        return np.array(m.soft_iron) @ field_body + np.array(m.hard_iron) + self._noise(m.mag_noise)
+
+    def _mag(self, dcm: np.ndarray) -> np.ndarray:
+        A_1 = np.array([self.params[READ_MAG_S_OFF0],
+                        self.params[READ_MAG_S_OFF1],
+                        self.params[READ_MAG_S_OFF2]])
+        return A_1 @ (self._mag_raw(dcm) - np.array(self.params[READ_MAG_H_OFF]))
+
+    def _lin_acc_raw(self, dcm: np.ndarray) -> np.ndarray:
+        return self._acc(dcm) - dcm @ np.array([0.0, 0.0, GRAVITY])
+
+    def _lin_acc(self, t: float, dcm: np.ndarray) -> np.ndarray:
+        # first order low pass, same cut-off parameter as the firmware
+        raw = self._lin_acc_raw(dcm)
+        if self._last_filt_t is None:
+            self._lin_acc_filt = raw
+        else:
+            dt = max(t - self._last_filt_t, 0.0)
+            rc = 1.0 / (2.0 * np.pi * max(self.params[GET_ACC_LPF_CUT_FREQ], 1e-6))
+            alpha = dt / (rc + dt)
+            self._lin_acc_filt = self._lin_acc_filt + alpha * (raw - self._lin_acc_filt)
+        self._last_filt_t = t
+        return self._lin_acc_filt
+
+
+class LoopbackSerial:
+    """Minimal serial.Serial look-alike wired straight to a SimulatedEIMU."""
+
+    def __init__(self, device: SimulatedEIMU, timeout: float = 0.05):
+        self.device = device
+        self.timeout = timeout
+        self.is_open = True
+        self._rx = bytearray()
+
+    @property
+    def in_waiting(self) -> int:
+        return len(self._rx)
+
+    def write(self, data) -> int:
+        if not self.is_open:
+            raise serial.PortNotOpenError()
+        self._rx += self.device.handle(bytes(data))
+        return len(data)
+
+    def read(self, size: int = 1) -> bytes:
+        if not self.is_open:
+            raise serial.PortNotOpenError()
+        data = bytes(self._rx[:size])
+        del self._rx[:size]
+        return data
+
+    def readinto(self, b) -> int:
+        data = self.read(len(b))
+        b[:len(data)] = data
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def reset_input_buffer(self):
+        self._rx.clear()
+
+    def reset_output_buffer(self):
+        pass
+
+    def close(self):
+        self.is_open = False
+
+
+def serve_pty(device: SimulatedEIMU) -> str:
+    """Serve device on a new pseudo-terminal and return the port name to connect to"""
+    import tty
+
+    master, slave = os.openpty()
+    tty.setraw(slave)
+
+    def run():
+        while True:
+            try:
+                data = os.read(master, 1024)
+            except OSError:
+                return
+            reply = device.handle(data)
+            if reply:
+                os.write(master, reply)
+
+    threading.Thread(target=run, daemon=True).start()
+    # slave stays open here so the pty survives clients reconnecting
+    return os.ttyname(slave)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a simulated EIMU module on a pseudo-terminal")
+    parser.add_argument("--rate", type=float, nargs=3, default=DEFAULT_TUMBLE,
+                        metavar=("ROLL", "PITCH", "YAW"), help="tumble rate in rad/s")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    device = SimulatedEIMU(MotionModel(rpy_rate=tuple(args.rate)), seed=args.seed)
+    port = serve_pty(device)
+    print(f"Simulated EIMU on port: {port}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+import numpy as np
+from typing import NamedTuple, Tuple
+
+
+class RangeStats(NamedTuple):
+    """Per-axis statistics of a range of frames, var is the population variance like np.var"""
+    count: int
+    min: np.ndarray
+    max: np.ndarray
+    mean: np.ndarray
+    var: np.ndarray
+
+
+def frame_stats(vals: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """(min, max, mean, M2) per axis of an (N, width) block, M2 being the sum of squared deviations"""
+    vals = np.asarray(vals, dtype=np.float64)
+    if len(vals) == 0:
+        width = vals.shape[1]
+        return np.full(width, np.inf), np.full(width, -np.inf), np.zeros(width), np.zeros(width)
+    mean = vals.mean(axis=0)
+    return vals.min(axis=0), vals.max(axis=0), mean, ((vals - mean) ** 2).sum(axis=0)
+
+
+def merge_stats(count, mn, mx, mean, m2) -> RangeStats:
+    """Combine per-group statistics (one row per group) into those of all groups together"""
+    count = np.asarray(count, dtype=np.float64)
+    total = count.sum()
+    width = np.shape(mn)[1]
+    if total == 0:
+        return RangeStats(0, np.full(width, np.nan), np.full(width, np.nan), np.full(width, np.nan),
+                          np.full(width, np.nan))
+    w = count[:, None]
+    grand = (w * mean).sum(axis=0) / total
+    # Chan et al.: the spread of the group means around the grand mean adds to the groups' own M2
+    m2_total = (m2 + w * (mean - grand) ** 2).sum(axis=0)
+    return RangeStats(int(total), np.min(mn, axis=0), np.max(mx, axis=0), grand, m2_total / total)
+
+
+class SummaryPyramid:
+    """Per-chunk statistics and coarser levels built from them.
+
+    Level 0 has one node per chunk, and every node of level k merges fanout
+    consecutive nodes of level k - 1, so the statistics of any run of whole
+    chunks come from at most 2 * fanout nodes per level instead of from the
+    samples.
+    """
+
+    def __init__(self, count, t0, t1, mn, mx, mean, m2, fanout: int = 16):
+        self.fanout = fanout
+        level = (np.asarray(count, dtype=np.float64), np.asarray(t0, dtype=np.float64),
+                 np.asarray(t1, dtype=np.float64), np.asarray(mn), np.asarray(mx),
+                 np.asarray(mean), np.asarray(m2))
+        self.levels = [level]
+        while len(level[0]) > 1:
+            level = self._coarsen(level)
+            self.levels.append(level)
+
+    def __len__(self):
+        return len(self.levels[0][0])
+
+    def _coarsen(self, level):
+        count, t0, t1, mn, mx, mean, m2 = level
+        starts = np.arange(0, len(count), self.fanout)
+        ends = np.append(starts[1:], len(count))
+        n = np.add.reduceat(count, starts)
+        safe = np.where(n > 0, n, 1)[:, None]
+        grand = np.add.reduceat(count[:, None] * mean, starts) / safe
+        spread = m2 + count[:, None] * (mean - np.repeat(grand, ends - starts, axis=0)) ** 2
+        return (n, t0[starts], t1[ends - 1], np.minimum.reduceat(mn, starts), np.maximum.reduceat(mx, starts),
+                grand, np.add.reduceat(spread, starts))
+
+    def nodes(self, a: int, b: int) -> list:
+        """(level, first, end) node runs that exactly cover chunks a to b - 1"""
+        runs = []
+        f = self.fanout
+        for k in range(len(self.levels)):
+            if a >= b:
+                break
+            if k == len(self.levels) - 1:
+                runs.append((k, a, b))
+                break
+            up = min(b, -(-a // f) * f)
+            down = max(up, b // f * f)
+            if a < up:
+                runs.append((k, a, up))
+            if down < b:
+                runs.append((k, down, b))
+            a, b = up // f, down // f
+        return runs
+
+    def stats(self, a: int, b: int) -> list:
+        """Per-node (count, min, max, mean, M2) rows covering chunks a to b - 1, ready for merge_stats"""
+        parts = [[], [], [], [], []]
+        for k, i, j in self.nodes(a, b):
+            count, _, _, mn, mx, mean, m2 = self.levels[k]
+            for part, arr in zip(parts, (count, mn, mx, mean, m2)):
+                part.append(arr[i:j])
+        return parts
+
+    def level_for(self, a: int, b: int, bins: int) -> int:
+        """Finest level showing chunks a to b - 1 in at most bins nodes"""
+        for k in range(len(self.levels)):
+            if (b - a) / self.fanout ** k <= bins:
+                return k
+        return len(self.levels) - 1
@@ -0,0 +1,262 @@
+"""Byte transports EIMUSerialClient can talk through.
+
+open_transport() turns a port string into a serial.Serial-like object:
+
+  /dev/ttyUSB0, COM3, /dev/pts/5   local serial port or pty (pyserial)
+  socket://host:port               raw TCP bridge (ser2net, esp-link ...)
+  unix:///tmp/eimu.sock            an eimu.mux_server sharing one module, over a Unix socket
+  tcp://host:port                  an eimu.mux_server, over TCP
+  replay://session.eimucap         play back a capture recorded with record=...
+  sim://                           in-process SimulatedEIMU
+
+Anything else goes to serial.serial_for_url() (rfc2217://, loop:// ...). socket://
+does not: pyserial's handler reports at most 1 byte in_waiting, so stale bytes
+would survive FrameDecoder.sync() and be read as the next reply.
+"""
+import socket
+import struct
+import threading
+from time import monotonic, perf_counter
+
+import serial
+
+SHARED_SCHEMES = ("unix://", "tcp://")  # an eimu.mux_server, other programs use the module too
+CAPTURE_MAGIC = b"EIMUCAP1"
+_RECORD = struct.Struct("<Bdi")  # direction, host time, length
+TX = 0
+RX = 1
+
+
+def open_transport(port: str, baud: int = 115200, timeout: float = 0.1, record: str | None = None):
+    if port.startswith("replay://"):
+        transport = ReplayTransport(port[len("replay://"):], timeout=timeout)
+    elif port.startswith("sim://"):
+        from eimu.simulator import SimulatedEIMU, LoopbackSerial, MotionModel, DEFAULT_TUMBLE
+        transport = LoopbackSerial(SimulatedEIMU(MotionModel(rpy_rate=DEFAULT_TUMBLE)), timeout=timeout)
+    elif port.startswith(SHARED_SCHEMES + ("socket://",)):
+        transport = SocketTransport(port, timeout=timeout)
+    else:
+        transport = serial.serial_for_url(port, baud, timeout=timeout)
+
+    if record:
+        transport = CaptureTransport(transport, record)
+    return transport
+
+
+class CaptureTransport:
+    """Wraps a transport and appends every write and read to a capture file."""
+
+    def __init__(self, inner, path: str):
+        self.inner = inner
+        self._file = open(path, "wb")
+        self._file.write(CAPTURE_MAGIC)
+        self._lock = threading.Lock()
+
+    def _log(self, direction: int, data: bytes):
+        if not data:
+            return
+        with self._lock:
+            self._file.write(_RECORD.pack(direction, perf_counter(), len(data)))
+            self._file.write(data)
+
+    def write(self, data) -> int:
+        self._log(TX, bytes(data))
+        return self.inner.write(data)
+
+    def read(self, size: int = 1) -> bytes:
+        data = self.inner.read(size)
+        self._log(RX, data)
+        return data
+
+    def readinto(self, b) -> int:
+        n = self.inner.readinto(b)
+        self._log(RX, bytes(b[:n]))
+        return n
+
+    def close(self):
+        self.inner.close()
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def __getattr__(self, name):
+        # in_waiting, is_open, timeout, flush, reset_*_buffer ...
+        return getattr(self.inner, name)
+
+
+def parse_socket_url(url: str):
+    """(address family, address) of a unix://path, tcp://host:port or socket://host:port URL"""
+    if url.startswith("unix://"):
+        return socket.AF_UNIX, url[len("unix://"):]
+    for scheme in ("tcp://", "socket://"):
+        if url.startswith(scheme):
+            # pyserial style ?options after socket://host:port are ignored
+            host, _, port = url[len(scheme):].partition("?")[0].rpartition(":")
+            if not host or not port.isdigit():
+                raise ValueError(f"expected {scheme}host:port, got {url}")
+            return socket.AF_INET, (host, int(port))
+    raise ValueError(f"not a unix://, tcp:// or socket:// URL: {url}")
+
+
+class SocketTransport:
+    """serial.Serial look-alike over a stream socket, an eimu.mux_server or a raw TCP bridge.
+
+    Unlike pyserial's socket:// handler, in_waiting reports every byte queued
+    on the socket, so the client can drop a stale reply in one go.
+    """
+
+    def __init__(self, url: str, timeout: float = 0.1):
+        family, address = parse_socket_url(url)
+        self.timeout = timeout
+        self._sock = socket.socket(family, socket.SOCK_STREAM)
+        try:
+            self._sock.connect(address)
+        except OSError as e:
+            self._sock.close()
+            raise serial.SerialException(f"could not connect to {url}: {e}")
+        if family == socket.AF_INET:
+            self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.is_open = True
+
+    @property
+    def in_waiting(self) -> int:
+        if not self.is_open:
+            raise serial.PortNotOpenError()
+        self._sock.settimeout(0)
+        try:
+            return len(self._sock.recv(65536, socket.MSG_PEEK))
+        except BlockingIOError:
+            return 0
+
+    def write(self, data) -> int:
+        if not self.is_open:
+            raise serial.PortNotOpenError()
+        try:
+            self._sock.sendall(data)
+        except OSError as e:
+            raise serial.SerialException(f"write failed: {e}")
+        return len(data)
+
+    def readinto(self, b) -> int:
+        """Fill b, returning short once timeout has passed, like a serial port"""
+        if not self.is_open:
+            raise serial.PortNotOpenError()
+        view = memoryview(b).cast("B")
+        fill = 0
+        deadline = monotonic() + self.timeout
+        while fill < len(view):
+            remaining = deadline - monotonic()
+            if remaining <= 0:
+                break
+            self._sock.settimeout(remaining)
+            try:
+                got = self._sock.recv_into(view[fill:])
+            except socket.timeout:
+                break
+            except OSError as e:
+                raise serial.SerialException(f"read failed: {e}")
+            if not got:
+                raise serial.SerialException("server closed the connection")
+            fill += got
+        return fill
+
+    def read(self, size: int = 1) -> bytes:
+        buf = bytearray(size)
+        return bytes(buf[:self.readinto(buf)])
+
+    def flush(self):
+        pass
+
+    def reset_input_buffer(self):
+        self._sock.settimeout(0)
+        try:
+            while self._sock.recv(65536):
+                pass
+        except BlockingIOError:
+            pass
+
+    def reset_output_buffer(self):
+        pass
+
+    def close(self):
+        if self.is_open:
+            self.is_open = False
+            self._sock.close()
+
+
+def load_capture(path: str) -> list:
+    """Exchanges in a capture file as (request bytes, reply bytes), one per write"""
+    exchanges = []
+    with open(path, "rb") as f:
+        if f.read(len(CAPTURE_MAGIC)) != CAPTURE_MAGIC:
+            raise ValueError(f"{path} is not an EIMU capture file")
+        while True:
+            head = f.read(_RECORD.size)
+            if len(head) < _RECORD.size:
+                break
+            direction, _, length = _RECORD.unpack(head)
+            data = f.read(length)
+            if direction == TX:
+                exchanges.append((data, bytearray()))
+            elif exchanges:
+                exchanges[-1][1].extend(data)
+    return [(tx, bytes(rx)) for tx, rx in exchanges]
+
+
+class ReplayTransport:
+    """Serves recorded replies back in order, one exchange per write().
+
+    Requests are not required to match the capture byte for byte; mismatches
+    are only counted. With loop=True the capture restarts when it runs out,
+    which is what throughput benchmarks want.
+    """
+
+    def __init__(self, path: str, timeout: float = 0.1, loop: bool = True):
+        self.exchanges = load_capture(path)
+        self.timeout = timeout
+        self.loop = loop
+        self.is_open = True
+        self.mismatches = 0
+        self._next = 0
+        self._rx = bytearray()
+
+    @property
+    def in_waiting(self) -> int:
+        return len(self._rx)
+
+    def write(self, data) -> int:
+        if not self.is_open:
+            raise serial.PortNotOpenError()
+        if self._next >= len(self.exchanges) and self.loop:
+            self._next = 0
+        if self._next < len(self.exchanges):
+            tx, rx = self.exchanges[self._next]
+            self._next += 1
+            if tx != bytes(data):
+                self.mismatches += 1
+            self._rx += rx
+        return len(data)
+
+    def read(self, size: int = 1) -> bytes:
+        if not self.is_open:
+            raise serial.PortNotOpenError()
+        data = bytes(self._rx[:size])
+        del self._rx[:size]
+        return data
+
+    def readinto(self, b) -> int:
+        data = self.read(len(b))
+        b[:len(data)] = data
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def reset_input_buffer(self):
+        self._rx.clear()
+
+    def reset_output_buffer(self):
+        pass
+
+    def close(self):
+        self.is_open = False
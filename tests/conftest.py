@@ -0,0 +1,32 @@
+import os
+import sys
+
+import pytest
+
+# the repo is run from a checkout, not installed
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from eimu.eimu_serial import EIMUSerialClient  # noqa: E402
+from eimu.simulator import SimulatedEIMU, serve_pty  # noqa: E402
+
+
+@pytest.fixture
+def client():
+    """EIMUSerialClient connected to an in-process SimulatedEIMU over sim://"""
+    c = EIMUSerialClient()
+    c.connect("sim://")
+    yield c
+    c.disconnect()
+
+
+@pytest.fixture
+def device():
+    return SimulatedEIMU(seed=0)
+
+
+@pytest.fixture
+def pty_port(device):
+    """Pseudo-terminal port served by device, as `python -m eimu.simulator` does"""
+    if not hasattr(os, "openpty"):
+        pytest.skip("pseudo-terminals are POSIX only")
+    return serve_pty(device)
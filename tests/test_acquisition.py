@@ -0,0 +1,92 @@
+import time
+
+import numpy as np
+
+from eimu.acquisition import AcquisitionBus
+
+
+class StubClient:
+    """Records stream starts and stops, samples are published by the test"""
+
+    def __init__(self):
+        self.on_sample = None
+        self.starts = 0
+        self.stops = 0
+
+    def isStreaming(self) -> bool:
+        return self.on_sample is not None
+
+    def startStreaming(self, cmd, count, capacity, on_sample=None):
+        self.starts += 1
+        self.on_sample = on_sample
+
+    def stopStreaming(self, wait: bool = True):
+        self.stops += 1
+        self.on_sample = None
+
+
+def _publish(client: StubClient, n: int, start: int = 0):
+    for seq in range(start, start + n):
+        client.on_sample(seq, seq * 0.01, np.full(9, seq, dtype=np.float32))
+
+
+def test_subscribers_share_one_stream_and_decimate():
+    client = StubClient()
+    bus = AcquisitionBus(client)
+    every = bus.subscribe()
+    fifth = bus.subscribe(decimation=5)
+    assert client.starts == 1
+
+    _publish(client, 20)
+    t, vals = every.drain()
+    assert len(t) == 20 and np.all(vals[:, 0] == np.arange(20))
+    t, vals = fifth.drain()
+    assert list(vals[:, 0]) == [0, 5, 10, 15]
+    assert np.allclose(t, [0.0, 0.05, 0.1, 0.15])
+    assert (every.received, fifth.received) == (20, 4)
+
+    every.close()
+    assert client.stops == 0  # fifth still listens
+    fifth.close()
+    assert client.stops == 1 and bus.subscribers == 0
+
+
+def test_full_queue_drops_oldest_and_counts_them():
+    client = StubClient()
+    bus = AcquisitionBus(client)
+    sub = bus.subscribe(maxsize=8)
+    _publish(client, 20)
+
+    assert sub.dropped == 12
+    t, vals = sub.drain()
+    assert list(vals[:, 0]) == list(range(12, 20))
+
+    _publish(client, 3, start=20)
+    ok, t, latest = sub.latest()
+    assert ok and latest[0] == 22
+    assert sub.latest()[0] is False
+
+
+def test_broken_callback_does_not_starve_others():
+    client = StubClient()
+    bus = AcquisitionBus(client)
+    bus.subscribe(callback=lambda t, vals: 1 / 0)
+    seen = []
+    bus.subscribe(callback=lambda t, vals: seen.append(vals))
+    _publish(client, 3)
+
+    assert len(seen) == 3
+    assert not seen[0].flags.writeable  # one shared copy, no subscriber may change it
+
+
+def test_bus_streams_from_the_client(client):
+    bus = AcquisitionBus(client)
+    sub = bus.subscribe(decimation=2)
+    deadline = time.monotonic() + 2.0
+    while sub.received < 10 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    bus.close()
+
+    assert sub.received >= 10
+    assert not client.isStreaming()
+    assert client.stream.count >= 2 * sub.received - 1
@@ -0,0 +1,95 @@
+import asyncio
+import struct
+
+from eimu.eimu_serial import READ_ACC_OFF, READ_QUAT, WRITE_ACC_OFF
+from eimu.eimu_serial_async import AsyncEIMUSerialClient, _EIMUProtocol
+from eimu.frame_decoder import FrameDecoder
+
+
+def test_connect_and_transact(pty_port):
+    async def run():
+        c = AsyncEIMUSerialClient()
+        await c.connect(pty_port, timeout=0.2)
+        try:
+            await c.writeAccOffset(0.5, -0.25, 2.0)
+            offsets = await c.readAccOffset()
+            quat = await c.read_data4(READ_QUAT)
+            frame_id = await c.getWorldFrameId()
+        finally:
+            await c.disconnect()
+        return offsets, quat, frame_id
+
+    offsets, (ok, quat), frame_id = asyncio.run(run())
+    assert offsets == (True, (0.5, -0.25, 2.0))
+    assert ok and abs(sum(q * q for q in quat) - 1.0) < 1e-4
+    assert frame_id == (True, 1)
+
+
+def test_connect_rejects_stray_bytes(device, pty_port):
+    # two bytes of a boot message ahead of the first reply make it decode as a bogus frame id
+    handle = device.handle
+    prefix = [b"ok"]
+
+    def handle_with_prefix(data):
+        reply = handle(data)
+        if reply and prefix:
+            reply = prefix.pop() + reply
+        return reply
+
+    device.handle = handle_with_prefix
+
+    async def run():
+        c = AsyncEIMUSerialClient()
+        await c.connect(pty_port, timeout=0.2)
+        try:
+            await c.write_data3(WRITE_ACC_OFF, 1.0, 2.0, 3.0)
+            return await c.read_data3(READ_ACC_OFF), c.decoder.dropped_bytes
+        finally:
+            await c.disconnect()
+
+    (ok, offsets), dropped = asyncio.run(run())
+    assert not prefix
+    assert ok and offsets == (1.0, 2.0, 3.0)
+    assert dropped == 2
+
+
+def _reply(*vals):
+    return struct.pack(f"<{len(vals)}f", *vals)
+
+
+def test_partial_reply_is_reassembled():
+    async def run():
+        loop = asyncio.get_running_loop()
+        port = _EIMUProtocol()
+        port.timeout = 0.1
+        decoder = FrameDecoder()
+        reply = _reply(1.0, 2.0, 3.0)
+        port.data_received(reply[:5])
+        loop.call_later(0.15, port.data_received, reply[5:])  # inside the grace period
+        return await decoder.read_floats_async(port, 3), decoder
+
+    (ok, vals), decoder = asyncio.run(run())
+    assert ok and vals == (1.0, 2.0, 3.0)
+    assert decoder.short_reads == 1 and decoder.resyncs == 0
+
+
+def test_abandoned_reply_tail_is_dropped():
+    async def run():
+        loop = asyncio.get_running_loop()
+        port = _EIMUProtocol()
+        port.timeout = 0.05
+        decoder = FrameDecoder()
+        reply = _reply(1.0, 2.0, 3.0)
+        port.data_received(reply[:5])
+        first = await decoder.read_floats_async(port, 3)
+        # the tail turns up late, then the reply to the next request
+        loop.call_later(0.02, port.data_received, reply[5:])
+        await decoder.sync_async(port)
+        port.data_received(_reply(4.0, 5.0, 6.0))
+        second = await decoder.read_floats_async(port, 3)
+        return first, second, decoder
+
+    first, second, decoder = asyncio.run(run())
+    assert not first[0]
+    assert second == (True, (4.0, 5.0, 6.0))
+    assert decoder.resyncs == 1 and decoder.dropped_bytes == 7
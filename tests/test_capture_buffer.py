@@ -0,0 +1,27 @@
+import numpy as np
+
+from eimu.capture_buffer import CaptureBuffer
+
+
+def test_fills_in_place_up_to_capacity():
+    buf = CaptureBuffer(4)
+    assert buf.append((1.0, 2.0, 3.0))
+    assert buf.extend(np.arange(12.0).reshape(4, 3)) == 3
+    assert buf.full and len(buf) == 4
+    assert not buf.append((0.0, 0.0, 0.0))
+    assert np.shares_memory(buf.data, buf._data)
+    np.testing.assert_array_equal(buf.data[1:], np.arange(9.0).reshape(3, 3))
+
+    buf.clear()
+    assert len(buf) == 0 and buf.data.shape == (0, 3)
+
+
+def test_save_writes_the_filled_rows(tmp_path):
+    buf = CaptureBuffer(100)
+    rows = np.random.default_rng(0).normal(size=(10, 3))
+    buf.extend(rows)
+
+    buf.save(str(tmp_path / "mag.npy"))
+    np.testing.assert_array_equal(np.load(tmp_path / "mag.npy"), rows)
+    buf.save(str(tmp_path / "mag.csv"))
+    np.testing.assert_allclose(np.loadtxt(tmp_path / "mag.csv", delimiter=","), rows)
@@ -0,0 +1,100 @@
+import time
+
+import numpy as np
+import pytest
+
+from eimu.eimu_serial import (GET_ACC_LPF_CUT_FREQ, GET_FRAME_ID, PARAM_READS, READ_ACC_OFF, READ_IMU_DATA, READ_QUAT,
+                              READ_RPY, WRITE_ACC_OFF)
+
+
+def _wait_for(predicate, timeout: float = 2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_streaming_fills_the_ring(client):
+    seen = []
+    client.startStreaming(on_sample=lambda seq, t, row: seen.append((seq, row.copy())))
+    try:
+        _wait_for(lambda: client.stream.count >= 20)
+        assert client.isStreaming()
+        with pytest.raises(RuntimeError):
+            client.startStreaming()
+    finally:
+        client.stopStreaming()
+    assert not client.isStreaming()
+
+    t, rows = client.stream.read(20)
+    assert rows.shape == (20, 9)
+    assert np.all(np.diff(t) > 0)
+    # on_sample gets every committed sample, in order
+    assert [seq for seq, _ in seen] == list(range(len(seen)))
+    np.testing.assert_array_equal(seen[-1][1], client.stream.latest()[2])
+
+
+def test_pipeline_matches_single_calls(client):
+    packets = client.ser.device.packets
+    results = (client.pipeline()
+               .read_data1(GET_FRAME_ID)
+               .write_data3(WRITE_ACC_OFF, 1.0, 2.0, 3.0)
+               .read_data3(READ_ACC_OFF)
+               .read_data4(READ_QUAT)
+               .read_data9(READ_IMU_DATA)
+               .execute())
+    assert client.ser.device.packets == packets + 5
+
+    assert results[0] == (True, 1.0)
+    assert results[1] is None
+    assert results[2] == (True, (1.0, 2.0, 3.0))
+    assert results[2] == client.read_data3(READ_ACC_OFF)
+    success, quat = results[3]
+    assert success and np.linalg.norm(quat) == pytest.approx(1.0, abs=1e-3)
+    assert results[4][0] and len(results[4][1]) == 9
+
+    assert client.pipeline().execute() == []
+
+
+def test_parameter_cache(client):
+    client.writeAccOffset(0.5, -1.0, 2.0)
+    assert READ_ACC_OFF not in client.params  # a write drops the cached value
+    assert client.readAccOffset() == (True, (0.5, -1.0, 2.0))
+
+    # served from the cache until refreshed
+    client.ser.device.params[READ_ACC_OFF] = (9.0, 9.0, 9.0)
+    assert client.readAccOffset() == (True, (0.5, -1.0, 2.0))
+    assert client.readAccOffset(refresh=True) == (True, (9.0, 9.0, 9.0))
+
+    # pipelined reads fill it too
+    client.pipeline().write_data3(WRITE_ACC_OFF, 1.0, 2.0, 3.0).read_data3(READ_ACC_OFF).execute()
+    assert client.params[READ_ACC_OFF] == (1.0, 2.0, 3.0)
+
+
+def test_set_frame_id_skips_matching_write(client):
+    packets = client.ser.device.packets
+    client.setWorldFrameId(1)
+    assert client.ser.device.packets == packets
+    client.setWorldFrameId(2)
+    assert client.getWorldFrameId(refresh=True) == (True, 2)
+
+
+def test_prefetch_fills_every_parameter(client):
+    client.invalidateParams()
+    packets = client.ser.device.packets
+    assert client.prefetchParams()
+    assert set(client.params) == set(PARAM_READS)
+    assert client.params[GET_ACC_LPF_CUT_FREQ] == 5.0
+    assert client.ser.device.packets == packets + len(PARAM_READS)
+
+
+def test_read_into_array(client):
+    out = np.empty(3, dtype="<f4")
+    success, vals = client.read_data3(READ_RPY, out)
+    assert success and vals is out
+    assert np.all(np.isfinite(out))
+
+    # rows of a float64 block take the copying path
+    block = np.zeros((2, 3))
+    client.writeAccOffset(0.5, -1.0, 2.0)
+    assert client.read_data3(READ_ACC_OFF, block[1])[0]
+    np.testing.assert_array_equal(block, [[0.0, 0.0, 0.0], [0.5, -1.0, 2.0]])
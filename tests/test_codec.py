@@ -0,0 +1,38 @@
+import struct
+
+from eimu.codec import PacketParser, READ, READ1, WRITE1, WRITE3
+from eimu.eimu_serial import (CODECS, START_BYTE, GET_FRAME_ID, READ_IMU_DATA, READ_QUAT, SET_FRAME_ID, WRITE_ACC_OFF,
+                              encode_packet)
+
+
+def test_codec_packets_match_encode_packet():
+    assert CODECS[READ_IMU_DATA].kind == READ
+    assert CODECS[READ_IMU_DATA].reply_count == 9
+    assert CODECS[READ_QUAT].reply_count == 4
+    assert CODECS[READ_IMU_DATA].packet == encode_packet(READ_IMU_DATA)
+
+    get = CODECS[GET_FRAME_ID]
+    assert get.kind == READ1
+    assert get.packet == encode_packet(GET_FRAME_ID, struct.pack("<Bf", 0, 0.0))
+
+    assert CODECS[SET_FRAME_ID].kind == WRITE1
+    assert CODECS[SET_FRAME_ID].encode1(0, 2.0) == encode_packet(SET_FRAME_ID, struct.pack("<Bf", 0, 2.0))
+    assert CODECS[WRITE_ACC_OFF].kind == WRITE3
+    assert CODECS[WRITE_ACC_OFF].encode3(1.0, -2.5, 3.0) == encode_packet(WRITE_ACC_OFF, struct.pack("<fff", 1.0, -2.5, 3.0))
+
+
+def test_packet_parser_splits_and_resyncs():
+    parser = PacketParser(START_BYTE)
+    good = encode_packet(SET_FRAME_ID, struct.pack("<Bf", 0, 2.0))
+    bad = bytearray(encode_packet(WRITE_ACC_OFF, struct.pack("<fff", 1.0, 2.0, 3.0)))
+    bad[-1] ^= 0xFF
+
+    stream = b"noise" + bytes(bad) + good + encode_packet(READ_IMU_DATA)
+    # byte by byte, a packet is only returned once it is complete
+    packets = []
+    for i in range(len(stream)):
+        packets += parser.feed(stream[i:i + 1])
+
+    assert packets == [(SET_FRAME_ID, struct.pack("<Bf", 0, 2.0)), (READ_IMU_DATA, b"")]
+    assert parser.packets == 2
+    assert parser.bad_packets == 1
@@ -0,0 +1,21 @@
+from eimu.discovery import discover_ports, probe_port
+
+
+def test_probe_rejects_missing_port():
+    assert probe_port("/dev/no-such-eimu") is None
+
+
+def test_discover_finds_every_eimu(pty_port):
+    probes = discover_ports(["/dev/no-such-eimu", pty_port, "sim://"])
+    assert sorted(probe.port for probe in probes) == sorted([pty_port, "sim://"])
+    assert all(probe.client is None for probe in probes)
+    assert probes == sorted(probes, key=lambda probe: probe.latency)
+
+
+def test_discover_keeps_the_best_connection(pty_port):
+    best, other = discover_ports([pty_port, "sim://"], keep_best=True)
+    try:
+        assert other.client is None
+        assert best.client.getWorldFrameId(refresh=True) == (True, 1)
+    finally:
+        best.client.disconnect()
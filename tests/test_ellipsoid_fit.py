@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+
+from eimu.ellipsoid_fit import (OnlineEllipsoidFit, calibration_params, design_matrix, ellipsoid_fit, field_norms,
+                                quadric_vector, robust_ellipsoid_fit)
+
+A = np.array([[40.0, 3.0, 1.0], [2.0, 35.0, -2.0], [0.0, 1.0, 45.0]])  # soft iron, not diagonal
+B = np.array([12.0, -7.0, 20.0])  # hard iron
+# strongly coupled soft iron, every off-diagonal term of M is far from zero
+A_SKEW = np.array([[40.0, 8.0, -4.0], [6.0, 35.0, 6.0], [-3.0, 5.0, 45.0]])
+
+
+def _samples(n, noise=0.0, seed=0, A=A):
+    rng = np.random.default_rng(seed)
+    u = rng.normal(size=(n, 3))
+    u /= np.linalg.norm(u, axis=1)[:, None]
+    return u @ A.T + B + rng.normal(scale=noise, size=(n, 3)) if noise else u @ A.T + B
+
+
+@pytest.mark.parametrize("soft_iron", [A, A_SKEW])
+def test_batch_fit_is_exact_on_clean_samples(soft_iron):
+    x = _samples(2000, A=soft_iron)
+    b, A_1 = calibration_params(*ellipsoid_fit(x.T))
+    np.testing.assert_allclose(b.ravel(), B, atol=1e-8)
+    np.testing.assert_allclose(field_norms(x, b, A_1), 1.0, atol=1e-10)
+
+
+def test_fitted_quadric_matches_the_soft_iron():
+    # |A⁻¹(x - B)| = 1, so M is a multiple of A⁻ᵀA⁻¹, the xy, xz and yz terms included
+    x = _samples(2000, A=A_SKEW)
+    M, n, d = ellipsoid_fit(x.T)
+    A_inv = np.linalg.inv(A_SKEW)
+    Q = A_inv.T @ A_inv
+    np.testing.assert_allclose(M / M[0, 0], Q / Q[0, 0], rtol=1e-8)
+
+    # v in the order of D gives the same quadric as M, n, d
+    v = quadric_vector(M, n, d)
+    q = np.einsum("ij,jk,ik->i", x, M, x) + 2 * x @ n.ravel() + d
+    np.testing.assert_allclose(v @ design_matrix(x.T), q, atol=1e-12 * np.abs(d))
+
+
+def test_online_fit_matches_batch_fit():
+    x = _samples(5000, noise=0.5)
+    fit = OnlineEllipsoidFit()
+    for row in x[:500]:
+        fit.add(row)
+    fit.add_batch(x[500:])
+    assert fit.count == len(x)
+
+    b, A_1, residual = fit.estimate()
+    b_ref, A_ref = calibration_params(*ellipsoid_fit(x.T))
+    np.testing.assert_allclose(b, b_ref, rtol=1e-9)
+    np.testing.assert_allclose(A_1, A_ref, rtol=1e-9)
+    # the residual comes from S alone, it must equal the one from the samples
+    err = field_norms(x, b, A_1) ** 2 - 1.0
+    assert residual == pytest.approx(np.sqrt(np.mean(err ** 2)), rel=1e-9)
+
+
+def test_online_fit_needs_enough_samples():
+    fit = OnlineEllipsoidFit()
+    assert fit.estimate() is None
+    fit.add_batch(_samples(9))
+    assert fit.estimate() is None
+
+
+def test_robust_fit_ignores_interference_burst():
+    x = _samples(100_000, noise=0.3, seed=1)
+    burst = slice(20_000, 35_000)
+    x[burst] += np.array([30.0, 10.0, -20.0])
+
+    b_lsq, _ = calibration_params(*ellipsoid_fit(x.T))
+    assert np.abs(b_lsq.ravel() - B).max() > 3.0
+
+    report = robust_ellipsoid_fit(x)
+    np.testing.assert_allclose(report.b.ravel(), B, atol=0.05)
+    assert report.inliers[:20_000].all() and report.inliers[35_000:].all()
+    assert (~report.inliers[burst]).mean() > 0.9
+    assert 0.85 < report.inlier_fraction < 0.87
+    assert report.norm_mean == pytest.approx(1.0, abs=1e-3)
+    assert report.norm_std < 0.02
+
+
+def test_robust_fit_is_exact_on_clean_samples():
+    # no noise, the scale floor keeps the weights finite
+    report = robust_ellipsoid_fit(_samples(2000, A=A_SKEW))
+    np.testing.assert_allclose(report.b.ravel(), B, atol=1e-6)
+    assert report.inlier_fraction > 0.99
+
+
+def test_robust_fit_rejects_too_few_samples():
+    with pytest.raises(np.linalg.LinAlgError):
+        robust_ellipsoid_fit(_samples(5))
@@ -0,0 +1,65 @@
+import struct
+from collections import deque
+
+from eimu.frame_decoder import FrameDecoder
+
+
+class TrickleSerial:
+    """Serial stand-in whose bytes arrive in scheduled pieces, one piece per read timeout"""
+
+    def __init__(self, *pieces: bytes):
+        self.pieces = deque(pieces)
+        self.rx = bytearray()  # arrived, not read yet
+
+    @property
+    def in_waiting(self) -> int:
+        return len(self.rx)
+
+    def arrive(self, data: bytes):
+        self.rx += data
+
+    def readinto(self, b) -> int:
+        if len(self.rx) < len(b) and self.pieces:
+            self.rx += self.pieces.popleft()
+        n = min(len(b), len(self.rx))
+        b[:n] = self.rx[:n]
+        del self.rx[:n]
+        return n
+
+
+def test_partial_reply_is_reassembled():
+    reply = struct.pack("<ff", 1.5, -2.0)
+    ser = TrickleSerial(reply[:3], reply[3:])
+    decoder = FrameDecoder(grace=1)
+
+    assert decoder.read_floats(ser, 2) == (True, (1.5, -2.0))
+    assert decoder.short_reads == 1
+    assert decoder.resyncs == 0
+    assert decoder.frames == 1
+
+
+def test_abandoned_tail_is_dropped_before_next_request():
+    late = struct.pack("<f", 7.0)
+    ser = TrickleSerial(late[:1], b"")
+    decoder = FrameDecoder(grace=1)
+
+    success, _ = decoder.read_floats(ser, 1)
+    assert not success
+    assert decoder.resyncs == 1
+
+    # the rest of the abandoned reply is still in flight when the next request goes out
+    ser.pieces.append(late[1:])
+    decoder.sync(ser)
+    assert decoder.dropped_bytes == 3
+
+    ser.arrive(struct.pack("<f", 2.0))
+    assert decoder.read_floats(ser, 1) == (True, (2.0,))
+
+
+def test_sync_drops_everything_waiting():
+    ser = TrickleSerial()
+    ser.arrive(b"stale bytes")
+    decoder = FrameDecoder()
+    decoder.sync(ser)
+    assert ser.in_waiting == 0
+    assert decoder.dropped_bytes == len(b"stale bytes")
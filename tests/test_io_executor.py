@@ -0,0 +1,97 @@
+import threading
+import tkinter as tk
+
+import pytest
+
+from eimu.io_executor import EIMUExecutor
+
+
+class FakeWidget:
+    """Stands in for the Tk root: after() callbacks run when the test says so"""
+
+    def __init__(self):
+        self.pending = {}
+        self._ids = 0
+
+    def after(self, ms, fn):
+        self._ids += 1
+        self.pending[self._ids] = fn
+        return self._ids
+
+    def after_cancel(self, after_id):
+        self.pending.pop(after_id, None)
+
+    def run_pending(self):
+        pending, self.pending = self.pending, {}
+        for fn in pending.values():
+            fn()
+
+
+class ClosedPage(tk.Misc):
+    def __init__(self):
+        self.shown = []
+
+    def winfo_exists(self):
+        return 0
+
+    def show(self, result):
+        self.shown.append(result)
+
+
+@pytest.fixture
+def executor(client):
+    io = EIMUExecutor(client)
+    widget = FakeWidget()
+    io.start(widget)
+    yield io, widget
+    io.shutdown()
+
+
+def _settle(io: EIMUExecutor):
+    io.submit(lambda: None).result(1.0)  # calls run in order, so everything before this one is done
+
+
+def test_calls_run_in_order_and_deliver_on_dispatch(executor):
+    io, widget = executor
+    delivered = []
+    io.setAccFilterCF(12.5)
+    io.then(io.getAccFilterCF(), lambda result: delivered.append((result, threading.current_thread())))
+    _settle(io)
+    assert delivered == []  # nothing runs until the Tk loop dispatches
+
+    widget.run_pending()
+    assert delivered == [((True, 12.5), threading.current_thread())]
+    assert len(widget.pending) == 1  # the dispatcher rescheduled itself
+
+
+def test_errors_go_to_on_error_and_do_not_stop_dispatch(executor):
+    io, widget = executor
+    errors, results = [], []
+
+    def boom():
+        raise ValueError("no reply")
+
+    io.then(io.submit(boom), results.append, errors.append)
+    io.then(io.submit(lambda: 1), lambda result: 1 / 0)  # a broken callback
+    io.then(io.submit(lambda: 2), results.append)
+    _settle(io)
+    widget.run_pending()
+
+    assert [type(e) for e in errors] == [ValueError]
+    assert results == [2]
+    assert len(widget.pending) == 1
+
+
+def test_callbacks_of_destroyed_widgets_are_dropped(executor):
+    io, widget = executor
+    page = ClosedPage()
+    io.then(io.getWorldFrameId(), page.show)
+    _settle(io)
+    widget.run_pending()
+    assert page.shown == []
+
+
+def test_stop_cancels_the_dispatcher(executor):
+    io, widget = executor
+    io.stop()
+    assert widget.pending == {}
@@ -0,0 +1,56 @@
+import numpy as np
+
+from eimu.eimu_serial import READ_IMU_DATA
+from eimu.link_stats import LatencyHistogram, LinkStats
+
+
+def test_histogram_percentiles_are_within_bucket_precision():
+    rng = np.random.default_rng(0)
+    values = rng.lognormal(mean=12.0, sigma=1.0, size=5000).astype(np.int64)
+    hist = LatencyHistogram(bits=6)
+    for v in values:
+        hist.record(v)
+
+    assert hist.total == len(values)
+    assert hist.max == values.max()
+    assert hist.mean() == values.sum() / len(values)
+    for p in (50, 95, 99):
+        exact = np.percentile(values, p, method="nearest")
+        assert abs(hist.percentile(p) - exact) <= exact / 2 ** (hist.bits - 1)
+
+
+def test_small_values_are_exact():
+    hist = LatencyHistogram(bits=6)
+    for v in range(1, 11):
+        hist.record(v)
+    assert hist.percentile(50) == 5
+    assert hist.percentile(100) == 10
+
+
+def test_link_stats_counts_failures_by_name():
+    link = LinkStats({1: "ONE"})
+    link.record(1, 1000, True, 8, 4)
+    link.record(1, 3000, False, 8, 2, short_reads=1, resyncs=1)
+    link.record(2, 500, True, 8, 12)
+
+    snap = link.snapshot()
+    assert list(snap) == ["ONE", "0x2"]
+    one = snap["ONE"]
+    assert (one["count"], one["failures"], one["short_reads"], one["resyncs"]) == (2, 1, 1, 1)
+    assert (one["bytes_tx"], one["bytes_rx"]) == (16, 6)
+    assert one["max_us"] == 3.0
+
+    link.reset()
+    assert link.snapshot() == {}
+
+
+def test_client_records_every_exchange(client):
+    client.resetStats()
+    for _ in range(5):
+        client.read_data9(READ_IMU_DATA)
+
+    stats = client.stats()["READ_IMU_DATA"]
+    assert stats["count"] == 5
+    assert stats["failures"] == 0
+    assert stats["bytes_rx"] == 5 * 36
+    assert 0 < stats["p50_us"] <= stats["max_us"]
@@ -0,0 +1,91 @@
+import os
+import socket
+import tempfile
+import time
+
+import pytest
+
+from eimu.eimu_serial import EIMUSerialClient, encode_packet
+from eimu.mux_server import EIMUMuxServer
+
+
+def _wait_for(predicate, timeout: float = 2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def _serve(stream: bool):
+    device = EIMUSerialClient()
+    device.connect("sim://")
+    path = os.path.join(tempfile.mkdtemp(), "eimu.sock")
+    server = EIMUMuxServer(device, listen=f"unix://{path}", stream=stream)
+    server.start()
+    yield server, f"unix://{path}"
+    server.close()
+    device.disconnect()
+
+
+@pytest.fixture
+def mux():
+    yield from _serve(stream=False)
+
+
+@pytest.fixture
+def streaming_mux():
+    yield from _serve(stream=True)
+
+
+def test_unknown_command_is_dropped(mux):
+    server, url = mux
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.connect(url[len("unix://"):])
+    try:
+        sock.sendall(encode_packet(0, bytes(5)))  # cmd 0 is not a command
+        time.sleep(0.1)
+    finally:
+        sock.close()
+    assert server.dropped == 1
+    assert server.forwarded == 0
+
+
+def test_peers_see_each_others_parameter_writes(mux):
+    _, url = mux
+    a, b = EIMUSerialClient(), EIMUSerialClient()
+    a.connect(url)
+    b.connect(url)
+    try:
+        assert not a.cacheParams
+        assert a.getWorldFrameId() == (True, 1)
+        b.setWorldFrameId(2)
+        time.sleep(0.05)  # writes are not acknowledged
+        assert a.getWorldFrameId() == (True, 2)
+        # a's last read was 2, a cached client would skip this write
+        b.setWorldFrameId(1)
+        time.sleep(0.05)
+        a.setWorldFrameId(2)
+        time.sleep(0.05)
+        assert b.getWorldFrameId() == (True, 2)
+    finally:
+        a.disconnect()
+        b.disconnect()
+
+
+def test_stream_runs_only_while_peers_are_connected(streaming_mux):
+    server, url = streaming_mux
+    assert not server.client.isStreaming()
+
+    peer = EIMUSerialClient()
+    peer.connect(url)
+    try:
+        assert server.client.isStreaming()
+        for _ in range(20):
+            success, vals = peer.readImuData()
+            assert success and len(vals) == 9
+        assert server.fanned_out > 0
+    finally:
+        peer.disconnect()
+
+    _wait_for(lambda: server.peers == 0 and not server.client.isStreaming())
+    assert not server.client.isStreaming()
+    assert server._sub is None
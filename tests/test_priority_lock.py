@@ -0,0 +1,101 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from eimu.eimu_serial import CODECS, COMMAND_NAMES, READ_IMU_DATA, WRITE_ACC_OFF
+from eimu.priority_lock import PriorityLock, PRIORITY_CONTROL, PRIORITY_NORMAL, PRIORITY_STREAM
+
+
+def _serve_order(lock: PriorityLock, priorities) -> list:
+    """Queue one waiter per priority, in the given arrival order, while the lock is held"""
+    order = []
+    lock.acquire()
+    threads = []
+    for p in priorities:
+        def wait(p=p):
+            with lock.hold(p):
+                order.append(p)
+        t = threading.Thread(target=wait)
+        t.start()
+        threads.append(t)
+        time.sleep(0.02)  # make the arrival order deterministic
+    lock.release()
+    for t in threads:
+        t.join(1.0)
+    return order
+
+
+def test_most_urgent_waiter_goes_first():
+    order = _serve_order(PriorityLock(), [PRIORITY_STREAM, PRIORITY_NORMAL, PRIORITY_CONTROL, PRIORITY_NORMAL])
+    assert order == [PRIORITY_CONTROL, PRIORITY_NORMAL, PRIORITY_NORMAL, PRIORITY_STREAM]
+
+
+def test_unprioritized_lock_is_fifo():
+    order = _serve_order(PriorityLock(prioritized=False), [PRIORITY_STREAM, PRIORITY_NORMAL, PRIORITY_CONTROL])
+    assert order == [PRIORITY_STREAM, PRIORITY_NORMAL, PRIORITY_CONTROL]
+
+
+def test_reentrant_and_owner_checked():
+    lock = PriorityLock()
+    with lock.hold(PRIORITY_CONTROL):
+        with lock.hold(PRIORITY_STREAM):
+            pass
+        other = []
+        t = threading.Thread(target=lambda: other.append(lock.acquire(timeout=0.05)))
+        t.start()
+        t.join()
+        assert other == [False]
+    with pytest.raises(RuntimeError):
+        lock.release()
+
+
+def test_transactions_do_not_interleave(client):
+    # without the lock, concurrent requests read each other's replies
+    expected = {client.getWorldFrameId: (True, 1), client.getAccFilterCF: (True, 5.0),
+                client.getI2cAddress: (True, 104), client.getFilterGain: (True, 0.1)}
+    errors = []
+
+    def hammer(read, want):
+        for _ in range(200):
+            got = read(refresh=True)
+            if got != want:
+                errors.append((read.__name__, got))
+
+    threads = [threading.Thread(target=hammer, args=item) for item in expected.items()]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(10.0)
+    assert errors == []
+
+
+def test_parameter_write_overtakes_queued_stream_reads(client):
+    device = client.ser.device
+    handle = device.handle
+    seen = []
+    device.handle = lambda data: (seen.append(data[1]), handle(data))[1]
+
+    client.lock.acquire()
+    # queued first, the way the streaming loop asks for a sample
+    stream = threading.Thread(target=lambda: client._transact(READ_IMU_DATA, CODECS[READ_IMU_DATA].packet, 9,
+                                                              np.empty(9, "<f4"), PRIORITY_STREAM))
+    stream.start()
+    time.sleep(0.02)
+    write = threading.Thread(target=lambda: client.writeAccOffset(1.0, 2.0, 3.0))
+    write.start()
+    time.sleep(0.02)
+    client.lock.release()
+    stream.join(1.0)
+    write.join(1.0)
+
+    assert seen == [WRITE_ACC_OFF, READ_IMU_DATA]
+
+
+def test_command_names_are_protocol_constants_only():
+    assert PRIORITY_CONTROL not in COMMAND_NAMES  # imported into eimu_serial next to the commands
+    assert PRIORITY_CONTROL not in CODECS
+    assert all(name.startswith(("READ_", "WRITE_", "SET_", "GET_")) or name in ("RESET_PARAMS", "CLEAR_DATA_BUFFER")
+               for name in COMMAND_NAMES.values())
+    assert COMMAND_NAMES[READ_IMU_DATA] == "READ_IMU_DATA"
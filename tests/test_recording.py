@@ -0,0 +1,108 @@
+import numpy as np
+import pytest
+
+from eimu.eimu_serial import READ_IMU_DATA, READ_MAG_RAW
+from eimu.recording import SessionRecorder, SessionReader
+from eimu.summary_pyramid import SummaryPyramid, frame_stats, merge_stats
+
+N = 5000
+
+
+@pytest.fixture
+def frames():
+    rng = np.random.default_rng(0)
+    t = np.arange(N) * 0.01
+    vals = rng.normal(size=(N, 9)).astype(np.float32)
+    return t, vals
+
+
+def _record(path, t, vals, close=True):
+    rec = SessionRecorder(str(path), chunk_size=64)
+    for i in range(len(t)):
+        rec.append(READ_IMU_DATA, t[i], vals[i])
+        if i % 10 == 0:
+            rec.append(READ_MAG_RAW, t[i], vals[i, :3])
+    if close:
+        rec.close()
+    else:
+        rec.flush()
+    return rec
+
+
+def test_roundtrip_and_time_range(tmp_path, frames):
+    t, vals = frames
+    _record(tmp_path / "s.eimurec", t, vals)
+    reader = SessionReader(str(tmp_path / "s.eimurec"))
+    assert not reader.recovered
+    assert reader.commands == sorted([READ_IMU_DATA, READ_MAG_RAW])
+    assert reader.count(READ_IMU_DATA) == N
+    assert reader.count(READ_MAG_RAW) == N // 10
+    assert reader.time_range(READ_IMU_DATA) == (t[0], t[-1])
+
+    rt, rv = reader.read(READ_IMU_DATA)
+    np.testing.assert_array_equal(rt, t)
+    np.testing.assert_array_equal(rv, vals)
+
+    rt, rv = reader.read(READ_IMU_DATA, 10.005, 20.0)
+    mask = (t >= 10.005) & (t <= 20.0)
+    np.testing.assert_array_equal(rt, t[mask])
+    np.testing.assert_array_equal(rv, vals[mask])
+
+
+def test_unclosed_recording_is_recovered(tmp_path, frames):
+    t, vals = frames
+    rec = _record(tmp_path / "crash.eimurec", t, vals, close=False)
+    try:
+        reader = SessionReader(str(tmp_path / "crash.eimurec"))
+        assert reader.recovered
+        np.testing.assert_array_equal(reader.read(READ_IMU_DATA)[1], vals)
+        assert reader.stats(READ_IMU_DATA).count == N
+    finally:
+        rec.close()
+
+def test_range_stats_match_brute_force(tmp_path, frames):
+    t, vals = frames
+    _record(tmp_path / "s.eimurec", t, vals)
+    reader = SessionReader(str(tmp_path / "s.eimurec"))
+    rng = np.random.default_rng(1)
+    data = vals.astype(np.float64)
+    for _ in range(50):
+        t0, t1 = np.sort(rng.uniform(-1.0, t[-1] + 1.0, 2))
+        mask = (t >= t0) & (t <= t1)
+        s = reader.stats(READ_IMU_DATA, t0, t1)
+        assert s.count == mask.sum()
+        if s.count:
+            np.testing.assert_allclose(s.min, data[mask].min(axis=0))
+            np.testing.assert_allclose(s.max, data[mask].max(axis=0))
+            np.testing.assert_allclose(s.mean, data[mask].mean(axis=0), atol=1e-12)
+            np.testing.assert_allclose(s.var, data[mask].var(axis=0), rtol=1e-9)
+
+
+def test_envelope_bounds_the_frames(tmp_path, frames):
+    t, vals = frames
+    _record(tmp_path / "s.eimurec", t, vals)
+    reader = SessionReader(str(tmp_path / "s.eimurec"))
+    for bins in (10, 1000):
+        env = reader.envelope(READ_IMU_DATA, bins=bins)
+        assert len(env.t) <= bins
+        np.testing.assert_allclose(env.min.min(axis=0), vals.min(axis=0))
+        np.testing.assert_allclose(env.max.max(axis=0), vals.max(axis=0))
+
+
+def test_pyramid_nodes_cover_exactly():
+    rng = np.random.default_rng(2)
+    chunks = 300
+    groups = [rng.normal(size=(int(rng.integers(1, 20)), 3)) for _ in range(chunks)]
+    stats = [frame_stats(g) for g in groups]
+    count = [len(g) for g in groups]
+    pyramid = SummaryPyramid(count, np.arange(chunks), np.arange(chunks) + 0.5,
+                             *(np.array([s[k] for s in stats]) for k in range(4)), fanout=4)
+    for a, b in [(0, chunks), (3, 4), (5, 170), (17, 299), (64, 128)]:
+        covered = sorted(i for k, i0, i1 in pyramid.nodes(a, b)
+                         for i in range(i0 * 4 ** k, min(i1 * 4 ** k, chunks)))
+        assert covered == list(range(a, b))
+        merged = merge_stats(*(np.concatenate(p) for p in pyramid.stats(a, b)))
+        data = np.concatenate(groups[a:b])
+        assert merged.count == len(data)
+        np.testing.assert_allclose(merged.mean, data.mean(axis=0))
+        np.testing.assert_allclose(merged.var, data.var(axis=0))
@@ -0,0 +1,46 @@
+import numpy as np
+
+from eimu.sample_ring import SampleRingBuffer
+
+
+def test_read_and_wrap():
+    ring = SampleRingBuffer(8, 2)
+    assert ring.latest()[0] is False
+    for i in range(20):
+        ring.push(float(i), (i, -i))
+
+    assert ring.count == 20
+    ok, t, vals = ring.latest()
+    assert ok and t == 19.0 and list(vals) == [19, -19]
+
+    # the row being written next is never handed out
+    t, vals = ring.read()
+    np.testing.assert_array_equal(t, np.arange(13, 20))
+    np.testing.assert_array_equal(vals[:, 0], np.arange(13, 20))
+    t, _ = ring.read(3)
+    np.testing.assert_array_equal(t, [17, 18, 19])
+
+
+def test_read_since_skips_lapped_samples():
+    ring = SampleRingBuffer(8, 1)
+    for i in range(5):
+        ring.push(float(i), (i,))
+    seq, t, _ = ring.read_since(0)
+    assert seq == 5 and list(t) == [0, 1, 2, 3, 4]
+
+    for i in range(5, 30):
+        ring.push(float(i), (i,))
+    seq, t, _ = ring.read_since(seq)
+    assert seq == 30
+    np.testing.assert_array_equal(t, np.arange(23, 30))
+
+
+def test_next_row_and_commit_write_in_place():
+    ring = SampleRingBuffer(4, 3)
+    row = ring.next_row()
+    row[:] = (1.0, 2.0, 3.0)
+    assert ring.count == 0
+    ring.commit(0.5)
+    assert ring.count == 1
+    ok, t, vals = ring.latest()
+    assert ok and t == 0.5 and list(vals) == [1.0, 2.0, 3.0]
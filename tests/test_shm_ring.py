@@ -0,0 +1,85 @@
+import os
+import subprocess
+import sys
+import threading
+import uuid
+
+import numpy as np
+import pytest
+
+from eimu.shm_ring import ShmRingPublisher, ShmRingReader
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def publisher():
+    pub = ShmRingPublisher(f"eimu-test-{uuid.uuid4().hex[:8]}", capacity=8)
+    yield pub
+    if pub._vals is not None:
+        pub.close()
+
+
+def _push(pub: ShmRingPublisher, start: int, n: int):
+    for k in range(start, start + n):
+        pub.push(k * 0.01, np.arange(9, dtype=np.float32) + k)
+
+
+def test_reader_sees_published_samples(publisher):
+    with ShmRingReader(publisher.name) as reader:
+        assert reader.latest()[0] is False
+        _push(publisher, 0, 3)
+        rows = reader.read()
+        assert reader.count == 3
+        np.testing.assert_allclose(rows["t"], [0.0, 0.01, 0.02])
+        np.testing.assert_array_equal(rows["rpy"][2], [2, 3, 4])
+        np.testing.assert_array_equal(rows["gyro"][2], [8, 9, 10])
+        ok, row = reader.latest()
+        assert ok and row["acc"][0] == 5
+
+
+def test_lapped_samples_are_skipped(publisher):
+    with ShmRingReader(publisher.name) as reader:
+        _push(publisher, 0, 20)
+        # the slot the writer fills next is never handed out
+        rows = reader.read()
+        assert list(rows["rpy"][:, 0]) == list(range(13, 20))
+        seq, rows = reader.read_since(5)
+        assert seq == 20
+        assert list(rows["rpy"][:, 0]) == list(range(13, 20))
+        seq, rows = reader.read_since(seq)
+        assert len(rows) == 0
+
+
+def test_close_waits_for_a_push_in_flight(publisher):
+    errors = []
+    stop = threading.Event()
+
+    def acquisition():
+        k = 0
+        while not stop.is_set():
+            try:
+                _push(publisher, k, 1)
+            except Exception as e:
+                errors.append(e)
+                return
+            k += 1
+
+    t = threading.Thread(target=acquisition)
+    t.start()
+    while publisher.count < 100:
+        pass
+    publisher.close()
+    stop.set()
+    t.join(1.0)
+    assert errors == []
+
+
+def test_same_process_reader_leaves_tracking_to_the_publisher():
+    script = ("from eimu.shm_ring import ShmRingPublisher, ShmRingReader\n"
+              f"pub = ShmRingPublisher('eimu-test-{uuid.uuid4().hex[:8]}', capacity=8)\n"
+              "ShmRingReader(pub.name).close()\n"
+              "pub.close()\n")
+    result = subprocess.run([sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True, timeout=30)
+    assert result.returncode == 0, result.stderr
+    assert "KeyError" not in result.stderr and "leaked" not in result.stderr
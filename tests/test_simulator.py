@@ -0,0 +1,46 @@
+import struct
+
+import numpy as np
+
+from eimu.eimu_serial import (EIMUSerialClient, GET_FRAME_ID, READ_ACC, READ_IMU_DATA, SET_FRAME_ID,
+                              encode_packet)
+from eimu.simulator import GRAVITY
+
+
+def test_sim_url_connects(client):
+    assert client.getWorldFrameId(refresh=True) == (True, 1)
+    success, rpy = client.readRPY()
+    assert success and len(rpy) == 3
+
+
+def test_client_connects_over_pty(device, pty_port):
+    c = EIMUSerialClient()
+    c.connect(pty_port)
+    try:
+        assert c.getWorldFrameId(refresh=True) == (True, 1)
+        c.setWorldFrameId(2)
+        assert c.getWorldFrameId(refresh=True) == (True, 2)
+        assert device.params[GET_FRAME_ID] == 2.0
+    finally:
+        c.disconnect()
+
+
+def test_device_answers_protocol(device):
+    reply = device.handle(encode_packet(READ_IMU_DATA))
+    assert len(reply) == 9 * 4
+
+    # at rest, or slowly tumbling, the accelerometer measures gravity
+    acc = np.array(struct.unpack("<fff", device.handle(encode_packet(READ_ACC))))
+    assert abs(np.linalg.norm(acc) - GRAVITY) < 0.5
+
+    assert device.handle(encode_packet(SET_FRAME_ID, struct.pack("<Bf", 0, 0.0))) == b""
+    assert struct.unpack("<f", device.handle(encode_packet(GET_FRAME_ID, struct.pack("<Bf", 0, 0.0)))) == (0.0,)
+
+
+def test_device_skips_corrupt_packets(device):
+    bad = bytearray(encode_packet(READ_IMU_DATA))
+    bad[-1] ^= 0xFF
+    assert device.handle(b"\x00junk" + bytes(bad)) == b""
+    assert device.bad_packets == 1
+    assert len(device.handle(encode_packet(READ_IMU_DATA))) == 36
+    assert device.packets == 1
@@ -0,0 +1,104 @@
+import socket
+import threading
+import time
+
+import pytest
+
+from eimu.eimu_serial import EIMUSerialClient
+from eimu.simulator import SimulatedEIMU
+from eimu.transport import SocketTransport, open_transport, parse_socket_url
+
+
+class StrayByteBridge:
+    """Raw TCP bridge to a SimulatedEIMU, like ser2net, that can slip stray bytes onto the line"""
+
+    def __init__(self, banner: bytes = b"", first_reply_prefix: bytes = b""):
+        self.device = SimulatedEIMU(seed=0)
+        self.banner = banner
+        self.first_reply_prefix = first_reply_prefix  # sent just ahead of the first reply, e.g. boot messages
+        self.conn = None
+        self._connected = threading.Event()
+        self._listener = socket.create_server(("127.0.0.1", 0))
+        self.url = f"socket://127.0.0.1:{self._listener.getsockname()[1]}"
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self):
+        self.conn, _ = self._listener.accept()
+        self.conn.sendall(self.banner)
+        self._connected.set()
+        try:
+            while True:
+                data = self.conn.recv(4096)
+                if not data:
+                    break
+                reply = self.device.handle(data)
+                if reply:
+                    self.conn.sendall(self.first_reply_prefix + reply)
+                    self.first_reply_prefix = b""
+        except OSError:
+            pass
+
+    def inject(self, data: bytes):
+        self._connected.wait(1.0)
+        self.conn.sendall(data)
+        time.sleep(0.05)  # let it land in the client's socket buffer
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+        self._listener.close()
+
+
+@pytest.fixture
+def bridge():
+    b = StrayByteBridge(banner=b"ser2net\n")
+    yield b
+    b.close()
+
+
+def test_parse_socket_url():
+    assert parse_socket_url("socket://127.0.0.1:4001") == (socket.AF_INET, ("127.0.0.1", 4001))
+    assert parse_socket_url("socket://10.0.0.2:4001?logging=debug") == (socket.AF_INET, ("10.0.0.2", 4001))
+    assert parse_socket_url("tcp://localhost:7650") == (socket.AF_INET, ("localhost", 7650))
+    assert parse_socket_url("unix:///tmp/eimu.sock") == (socket.AF_UNIX, "/tmp/eimu.sock")
+    with pytest.raises(ValueError):
+        parse_socket_url("socket://nohost")
+
+
+def test_socket_url_counts_every_waiting_byte(bridge):
+    ser = open_transport(bridge.url)
+    try:
+        assert isinstance(ser, SocketTransport)
+        bridge.inject(b"")
+        assert ser.in_waiting == len(bridge.banner)
+    finally:
+        ser.close()
+
+
+def test_stray_bytes_on_socket_bridge_are_dropped(bridge):
+    client = EIMUSerialClient()
+    client.connect(bridge.url)
+    try:
+        assert client.getWorldFrameId(refresh=True) == (True, 1)
+
+        bridge.inject(b"\x00garbage\xff")
+        assert client.getAccFilterCF(refresh=True) == (True, 5.0)
+
+        client.writeAccOffset(1.5, -2.0, 0.25)
+        bridge.inject(b"\x01\x02\x03\x04\x05")
+        assert client.readAccOffset(refresh=True) == (True, (1.5, -2.0, 0.25))
+    finally:
+        client.disconnect()
+
+
+def test_connect_ignores_bytes_that_land_during_the_handshake():
+    b = StrayByteBridge(first_reply_prefix=b"BOOT OK\r\n")
+    client = EIMUSerialClient()
+    try:
+        client.connect(b.url)
+        # the handshake value is cached, it must be the module's frame id and not "BOOT"
+        assert client.getWorldFrameId() == (True, 1)
+        assert client.getAccFilterCF(refresh=True) == (True, 5.0)
+    finally:
+        client.disconnect()
+        b.close()